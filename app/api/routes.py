@@ -1,45 +1,158 @@
-"""FastAPI route handlers for Trolley Problem Arena."""
-from fastapi import APIRouter, HTTPException, Query
-
-from app.services import game_service
+"""FastAPI route handlers for Trolley Problem Arena.
+
+Handlers are async def. The store is in memory and never blocks, so they run on the event
+loop instead of hopping to the threadpool, and one game's requests, timers and filler
+submissions never run concurrently. The filler awaits its LLM calls. admin_profile stays a
+sync def: it sleeps while it samples.
+"""
+import asyncio
+import hmac
+import os
+import threading
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+from app.idempotency import MAX_KEY_LENGTH, IdempotencyConflict, cache as idempotency_cache
+from app.metrics import TICK_DRAIN_ITERATIONS, TICK_DRAINS
+from app.services import analytics, game_service
 from app.services.state_builder import (
     build_game_state,
+    build_states_batch,
+    build_tables,
     build_feed,
     build_scoreboard,
     build_history,
 )
+from app.models.domain import hash_token
 from app.storage.store import store
+from app.tracing import span
 from app.schemas.api import (
     CreateGameRequest,
     CreateGameResponse,
     RegisterAgentRequest,
     RegisterAgentResponse,
+    RegisterAgentsRequest,
+    RegisterAgentsResponse,
+    RegisteredAgent,
     GameStateResponse,
+    BatchStateRequest,
+    BatchStateResponse,
+    FeedResponse,
+    ScoreboardResponse,
     SubmitArgumentRequest,
     SubmitDecisionRequest,
     AdvanceRequest,
     OpenActionsResponse,
     AddFillerRequest,
+    CreateTournamentRequest,
+    CreateTournamentResponse,
+    TournamentGame,
+    TournamentAgent,
+    ProfileResponse,
+    OperatorStatsResponse,
+    AgentStatsResponse,
+    LeaderboardRow,
+    LeaderboardResponse,
+    BatchAction,
+    BatchActionsRequest,
+    BatchActionResult,
+    BatchActionsResponse,
 )
 
 router = APIRouter(prefix="/api", tags=["api"])
 
+_STREAM_PING_EVERY = 15.0  # seconds of silence before an SSE keep-alive comment
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Encode a response model straight to JSON bytes.
+
+    Hot read endpoints return this instead of the model so FastAPI skips the
+    response_model re-validation and jsonable_encoder pass; response_model is
+    kept on the route for the OpenAPI schema only.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _tokens_required() -> bool:
+    return os.environ.get("REQUIRE_AGENT_TOKENS", "").lower() in ("1", "true", "yes")
+
+
+def _bearer(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        raise HTTPException(status_code=401, detail="Authorization must be 'Bearer <token>'")
+    return token.strip()
+
+
+def _authenticate_agent(agent_id: str, authorization: Optional[str]) -> None:
+    """The caller must hold agent_id's token if it registered with one. Agents registered without
+    a token act unauthenticated unless REQUIRE_AGENT_TOKENS is set. One dict lookup and one hash."""
+    token = _bearer(authorization)
+    a = store.get_agent(agent_id)
+    if not a:
+        return  # game_service reports unknown agents
+    if token is None:
+        if a.token_hash or _tokens_required():
+            raise HTTPException(status_code=401, detail="Agent token required")
+        return
+    if not hmac.compare_digest(hash_token(token), a.token_hash or ""):
+        raise HTTPException(status_code=401, detail="Invalid token for this agent")
+
+
+def _require_registration_tokens(tokens: list[Optional[str]]) -> None:
+    if _tokens_required() and not all(tokens):
+        raise HTTPException(status_code=400, detail="A token is required to register")
+
 
 @router.post("/games", response_model=CreateGameResponse)
-def create_game(body: CreateGameRequest | None = None):
+async def create_game(body: CreateGameRequest | None = None):
     body = body or CreateGameRequest()
-    g = game_service.create_game(min_players=body.min_players)
+    try:
+        g = game_service.create_game(
+            min_players=body.min_players,
+            rotation_seed=body.rotation_seed,
+            allow_late_join=body.allow_late_join,
+            multi_table=body.multi_table,
+            majority_size=body.majority_size,
+            minority_size=body.minority_size,
+            phase_deadline_s=body.phase_deadline_s,
+            decision_deadline_s=body.decision_deadline_s,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return CreateGameResponse(game_id=g.id)
 
 
 @router.get("/games")
-def list_games(status: str | None = Query(None)):
-    games = store.list_games(status=status)
+async def list_games(
+    response: Response,
+    status: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=500, description="Page size; 100 if only cursor is given"),
+    cursor: int | None = Query(None, ge=0, description="X-Next-Cursor from the previous page"),
+):
+    """Every game, newest first, unless limit or cursor asks for a page."""
+    if limit is None and cursor is not None:
+        limit = 100
+    games, next_cursor = store.list_games(status=status, limit=limit, cursor=cursor)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
     return [{"id": g.id, "status": g.status.value, "created_at": g.created_at.isoformat()} for g in games]
 
 
+@router.post("/games/states:batch", response_model=BatchStateResponse)
+async def get_states_batch(body: BatchStateRequest):
+    """State for many games at once; only games changed since the given versions are included."""
+    return _json_response(build_states_batch(body.game_ids, body.versions))
+
+
 @router.get("/games/{game_id}")
-def get_game(game_id: str):
+async def get_game(game_id: str):
     g = store.get_game(game_id)
     if not g:
         raise HTTPException(status_code=404, detail="Game not found")
@@ -50,11 +163,13 @@ def get_game(game_id: str):
         "current_round_number": g.current_round_number,
         "current_phase": g.current_phase.value if g.current_phase else None,
         "min_players": g.min_players,
+        "config": g.config,
     }
 
 
 @router.post("/games/{game_id}/agents/register", response_model=RegisterAgentResponse)
-def register_agent(game_id: str, body: RegisterAgentRequest):
+async def register_agent(game_id: str, body: RegisterAgentRequest):
+    _require_registration_tokens([body.token])
     try:
         g, a, p = game_service.register_agent(game_id, body.display_name, body.token)
         return RegisterAgentResponse(agent_id=a.id, game_id=g.id)
@@ -62,13 +177,29 @@ def register_agent(game_id: str, body: RegisterAgentRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/games/{game_id}/agents/register:batch", response_model=RegisterAgentsResponse)
+async def register_agents(game_id: str, body: RegisterAgentsRequest):
+    """Register many agents atomically with a single aggregated event."""
+    _require_registration_tokens([a.token for a in body.agents])
+    try:
+        g, agents = game_service.register_agents(game_id, [(a.display_name, a.token) for a in body.agents])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _json_response(RegisterAgentsResponse(
+        game_id=g.id,
+        agents=[RegisteredAgent(agent_id=a.id, display_name=a.display_name) for a in agents],
+    ))
+
+
 @router.post("/games/{game_id}/start")
-def start_game(game_id: str):
+async def start_game(game_id: str):
+    g = store.get_game(game_id)
+    if not g:
+        raise HTTPException(status_code=404, detail="Game not found")
     try:
-        # Ensure at least 7 agents (1 operator, 5 majority, 1 minority) by adding fillers if needed
-        from app.services.game_service import ROUND_TOTAL
-        parts = store.get_participations_for_game(game_id)
-        need = ROUND_TOTAL - len(parts)
+        # Ensure one full table (default 7: 1 operator, 5 majority, 1 minority) by adding fillers if needed
+        from app.services.game_service import seats_per_table
+        need = seats_per_table(g) - store.count_participations(game_id)
         if need > 0:
             from app.services.gpt_filler import add_filler_agents
             add_filler_agents(game_id, need)
@@ -79,98 +210,291 @@ def start_game(game_id: str):
 
 
 @router.get("/games/{game_id}/state", response_model=GameStateResponse)
-def get_state(game_id: str, version: int = Query(0, ge=0)):
-    state = build_game_state(game_id, version=version)
-    if not state:
+async def get_state(game_id: str, version: int = Query(0, ge=0, description="Version the caller already has; 304 if unchanged")):
+    if not store.get_game(game_id):
         raise HTTPException(status_code=404, detail="Game not found")
-    return state
+    if version and version == store.get_version(game_id):
+        return Response(status_code=304)
+    return _json_response(build_game_state(game_id))
+
+
+@router.get("/games/{game_id}/state/wait", response_model=GameStateResponse)
+async def wait_state(
+    game_id: str,
+    version: int = Query(0, ge=0, description="Version the caller already has"),
+    timeout: float = Query(25.0, gt=0, le=60),
+):
+    """Long-poll: returns as soon as the game moves past version, or 304 after timeout seconds."""
+    if not store.get_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while store.get_version(game_id) == version:
+        changed = store.version_changed(game_id)
+        if store.get_version(game_id) != version:
+            break
+        try:
+            await asyncio.wait_for(changed.wait(), deadline - loop.time())
+        except asyncio.TimeoutError:
+            return Response(status_code=304)
+    return _json_response(build_game_state(game_id))
 
 
-@router.get("/games/{game_id}/feed")
-def get_feed(game_id: str, limit: int = Query(50, ge=1, le=200)):
+@router.get("/games/{game_id}/stream")
+async def stream_state(
+    game_id: str,
+    token: Optional[str] = Query(None, description="Agent token, for clients that cannot set headers (EventSource)"),
+    authorization: Optional[str] = Header(None),
+):
+    """Server-sent events: one `state` event per version change, until the game completes.
+
+    With an agent token (Bearer header or ?token=) each state event is followed by an
+    `actions` event: that agent's open actions. The token is resolved to the agent once,
+    when the stream opens."""
+    if not store.get_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    token = _bearer(authorization) or token
+    agent_id = None
+    if token:
+        agent_id = store.agent_for_token(game_id, hash_token(token))
+        if not agent_id:
+            raise HTTPException(status_code=401, detail="Invalid token for this game")
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        last = None
+        last_sent = loop.time()
+        while True:
+            current = store.get_version(game_id)
+            if current != last:
+                last = current
+                last_sent = loop.time()
+                state = build_game_state(game_id)
+                yield f"id: {current}\nevent: state\ndata: {state.model_dump_json()}\n\n"
+                if agent_id:
+                    actions = _open_actions(game_id, agent_id, state.current_phase)
+                    yield f"event: actions\ndata: {actions.model_dump_json()}\n\n"
+                if state.status == "game_completed":
+                    return
+            elif loop.time() - last_sent >= _STREAM_PING_EVERY:
+                last_sent = loop.time()
+                yield ": ping\n\n"
+            changed = store.version_changed(game_id)
+            if store.get_version(game_id) != last:
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), max(0.0, last_sent + _STREAM_PING_EVERY - loop.time()))
+            except asyncio.TimeoutError:
+                pass
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/games/{game_id}/feed", response_model=FeedResponse)
+async def get_feed(game_id: str, limit: int = Query(50, ge=1, le=200)):
     g = store.get_game(game_id)
     if not g:
         raise HTTPException(status_code=404, detail="Game not found")
     items = build_feed(game_id, limit=limit)
-    return {"game_id": game_id, "items": [i.model_dump() for i in items]}
+    return _json_response(FeedResponse(game_id=game_id, items=items))
 
 
-@router.get("/games/{game_id}/scoreboard")
-def get_scoreboard(game_id: str):
+@router.get("/games/{game_id}/scoreboard", response_model=ScoreboardResponse)
+async def get_scoreboard(game_id: str):
     data = build_scoreboard(game_id)
     if not data:
         raise HTTPException(status_code=404, detail="Game not found")
-    return data
+    return _json_response(data)
 
 
-@router.get("/games/{game_id}/history")
-def get_history(game_id: str):
-    g = store.get_game(game_id)
-    if not g:
+@router.get("/games/{game_id}/replay", response_model=GameStateResponse)
+async def get_replay(
+    game_id: str,
+    round: Optional[int] = Query(None, ge=1, description="Show the game as it was when this round ended"),
+    events: Optional[int] = Query(None, ge=1, description="Show the game after its first N events"),
+):
+    """Game state rebuilt from the event log alone: at the end of round k, after N events, or now."""
+    if not store.get_game(game_id):
         raise HTTPException(status_code=404, detail="Game not found")
-    return {"game_id": game_id, "rounds": build_history(game_id)}
-
+    if round is not None and events is not None:
+        raise HTTPException(status_code=400, detail="Give round or events, not both")
+    from app.services.replay import build_replay_state
 
-@router.post("/games/{game_id}/rounds/{round_id}/arguments")
-def submit_argument(game_id: str, round_id: str, body: SubmitArgumentRequest):
     try:
-        arg = game_service.submit_argument(game_id, round_id, body.agent_id, body.text)
-        return {"argument_id": arg.id, "phase": arg.phase.value}
+        return _json_response(build_replay_state(game_id, round_number=round, event_count=events))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/games/{game_id}/rounds/{round_id}/decision")
-def submit_decision(game_id: str, round_id: str, body: SubmitDecisionRequest):
+@router.get("/games/{game_id}/history")
+async def get_history(
+    game_id: str,
+    after_round: int = Query(0, ge=0, description="Only rounds numbered after this (X-Next-Cursor of the previous page)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="At most this many round numbers, every table of each"),
+):
+    """Resolved rounds, by round number then table. Each round's entry is serialized once, when it
+    resolves; this only joins them."""
+    if not store.get_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    body, next_cursor = build_history(game_id, after_round, limit)
+    headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _idempotent(agent_id: str, key: Optional[str], fingerprint: tuple, fn: Callable[[], dict]) -> tuple[dict, bool]:
+    """Run a submission once per Idempotency-Key (when given). Returns (result, replayed): replayed
+    results were stored by an earlier request with the same key. Service errors become 400 and are not stored."""
     try:
-        game_service.submit_decision(game_id, round_id, body.agent_id, body.decision)
-        return {"status": "ok", "decision": body.decision}
+        if not key:
+            return fn(), False
+        if len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"Idempotency-Key longer than {MAX_KEY_LENGTH} characters")
+        return idempotency_cache.run(agent_id, key, fingerprint, fn)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _submission_response(result: dict, replayed: bool):
+    if replayed:
+        return JSONResponse(result, headers={"Idempotent-Replayed": "true"})
+    return result
+
+
+def _argument(game_id: str, round_id: str, agent_id: str, text: str) -> tuple[tuple, Callable[[], dict]]:
+    """(idempotency fingerprint, submit function) for one argument."""
+
+    def run() -> dict:
+        arg = game_service.submit_argument(game_id, round_id, agent_id, text)
+        return {"argument_id": arg.id, "phase": arg.phase.value}
+
+    return ("argument", game_id, round_id, text), run
+
+
+def _decision(game_id: str, round_id: str, agent_id: str, decision: str) -> tuple[tuple, Callable[[], dict]]:
+    def run() -> dict:
+        game_service.submit_decision(game_id, round_id, agent_id, decision)
+        return {"status": "ok", "decision": decision}
+
+    return ("decision", game_id, round_id, decision), run
+
+
+@router.post("/games/{game_id}/rounds/{round_id}/arguments")
+async def submit_argument(
+    game_id: str,
+    round_id: str,
+    body: SubmitArgumentRequest,
+    authorization: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None),
+):
+    _authenticate_agent(body.agent_id, authorization)
+    fingerprint, run = _argument(game_id, round_id, body.agent_id, body.text)
+    return _submission_response(*_idempotent(body.agent_id, idempotency_key, fingerprint, run))
+
+
+@router.post("/games/{game_id}/rounds/{round_id}/decision")
+async def submit_decision(
+    game_id: str,
+    round_id: str,
+    body: SubmitDecisionRequest,
+    authorization: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None),
+):
+    _authenticate_agent(body.agent_id, authorization)
+    fingerprint, run = _decision(game_id, round_id, body.agent_id, body.decision)
+    return _submission_response(*_idempotent(body.agent_id, idempotency_key, fingerprint, run))
+
+
+def _apply_batch_action(game_id: str, action: BatchAction, authorization: Optional[str]) -> tuple[dict, bool]:
+    _authenticate_agent(action.agent_id, f"Bearer {action.token}" if action.token else authorization)
+    if action.type == "argument":
+        if not action.text:
+            raise HTTPException(status_code=400, detail="Argument needs text")
+        fingerprint, run = _argument(game_id, action.round_id, action.agent_id, action.text)
+    elif action.type == "decision":
+        if not action.decision:
+            raise HTTPException(status_code=400, detail="Decision needs decision")
+        fingerprint, run = _decision(game_id, action.round_id, action.agent_id, action.decision)
+    else:
+        raise HTTPException(status_code=400, detail="Action type must be argument or decision")
+    return _idempotent(action.agent_id, action.idempotency_key, fingerprint, run)
+
+
+@router.post("/games/{game_id}/actions:batch", response_model=BatchActionsResponse)
+async def submit_actions_batch(game_id: str, body: BatchActionsRequest, authorization: Optional[str] = Header(None)):
+    """Apply many arguments/decisions in order under the game's lock, one result per action;
+    a failed action does not stop the rest. Auto-advance runs once, after the last action."""
+    if not store.get_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    results = []
+    with store.game_lock(game_id):
+        for i, action in enumerate(body.actions):
+            try:
+                result, replayed = _apply_batch_action(game_id, action, authorization)
+            except HTTPException as e:
+                results.append(BatchActionResult(index=i, ok=False, status=e.status_code, error=str(e.detail)))
+                continue
+            results.append(BatchActionResult(index=i, ok=True, status=200, result=result, replayed=replayed))
+        advanced = game_service.try_auto_advance(game_id)
+    return _json_response(BatchActionsResponse(game_id=game_id, results=results, advanced=advanced))
+
+
 @router.post("/games/{game_id}/advance")
-def advance_game(game_id: str, body: AdvanceRequest | None = None):
+async def advance_game(game_id: str, body: AdvanceRequest | None = None):
     body = body or AdvanceRequest()
     try:
-        g = game_service.advance(game_id, body.action)
+        g = game_service.advance(game_id, body.action, round_id=body.round_id)
         return {"status": g.status.value, "current_phase": g.current_phase.value if g.current_phase else None}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/games/{game_id}/open-actions", response_model=OpenActionsResponse)
-def get_open_actions(game_id: str, agent_id: str = Query(...)):
-    state = build_game_state(game_id)
-    if not state:
-        raise HTTPException(status_code=404, detail="Game not found")
+def _open_actions(game_id: str, agent_id: str, current_phase: Optional[str]) -> OpenActionsResponse:
     can_act = False
     allowed_action = None
     role = None
-    if state.operator and state.operator.id == agent_id:
-        role = "operator"
-        if state.current_phase == "awaiting_decision":
-            can_act = True
-            allowed_action = "decision"
-    for a in state.majority_agents + state.minority_agents:
-        if a.id == agent_id:
-            role = a.role
-            if state.current_phase in ("phase_1", "phase_2", "phase_3"):
-                if not a.argued_this_phase:
-                    can_act = True
-                    allowed_action = "argument"
+    round_id = None
+    for t in build_tables(game_id):
+        if t.operator and t.operator.id == agent_id:
+            role = "operator"
+            round_id = t.round_id
+            current_phase = t.phase
+            if t.phase == "awaiting_decision":
+                can_act = True
+                allowed_action = "decision"
+            break
+        seat = next((a for a in t.majority_agents + t.minority_agents if a.id == agent_id), None)
+        if seat:
+            role = seat.role
+            round_id = t.round_id
+            current_phase = t.phase
+            if t.phase in ("phase_1", "phase_2", "phase_3") and not seat.argued_this_phase:
+                can_act = True
+                allowed_action = "argument"
             break
     return OpenActionsResponse(
         agent_id=agent_id,
         can_act=can_act,
         allowed_action=allowed_action,
-        current_phase=state.current_phase,
+        current_phase=current_phase,
         role=role,
+        round_id=round_id,
     )
 
 
+@router.get("/games/{game_id}/open-actions", response_model=OpenActionsResponse)
+async def get_open_actions(game_id: str, agent_id: str = Query(...)):
+    g = store.get_game(game_id)
+    if not g:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return _open_actions(game_id, agent_id, g.current_phase.value if g.current_phase else None)
+
+
 @router.post("/demo/create")
-def demo_create():
+async def demo_create():
     """Create a game and register 1 demo agent. Start adds fillers to reach 7 (1 operator, 5 majority, 1 minority)."""
     g = game_service.create_game(min_players=1)
     _, a, _ = game_service.register_agent(g.id, "Alice")
@@ -182,7 +506,7 @@ def demo_create():
 
 
 @router.post("/games/{game_id}/add-filler")
-def add_filler(game_id: str, body: AddFillerRequest | None = None):
+async def add_filler(game_id: str, body: AddFillerRequest | None = None):
     """Add GPT-backed filler agents when players are lacking."""
     body = body or AddFillerRequest()
     g = store.get_game(game_id)
@@ -196,7 +520,7 @@ def add_filler(game_id: str, body: AddFillerRequest | None = None):
 
 
 @router.post("/games/{game_id}/tick-filler")
-def tick_filler(
+async def tick_filler(
     game_id: str,
     drain: bool = Query(True, description="Run filler ticks until no action and no advance (default true). Set ?drain=false for a single tick only."),
 ):
@@ -205,21 +529,149 @@ def tick_filler(
     if not g:
         raise HTTPException(status_code=404, detail="Game not found")
     from app.services.gpt_filler import execute_one_filler_action
+    TICK_DRAINS.inc()
+    with span("api.tick_filler", game_id, drain=drain):
+        try:
+            result = await execute_one_filler_action(game_id)
+            game_service.try_auto_advance(game_id)
+            TICK_DRAIN_ITERATIONS.inc()
+            if not drain:
+                return {"game_id": game_id, "action": result}
+            actions = [result] if result else []
+            for _ in range(24):
+                TICK_DRAIN_ITERATIONS.inc()
+                r2 = await execute_one_filler_action(game_id)
+                advanced = game_service.try_auto_advance(game_id)
+                if r2:
+                    actions.append(r2)
+                if not r2 and not advanced:
+                    break
+            return {"game_id": game_id, "action": result, "drained": True, "actions_count": len(actions)}
+        except Exception as e:
+            return {"game_id": game_id, "action": None, "error": str(e), "drained": False}
+
+
+@router.post("/tournaments", response_model=CreateTournamentResponse)
+async def create_tournament(body: CreateTournamentRequest):
+    """Create, fill and (by default) start one game per seats_per_game entrants."""
+    _require_registration_tokens([e.token for e in body.roster])
+    from app.services.tournament_service import create_tournament as _create
     try:
-        result = execute_one_filler_action(game_id)
-        game_service.try_auto_advance(game_id)
-        if not drain:
-            return {"game_id": game_id, "action": result}
-        actions = [result] if result else []
-        for _ in range(24):
-            r2 = execute_one_filler_action(game_id)
-            advanced = game_service.try_auto_advance(game_id)
-            if r2:
-                actions.append(r2)
-            if not r2 and not advanced:
-                break
-        return {"game_id": game_id, "action": result, "drained": True, "actions_count": len(actions)}
-    except Exception as e:
-        return {"game_id": game_id, "action": None, "error": str(e), "drained": False}
+        t, seated = _create(
+            [(e.display_name, e.token) for e in body.roster],
+            seats_per_game=body.seats_per_game,
+            name=body.name,
+            start=body.start,
+            seed=body.seed,
+            multi_table=body.multi_table,
+            majority_size=body.majority_size,
+            minority_size=body.minority_size,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _json_response(CreateTournamentResponse(
+        tournament_id=t.id,
+        games=[
+            TournamentGame(game_id=gid, agents=[TournamentAgent(agent_id=aid, display_name=name) for aid, name in agents])
+            for gid, agents in seated.items()
+        ],
+    ))
+
+
+@router.post("/tournaments/{tournament_id}/start")
+async def start_tournament(tournament_id: str):
+    from app.services.tournament_service import start_tournament as _start
+    if not store.get_tournament(tournament_id):
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    try:
+        t = _start(tournament_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"tournament_id": t.id, "games": len(t.game_ids)}
 
 
+@router.get("/tournaments/{tournament_id}")
+async def get_tournament(tournament_id: str):
+    """Standings across every game of the tournament, highest score first."""
+    from app.services.tournament_service import build_standings
+    data = build_standings(tournament_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return data
+
+
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(top: int = Query(50, ge=1, le=1000)):
+    """Best players across all games by rounds survived. Players are keyed by token, or by display name without one."""
+    rows = [
+        LeaderboardRow(
+            rank=rank,
+            display_name=e.display_name,
+            score=e.score,
+            games=e.games,
+            rounds=e.rounds,
+            track_rounds=e.track_rounds,
+            survival_rate=round(e.survival_rate, 4),
+            chosen=e.chosen,
+            decided_rounds=e.decided_rounds,
+            chosen_rate=round(e.chosen_rate, 4),
+        )
+        for rank, e in store.leaderboard.top(top)
+    ]
+    return _json_response(LeaderboardResponse(players=len(store.leaderboard), top=rows))
+
+
+@router.get("/stats/operators", response_model=OperatorStatsResponse)
+async def stats_operators(
+    limit: int = Query(50, ge=1, le=1000),
+    min_rounds: int = Query(1, ge=1, description="Leave out operators with fewer rounds operated"),
+):
+    """Decision rates per operator (by display name) across all completed games."""
+    return _json_response(await analytics.operator_stats(limit=limit, min_rounds=min_rounds))
+
+
+@router.get("/stats/agents", response_model=AgentStatsResponse)
+async def stats_agents(limit: int = Query(50, ge=1, le=1000)):
+    """Survival and argument stats per agent (by display name) across all completed games,
+    plus the argument length distribution."""
+    return _json_response(await analytics.agent_stats(limit=limit))
+
+
+def _require_admin(token: Optional[str]) -> None:
+    """Admin endpoints need the X-Admin-Token header to match the ADMIN_TOKEN env var; without ADMIN_TOKEN they are off."""
+    expected = os.environ.get("ADMIN_TOKEN", "")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set ADMIN_TOKEN)")
+    if not token or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/admin/profile", response_model=ProfileResponse)
+def admin_profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=100),
+    include_idle: bool = Query(False, description="Keep samples of threads parked in wait/select"),
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """Sample every thread's stack for `seconds` and return collapsed stacks plus the top functions by self time.
+    format=collapsed returns only the collapsed-stack file (for flamegraph.pl / speedscope). One profile at a time (409)."""
+    _require_admin(x_admin_token)
+    from app.profiler import ProfilerBusy, profile
+
+    try:
+        result = profile(seconds, interval_ms / 1000, include_idle, exclude_thread=threading.get_ident())
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "collapsed":
+        return PlainTextResponse(
+            result.collapsed(),
+            headers={"Content-Disposition": 'attachment; filename="profile.collapsed.txt"'},
+        )
+    return _json_response(ProfileResponse(
+        seconds=result.seconds,
+        interval_ms=interval_ms,
+        samples=result.samples,
+        top=result.top(),
+        collapsed=result.collapsed(),
+    ))
@@ -0,0 +1,100 @@
+"""Idempotency keys for agent submissions: a retried request returns the first one's result.
+
+Results are cached per agent under the client's Idempotency-Key, with the request's
+fingerprint (endpoint, ids, body). A retry with the same key and fingerprint gets the
+stored result back without touching the game. The same key with a different request is
+a conflict. A retry that arrives while the first attempt is still running waits for it
+instead of racing it. Submissions run on the event loop without awaiting, so the first
+attempt has always finished by then; the wait only matters for threaded callers.
+
+Only successes are kept. A request that failed changed nothing, so its retry simply runs
+again. The cache is bounded three ways: entries expire after TTL_SECONDS, each agent
+keeps its newest PER_AGENT keys, and the least recently active agents are dropped beyond
+MAX_AGENTS.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+TTL_SECONDS = 600.0
+PER_AGENT = 32
+MAX_AGENTS = 100_000
+MAX_KEY_LENGTH = 255
+WAIT_SECONDS = 10.0  # how long a concurrent retry waits for the first attempt
+
+
+class IdempotencyConflict(ValueError):
+    """The key was already used for a different request."""
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "expires", "result", "done")
+
+    def __init__(self, fingerprint: Hashable, expires: float) -> None:
+        self.fingerprint = fingerprint
+        self.expires = expires
+        self.result: Optional[dict] = None
+        self.done = threading.Event()
+
+
+class IdempotencyCache:
+    def __init__(self, ttl: float = TTL_SECONDS, per_agent: int = PER_AGENT, max_agents: int = MAX_AGENTS) -> None:
+        self.ttl = ttl
+        self.per_agent = per_agent
+        self.max_agents = max_agents
+        self._agents: "OrderedDict[str, OrderedDict[str, _Entry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._agents.values())
+
+    def _claim(self, agent_id: str, key: str, fingerprint: Hashable, now: float) -> tuple[_Entry, bool]:
+        """The entry for key, and whether this caller must run the request (True) or reuse it."""
+        with self._lock:
+            keys = self._agents.get(agent_id)
+            if keys is None:
+                keys = self._agents[agent_id] = OrderedDict()
+                while len(self._agents) > self.max_agents:
+                    self._agents.popitem(last=False)
+            else:
+                self._agents.move_to_end(agent_id)
+            e = keys.get(key)
+            if e is not None and e.expires > now:
+                if e.fingerprint != fingerprint:
+                    raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+                return e, False
+            e = keys[key] = _Entry(fingerprint, now + self.ttl)
+            keys.move_to_end(key)
+            while len(keys) > self.per_agent:
+                keys.popitem(last=False)
+            return e, True
+
+    def _release(self, agent_id: str, key: str, e: _Entry) -> None:
+        """Forget a failed attempt so a retry runs again."""
+        with self._lock:
+            keys = self._agents.get(agent_id)
+            if keys is not None and keys.get(key) is e:
+                del keys[key]
+
+    def run(self, agent_id: str, key: str, fingerprint: Hashable, fn: Callable[[], dict]) -> tuple[dict, bool]:
+        """fn's result, run at most once per (agent_id, key). Returns (result, replayed)."""
+        while True:
+            e, owner = self._claim(agent_id, key, fingerprint, time.monotonic())
+            if owner:
+                try:
+                    e.result = fn()
+                except BaseException:
+                    self._release(agent_id, key, e)
+                    e.done.set()
+                    raise
+                e.done.set()
+                return e.result, False
+            if not e.done.wait(WAIT_SECONDS):
+                raise TimeoutError("The first request with this Idempotency-Key is still running")
+            if e.result is not None:
+                return e.result, True
+            # The first attempt failed and released the key: run it ourselves
+
+
+cache = IdempotencyCache()
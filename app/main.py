@@ -1,11 +1,16 @@
 """Trolley Problem Arena - FastAPI application."""
+import asyncio
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 
 from app.api.routes import router
+from app.metrics import MetricsMiddleware, render as render_metrics
+from app.ratelimit import RateLimitMiddleware
+from app.services import analytics, gpt_filler
+from app.services.deadlines import scheduler as deadline_scheduler
 
 app = FastAPI(
     title="Trolley Problem Arena",
@@ -13,6 +18,10 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Added first so it runs inside MetricsMiddleware; the limiter resolves the route of each
+# 429 it sends, so request metrics count it under its route template
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(router)
 
 # Serve static frontend
@@ -21,8 +30,20 @@ if static_dir.exists():
     app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 
+@app.on_event("startup")
+async def start_deadlines():
+    deadline_scheduler.attach(asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    deadline_scheduler.detach()
+    analytics.shutdown()
+    await gpt_filler.close_client()
+
+
 @app.get("/")
-def index():
+async def index():
     """Serve spectator UI. No-cache so deploy updates show immediately."""
     ui = Path(__file__).parent / "static" / "index.html"
     if ui.exists():
@@ -37,12 +58,18 @@ def index():
 
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint: request latency per route, games by status, store sizes, filler and tick counters."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/skill.md", include_in_schema=False)
-def skill_md():
+async def skill_md():
     """Serve the agent skill doc so OpenClaw (and others) can load it from the deployed URL."""
     skill_path = Path(__file__).resolve().parent.parent / "SKILL.md"
     if not skill_path.exists():
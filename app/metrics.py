@@ -0,0 +1,173 @@
+"""Prometheus-style metrics: counters and histograms kept in process, rendered as text at /metrics.
+
+Recording is a lock, a bisect into the bucket bounds and a few integer adds, so it is
+cheap enough for the /state poll path. Gauges over the store (games by status, store
+sizes) are read only when /metrics is scraped.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable
+
+# Seconds; HTTP handlers here take well under a millisecond, LLM calls take seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, v in items:
+            lines.append(f"{self.name}{_label_str(self.labels, values)} {v:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(label_values)
+            if s is None:
+                s = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += 1
+            s[1] += value
+            s[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        s = self._series.get(label_values)
+        return s[2] if s else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        for values, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_label_str(self.labels + ('le',), values + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, values)} {total:.6f}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, values)} {n}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram("arena_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+REQUESTS = Counter("arena_http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status"))
+FILLER_LLM_SECONDS = Histogram("arena_filler_llm_duration_seconds", "Filler LLM call latency", ("kind",))
+FILLER_LLM_CALLS = Counter("arena_filler_llm_calls_total", "Filler LLM calls by outcome (ok, error, empty)", ("kind", "outcome"))
+TICK_DRAINS = Counter("arena_tick_filler_calls_total", "tick-filler requests")
+TICK_DRAIN_ITERATIONS = Counter("arena_tick_filler_drain_iterations_total", "Filler action + auto-advance iterations run by tick-filler")
+AUTO_ADVANCES = Counter("arena_auto_advances_total", "Phase or round advances made by try_auto_advance")
+RATE_LIMITED = Counter("arena_rate_limited_total", "Requests refused with 429 by rate-limit rule", ("rule",))
+
+METRICS = [REQUEST_SECONDS, REQUESTS, FILLER_LLM_SECONDS, FILLER_LLM_CALLS, TICK_DRAINS, TICK_DRAIN_ITERATIONS, AUTO_ADVANCES, RATE_LIMITED]
+
+
+def _route_template(scope: dict) -> str:
+    """Path with matched path parameters put back as {name}, so ids don't explode label cardinality."""
+    if "endpoint" not in scope:
+        return "<unmatched>"
+    params = scope.get("path_params") or {}
+    if not params:
+        return scope["path"]
+    names = {str(v): k for k, v in params.items()}
+    return "/".join("{" + names[seg] + "}" if seg in names else seg for seg in scope["path"].split("/"))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and status per route template for every HTTP request."""
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = _route_template(scope)
+            method = scope["method"]
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method, route)
+            REQUESTS.inc(method, route, str(status))
+
+
+def _store_gauges() -> list[str]:
+    from app.models.domain import GameStatus
+    from app.ratelimit import limiter
+    from app.services.deadlines import scheduler
+    from app.storage.store import store
+
+    lines = ["# HELP arena_games Games in the store by status", "# TYPE arena_games gauge"]
+    for status in GameStatus:
+        lines.append(f'arena_games{{status="{status.value}"}} {len(store.seqs_by_status.get(status, ()))}')
+    sizes = {
+        "games": len(store.games),
+        "agents": len(store.agents),
+        "participations": len(store.participations),
+        "rounds": len(store.rounds),
+        "arguments": len(store.arguments),
+        "events": len(store.events),
+    }
+    lines += ["# HELP arena_store_objects Objects held in the in-memory store", "# TYPE arena_store_objects gauge"]
+    lines += [f'arena_store_objects{{kind="{kind}"}} {n}' for kind, n in sizes.items()]
+    lines += [
+        "# HELP arena_pending_deadlines Phase and decision timers waiting to fire",
+        "# TYPE arena_pending_deadlines gauge",
+        f"arena_pending_deadlines {len(scheduler)}",
+        "# HELP arena_rate_limit_buckets Rate-limit buckets held (callers seen recently, per rule)",
+        "# TYPE arena_rate_limit_buckets gauge",
+        f"arena_rate_limit_buckets {len(limiter)}",
+    ]
+    return lines
+
+
+def render() -> str:
+    """Everything in Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+    for m in METRICS:
+        lines += m.render()
+    lines += _store_gauges()
+    return "\n".join(lines) + "\n"
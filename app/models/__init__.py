@@ -10,6 +10,7 @@ from .domain import (
     Round,
     Argument,
     EventLog,
+    Tournament,
 )
 
 __all__ = [
@@ -24,4 +25,5 @@ __all__ = [
     "Round",
     "Argument",
     "EventLog",
+    "Tournament",
 ]
@@ -1,4 +1,5 @@
 """Domain models for Trolley Problem Arena (Pydantic + plain dataclass-style)."""
+import hashlib
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -38,6 +39,8 @@ class Decision(str, Enum):
 class EventType(str, Enum):
     game_created = "game_created"
     agent_registered = "agent_registered"
+    agents_registered = "agents_registered"  # bulk registration: one event for the whole batch
+    filler_marked = "filler_marked"  # agent is driven by the GPT filler
     game_started = "game_started"
     round_started = "round_started"
     argument_submitted = "argument_submitted"
@@ -69,11 +72,16 @@ class Game:
         )
 
 
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest of an agent token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 @dataclass
 class Agent:
     id: str
     display_name: str
-    token: Optional[str] = None
+    token_hash: Optional[str] = None  # see hash_token; the token itself is never kept
     created_at: Optional[datetime] = None
 
     @staticmethod
@@ -81,7 +89,7 @@ class Agent:
         return Agent(
             id=str(uuid4()),
             display_name=display_name,
-            token=token,
+            token_hash=hash_token(token) if token else None,
             created_at=datetime.utcnow(),
         )
 
@@ -96,6 +104,11 @@ class Participation:
     has_been_minority: bool
     joined_at: datetime
 
+    @property
+    def is_complete(self) -> bool:
+        """Has held every role: operator, majority and minority."""
+        return self.has_been_operator and self.has_been_majority and self.has_been_minority
+
     @staticmethod
     def new(game_id: str, agent_id: str) -> "Participation":
         return Participation(
@@ -121,6 +134,8 @@ class Round:
     minority_agent_ids: list[str]
     decision: Optional[Decision] = None
     resolved_at: Optional[datetime] = None
+    table: int = 0  # multi-table games run several rounds with the same round_number
+    phase_deadline_at: Optional[datetime] = None  # when the current phase times out, if the game sets deadlines
 
     @staticmethod
     def new(
@@ -129,6 +144,7 @@ class Round:
         operator_agent_id: str,
         majority_agent_ids: list[str],
         minority_agent_ids: list[str],
+        table: int = 0,
     ) -> "Round":
         return Round(
             id=str(uuid4()),
@@ -139,6 +155,7 @@ class Round:
             operator_agent_id=operator_agent_id,
             majority_agent_ids=majority_agent_ids,
             minority_agent_ids=minority_agent_ids,
+            table=table,
         )
 
 
@@ -189,3 +206,23 @@ class EventLog:
             payload_json=payload_json,
             created_at=datetime.utcnow(),
         )
+
+
+@dataclass
+class Tournament:
+    id: str
+    name: str
+    created_at: datetime
+    seats_per_game: int
+    game_ids: list[str] = field(default_factory=list)
+    config: dict = field(default_factory=dict)
+
+    @staticmethod
+    def new(name: str, seats_per_game: int, config: Optional[dict] = None) -> "Tournament":
+        return Tournament(
+            id=str(uuid4()),
+            name=name,
+            created_at=datetime.utcnow(),
+            seats_per_game=seats_per_game,
+            config=config or {},
+        )
@@ -0,0 +1,103 @@
+"""Sampling profiler for the running process.
+
+A background thread reads every thread's stack via sys._current_frames() at a fixed
+interval. Nothing is instrumented and the sampled threads are never paused; the cost is
+one stack walk per thread per tick, paid by the sampler thread. Output is collapsed
+stacks (one "frame;frame;frame count" line per distinct stack, the input format of
+flamegraph.pl and speedscope) plus the functions most often on top of a stack (self time).
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Leaf frames of threads that are parked, not working: threadpool workers waiting for a job,
+# the event loop waiting in select, timers waiting on a condition
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+_lock = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    """Another profile is already running."""
+
+
+@dataclass
+class ProfileResult:
+    seconds: float
+    interval: float
+    samples: int  # stack samples kept, summed over threads
+    stacks: Counter = field(default_factory=Counter)  # "frame;frame;..." -> count
+    self_counts: Counter = field(default_factory=Counter)  # leaf frame -> count
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def top(self, limit: int = 25) -> list[dict]:
+        total = self.samples or 1
+        return [
+            {
+                "function": frame,
+                "self_samples": n,
+                "self_pct": round(100 * n / total, 2),
+                "self_seconds": round(n * self.interval, 4),
+            }
+            for frame, n in self.self_counts.most_common(limit)
+        ]
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _sample_once(result: ProfileResult, names: dict[int, str], skip: set, include_idle: bool) -> None:
+    for tid, frame in sys._current_frames().items():
+        if tid in skip:
+            continue
+        leaf = frame.f_code
+        if not include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+            continue
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.append(names.get(tid, f"thread-{tid}"))
+        labels.reverse()
+        result.stacks[";".join(labels)] += 1
+        result.self_counts[labels[-1]] += 1
+        result.samples += 1
+
+
+def profile(seconds: float, interval: float = 0.005, include_idle: bool = False, exclude_thread: Optional[int] = None) -> ProfileResult:
+    """Sample all threads for `seconds` from a background thread; blocks until done.
+
+    Raises ProfilerBusy if a profile is already running. exclude_thread is a thread ident
+    whose stacks are left out (typically the caller, which is only waiting here).
+    """
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    try:
+        result = ProfileResult(seconds=seconds, interval=interval, samples=0)
+
+        def run() -> None:
+            skip = {threading.get_ident(), exclude_thread}
+            end = time.monotonic() + seconds
+            while time.monotonic() < end:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                _sample_once(result, names, skip, include_idle)
+                time.sleep(interval)
+
+        sampler = threading.Thread(target=run, name="profiler", daemon=True)
+        sampler.start()
+        sampler.join()
+        return result
+    finally:
+        _lock.release()
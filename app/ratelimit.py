@@ -0,0 +1,257 @@
+"""Token-bucket rate limiting per caller and route, as ASGI middleware.
+
+Each rule covers a set of routes and gives every caller its own bucket: `burst` tokens,
+refilled at `rate` per second. A caller is the client IP, except on agent-action routes:
+there a bearer token that the store's token index knows for the game in the path makes
+the caller that agent, keyed by the token's SHA-256 digest. Nothing the client merely
+claims (a query parameter, an unchecked token) picks the bucket, so callers cannot dodge
+their budget or create buckets at will, and raw tokens are never kept.
+
+A request normally costs one token. Batch routes cost one token per item of a list in
+the JSON body, and they draw on the same buckets as the single-item route (both rules
+have the same name), so batching saves round trips but not budget. Each item is charged
+to the caller it would have been sent as: the agent of the token the item carries, else
+of the request's bearer token, once verified as above, else the client IP. A batch
+therefore costs every agent what its actions would cost one at a time, whoever sends
+it, and no agent's budget pays for another's. The middleware reads the body to sort the
+items, then hands it on to the route unchanged.
+
+A request is let in when each bucket it charges holds a whole token (for a batch, all
+of them, or none is charged), and it takes its full cost even if that leaves a bucket
+negative. The caller then waits until that debt is refilled, so a batch larger than the
+burst is still possible but is paid for in full.
+
+Buckets refill lazily: each request adds the tokens earned since that bucket's last
+request. A bucket idle long enough to be full again holds no state worth keeping, so a
+periodic sweep drops it. Routes no rule matches are not limited. A limited request gets
+429 with Retry-After, the whole number of seconds until a token is available, and is
+counted in arena_rate_limited_total. The limiter resolves its route the way the router
+would, so request metrics file the 429 under the route template too.
+
+Everything runs on the event loop thread, so buckets need no lock. The per-request cost
+is a method check and a regex per rule, plus a dict lookup and a little arithmetic when
+a rule matches (and one hash and index lookup on agent-action routes; on batch routes, a
+JSON parse and one per distinct token).
+
+Set RATE_LIMIT=off to disable.
+"""
+import json
+import math
+import os
+import re
+import time
+from typing import Callable, NamedTuple, Optional
+
+from starlette.routing import Match
+
+from app.metrics import RATE_LIMITED
+from app.models.domain import hash_token
+from app.storage.store import store
+
+SWEEP_EVERY = 30.0  # seconds between idle-bucket sweeps
+
+
+class Rule(NamedTuple):
+    name: str
+    method: str
+    pattern: re.Pattern
+    rate: float  # tokens per second
+    burst: int  # bucket size
+    per_agent: bool = False  # key by the verified bearer token instead of the client IP
+    batch: str = ""  # charge one token per item of this JSON body list instead of one per request
+
+
+def _rule(name: str, method: str, pattern: str, rate: float, burst: int, per_agent: bool = False, batch: str = "") -> Rule:
+    return Rule(name, method, re.compile(pattern), rate, burst, per_agent, batch)
+
+
+RULES = (
+    # Up to 25 filler LLM calls per drain
+    _rule("tick-filler", "POST", r"^/api/games/[^/]+/tick-filler$", 1.0, 5),
+    _rule("add-filler", "POST", r"^/api/games/[^/]+/add-filler$", 0.5, 5),
+    _rule("open-actions", "GET", r"^/api/games/[^/]+/open-actions$", 10.0, 20),
+    _rule("actions", "POST", r"^/api/games/[^/]+/rounds/[^/]+/(arguments|decision)$", 20.0, 40, per_agent=True),
+    # Same name, so the same bucket: a batch of n actions costs what n single requests do
+    _rule("actions", "POST", r"^/api/games/[^/]+/actions:batch$", 20.0, 40, per_agent=True, batch="actions"),
+    # Up to 1000 agents per call; tournaments create and fill a game per seats_per_game entrants
+    _rule("register-batch", "POST", r"^/api/games/[^/]+/agents/register:batch$", 2.0, 20),
+    _rule("tournaments", "POST", r"^/api/tournaments$", 0.1, 2),
+    _rule("stats", "GET", r"^/api/stats/", 5.0, 10),
+    _rule("admin", "POST", r"^/api/admin/", 0.2, 2),
+)
+
+
+class RateLimiter:
+    def __init__(self, rules: tuple[Rule, ...] = RULES) -> None:
+        self.rules = rules
+        self.buckets: dict[tuple[str, str], list[float]] = {}  # (rule, caller) -> [tokens, last refill]
+        self._next_sweep = time.monotonic() + SWEEP_EVERY
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def match(self, method: str, path: str) -> Optional[Rule]:
+        for rule in self.rules:
+            if rule.method == method and rule.pattern.match(path):
+                return rule
+        return None
+
+    def _refilled(self, rule: Rule, caller: str, now: float) -> list[float]:
+        key = (rule.name, caller)
+        b = self.buckets.get(key)
+        if b is None:
+            b = self.buckets[key] = [float(rule.burst), now]
+        else:
+            b[0] = min(rule.burst, b[0] + (now - b[1]) * rule.rate)
+            b[1] = now
+        return b
+
+    def acquire_many(self, rule: Rule, costs: dict[str, int], now: float) -> float:
+        """Take each caller's cost from its bucket, going into debt if need be: all of them if every
+        bucket holds a whole token, else none. Returns 0 if allowed, else seconds until all do."""
+        buckets = [(self._refilled(rule, caller, now), cost) for caller, cost in costs.items()]
+        lowest = min(b[0] for b, _ in buckets)
+        if lowest < 1.0:
+            return (1.0 - lowest) / rule.rate
+        for b, cost in buckets:
+            b[0] -= cost
+        return 0.0
+
+    def acquire(self, rule: Rule, caller: str, now: float) -> float:
+        """Take one token from caller's bucket. Returns 0 if allowed, else seconds until a token is available."""
+        b = self._refilled(rule, caller, now)
+        if b[0] >= 1.0:
+            b[0] -= 1.0
+            return 0.0
+        return (1.0 - b[0]) / rule.rate
+
+    def sweep(self, now: float) -> None:
+        """Drop buckets idle long enough to have refilled: a fresh bucket is the same."""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + SWEEP_EVERY
+        rates = {r.name: r for r in self.rules}
+        self.buckets = {
+            key: b for key, b in self.buckets.items()
+            if b[0] + (now - b[1]) * rates[key[0]].rate < rates[key[0]].burst
+        }
+
+
+limiter = RateLimiter()
+
+
+def _ip(scope: dict) -> str:
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def _bearer(scope: dict) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization" and value[:7].lower() == b"bearer ":
+            return value[7:].decode("latin-1").strip()
+    return None
+
+
+def _agent(scope: dict, token: Optional[str]) -> Optional[str]:
+    """The caller key for token if the store knows it for the game in the path, else None."""
+    if not token:
+        return None
+    digest = hash_token(token)
+    game_id = scope["path"].split("/", 4)[3]  # /api/games/{game_id}/...
+    return "agent:" + digest if store.agent_for_token(game_id, digest) else None
+
+
+def _caller(scope: dict, rule: Rule) -> str:
+    return (rule.per_agent and _agent(scope, _bearer(scope))) or _ip(scope)
+
+
+def _batch_costs(scope: dict, rule: Rule, body: bytes) -> dict[str, int]:
+    """One token per item of the body's list, by the caller each item would be sent as alone.
+    A body that is not such an object costs the request's caller one (the route will reject it)."""
+    try:
+        items = json.loads(body)[rule.batch]
+    except (ValueError, KeyError, TypeError):
+        items = None
+    if not isinstance(items, list) or not items:
+        return {_caller(scope, rule): 1}
+    header = _bearer(scope)
+    callers: dict[Optional[str], str] = {}  # token -> caller, so each distinct token is hashed once
+    costs: dict[str, int] = {}
+    for item in items:
+        token = (item.get("token") if isinstance(item, dict) else None) or header
+        caller = callers.get(token)
+        if caller is None:
+            caller = callers[token] = (rule.per_agent and _agent(scope, token)) or _ip(scope)
+        costs[caller] = costs.get(caller, 0) + 1
+    return costs
+
+
+async def _read_body(receive: Callable) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _replay(body: bytes, receive: Callable) -> Callable:
+    """A receive callable that returns the already-read body first, then defers to receive."""
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def replay() -> dict:
+        return pending.pop() if pending else await receive()
+
+    return replay
+
+
+def _resolve_route(scope: dict) -> None:
+    """Set endpoint and path_params as the router would, for a request answered before routing."""
+    for route in getattr(scope.get("app"), "routes", ()):
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            scope.update(child_scope)
+            return
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing limiter's per-route budgets on HTTP requests."""
+
+    def __init__(self, app: Callable, limiter: RateLimiter = limiter) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.enabled = os.environ.get("RATE_LIMIT", "on").lower() not in ("off", "0", "false")
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        rule = self.limiter.match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+        if rule.batch:
+            body = await _read_body(receive)
+            receive = _replay(body, receive)
+        now = time.monotonic()
+        self.limiter.sweep(now)
+        if rule.batch:
+            wait = self.limiter.acquire_many(rule, _batch_costs(scope, rule, body), now)
+        else:
+            wait = self.limiter.acquire(rule, _caller(scope, rule), now)
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+        RATE_LIMITED.inc(rule.name)
+        _resolve_route(scope)
+        body = b'{"detail":"Rate limit exceeded"}'
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(wait))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
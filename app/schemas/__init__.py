@@ -4,12 +4,29 @@ from .api import (
     RegisterAgentRequest,
     RegisterAgentResponse,
     GameStateResponse,
+    TableState,
+    BatchStateRequest,
+    BatchStateResponse,
     FeedItem,
+    FeedResponse,
     ScoreboardResponse,
     SubmitArgumentRequest,
     SubmitDecisionRequest,
     AdvanceRequest,
     OpenActionsResponse,
+    ProfileFunction,
+    ProfileResponse,
+    OperatorStats,
+    OperatorStatsResponse,
+    AgentStats,
+    AgentStatsResponse,
+    LengthBucket,
+    LeaderboardRow,
+    LeaderboardResponse,
+    BatchAction,
+    BatchActionsRequest,
+    BatchActionResult,
+    BatchActionsResponse,
 )
 
 __all__ = [
@@ -18,10 +35,27 @@ __all__ = [
     "RegisterAgentRequest",
     "RegisterAgentResponse",
     "GameStateResponse",
+    "TableState",
+    "BatchStateRequest",
+    "BatchStateResponse",
     "FeedItem",
+    "FeedResponse",
     "ScoreboardResponse",
     "SubmitArgumentRequest",
     "SubmitDecisionRequest",
     "AdvanceRequest",
     "OpenActionsResponse",
+    "ProfileFunction",
+    "ProfileResponse",
+    "OperatorStats",
+    "OperatorStatsResponse",
+    "AgentStats",
+    "AgentStatsResponse",
+    "LengthBucket",
+    "LeaderboardRow",
+    "LeaderboardResponse",
+    "BatchAction",
+    "BatchActionsRequest",
+    "BatchActionResult",
+    "BatchActionsResponse",
 ]
@@ -1,11 +1,18 @@
 """Pydantic schemas for API request/response."""
 from datetime import datetime
 from typing import Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CreateGameRequest(BaseModel):
     min_players: int = 1
+    rotation_seed: Optional[int] = None  # shuffle the role rotation order; None = join order
+    allow_late_join: bool = False  # accept registrations after start (seated from the next round)
+    multi_table: bool = False  # split large games into concurrent tables each round
+    majority_size: int = Field(5, ge=2)  # majority seats per table (single-table: minimum)
+    minority_size: int = Field(1, ge=1)  # minority seats per table
+    phase_deadline_s: Optional[float] = Field(None, gt=0)  # debate phase timeout -> next phase
+    decision_deadline_s: Optional[float] = Field(None, gt=0)  # operator timeout -> resolve_round (save_majority)
 
 
 class CreateGameResponse(BaseModel):
@@ -22,7 +29,24 @@ class RegisterAgentResponse(BaseModel):
     game_id: str
 
 
+class RegisterAgentsRequest(BaseModel):
+    agents: list[RegisterAgentRequest] = Field(..., min_length=1, max_length=1000)
+
+
+class RegisteredAgent(BaseModel):
+    agent_id: str
+    display_name: str
+
+
+class RegisterAgentsResponse(BaseModel):
+    game_id: str
+    agents: list[RegisteredAgent] = Field(default_factory=list)  # same order as the request
+
+
 class AgentSummary(BaseModel):
+    # Shared between responses by the game's Roster
+    model_config = ConfigDict(frozen=True)
+
     id: str
     display_name: str
     role: str  # "operator" | "majority" | "minority"
@@ -38,6 +62,8 @@ class BoardState(BaseModel):
 
 
 class CoverageProgress(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     agent_id: str
     display_name: str
     has_been_operator: bool
@@ -46,6 +72,21 @@ class CoverageProgress(BaseModel):
     complete: bool
 
 
+class TableState(BaseModel):
+    """One table (Round) of the current round number; multi-table games run several at once."""
+    round_id: str
+    table: int = 0
+    phase: Optional[str] = None
+    operator: Optional[AgentSummary] = None
+    majority_agents: list[AgentSummary] = Field(default_factory=list)
+    minority_agents: list[AgentSummary] = Field(default_factory=list)
+    decision: Optional[str] = None
+    round_outcome: Optional[dict] = None  # survivors, lost
+    phase_activity: list[str] = Field(default_factory=list)
+    board: Optional[BoardState] = None
+    phase_deadline_at: Optional[datetime] = None
+
+
 class GameStateResponse(BaseModel):
     game_id: str
     status: str
@@ -60,10 +101,24 @@ class GameStateResponse(BaseModel):
     scores: dict[str, int] = Field(default_factory=dict)
     coverage: list[CoverageProgress] = Field(default_factory=list)
     phase_activity: list[str] = Field(default_factory=list)  # agent_ids who argued this phase
+    phase_deadline_at: Optional[datetime] = None  # when the current phase times out (games with deadlines)
     last_event_at: Optional[datetime] = None
     board: Optional[BoardState] = None
     version: int = 0
     has_filler_agents: bool = False
+    multi_table: bool = False
+    tables: list[TableState] = Field(default_factory=list)  # multi-table games only; top-level fields mirror table 0
+
+
+class BatchStateRequest(BaseModel):
+    game_ids: list[str] = Field(..., min_length=1, max_length=500)
+    versions: dict[str, int] = Field(default_factory=dict)  # game_id -> version the caller already has
+
+
+class BatchStateResponse(BaseModel):
+    states: list[GameStateResponse] = Field(default_factory=list)  # only games whose version changed
+    versions: dict[str, int] = Field(default_factory=dict)  # current version of every requested game
+    missing: list[str] = Field(default_factory=list)  # requested game_ids that do not exist
 
 
 class FeedItem(BaseModel):
@@ -78,6 +133,11 @@ class FeedItem(BaseModel):
     created_at: datetime
 
 
+class FeedResponse(BaseModel):
+    game_id: str
+    items: list[FeedItem] = Field(default_factory=list)
+
+
 class ScoreboardResponse(BaseModel):
     game_id: str
     scores: list[dict[str, Any]] = Field(default_factory=list)  # [{agent_id, display_name, score}, ...]
@@ -96,6 +156,7 @@ class SubmitDecisionRequest(BaseModel):
 
 class AdvanceRequest(BaseModel):
     action: str = "next_phase"  # "next_phase" | "force_decision" | "resolve_round"
+    round_id: Optional[str] = None  # one table only; default is every unresolved table
 
 
 class OpenActionsResponse(BaseModel):
@@ -104,7 +165,141 @@ class OpenActionsResponse(BaseModel):
     allowed_action: Optional[str] = None  # "argument" | "decision" | null
     current_phase: Optional[str] = None
     role: Optional[str] = None
+    round_id: Optional[str] = None  # the agent's table this round
 
 
 class AddFillerRequest(BaseModel):
     count: int = Field(2, ge=1, le=5)
+
+
+class RosterEntry(BaseModel):
+    display_name: str
+    token: Optional[str] = None
+
+
+class CreateTournamentRequest(BaseModel):
+    name: str = ""
+    roster: list[RosterEntry] = Field(..., min_length=1, max_length=20000)
+    seats_per_game: int = Field(7, ge=3)
+    start: bool = True
+    seed: Optional[int] = None  # game k gets rotation_seed seed + k
+    multi_table: bool = False
+    majority_size: int = Field(5, ge=2)
+    minority_size: int = Field(1, ge=1)
+
+
+class TournamentAgent(BaseModel):
+    agent_id: str
+    display_name: str
+
+
+class TournamentGame(BaseModel):
+    game_id: str
+    agents: list[TournamentAgent] = Field(default_factory=list)
+
+
+class CreateTournamentResponse(BaseModel):
+    tournament_id: str
+    games: list[TournamentGame] = Field(default_factory=list)
+
+
+class ProfileFunction(BaseModel):
+    function: str  # "name (file.py:line)"
+    self_samples: int
+    self_pct: float
+    self_seconds: float
+
+
+class ProfileResponse(BaseModel):
+    seconds: float
+    interval_ms: float
+    samples: int
+    top: list[ProfileFunction] = Field(default_factory=list)
+    collapsed: str = ""  # collapsed stacks, one "frame;frame;... count" line each (flamegraph.pl / speedscope)
+
+
+class OperatorStats(BaseModel):
+    name: str
+    rounds: int  # tables operated
+    save_majority: int
+    save_minority: int
+    forced: int  # resolved without an operator decision (timeout or forced advance)
+    save_minority_rate: float  # of the rounds the operator actually decided
+
+
+class OperatorStatsResponse(BaseModel):
+    games_counted: int  # completed games the stats cover
+    operators: list[OperatorStats] = Field(default_factory=list)
+
+
+class AgentStats(BaseModel):
+    name: str
+    filler: bool
+    games: int
+    rounds: int
+    score: int  # rounds survived
+    operator_rounds: int
+    majority_rounds: int
+    majority_survived: int
+    minority_rounds: int
+    minority_survived: int
+    arguments: int
+    mean_argument_length: float  # characters
+
+
+class LengthBucket(BaseModel):
+    le: Optional[int] = None  # upper bound in characters; None for the last (overflow) bucket
+    count: int
+
+
+class AgentStatsResponse(BaseModel):
+    games_counted: int
+    agents: list[AgentStats] = Field(default_factory=list)
+    argument_lengths: list[LengthBucket] = Field(default_factory=list)
+
+
+class LeaderboardRow(BaseModel):
+    rank: int  # players tied on score share a rank
+    display_name: str
+    score: int  # rounds survived, all games
+    games: int
+    rounds: int
+    track_rounds: int  # majority or minority seats
+    survival_rate: float  # score / track_rounds, forced resolutions included
+    chosen: int
+    decided_rounds: int
+    chosen_rate: float  # chosen / decided_rounds: how often an operator's own decision saved this player
+
+
+class LeaderboardResponse(BaseModel):
+    players: int  # total players on the board
+    top: list[LeaderboardRow] = Field(default_factory=list)
+
+
+class BatchAction(BaseModel):
+    type: str  # "argument" | "decision"
+    round_id: str
+    agent_id: str
+    text: Optional[str] = Field(None, min_length=1, max_length=500)  # argument only
+    decision: Optional[str] = None  # decision only: "save_majority" | "save_minority"
+    token: Optional[str] = None  # this agent's token; defaults to the request's Authorization header
+    idempotency_key: Optional[str] = None
+
+
+class BatchActionsRequest(BaseModel):
+    actions: list[BatchAction] = Field(..., min_length=1, max_length=200)
+
+
+class BatchActionResult(BaseModel):
+    index: int
+    ok: bool
+    status: int  # what the single-action endpoint would have answered
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    replayed: bool = False  # result stored under idempotency_key, not applied again
+
+
+class BatchActionsResponse(BaseModel):
+    game_id: str
+    results: list[BatchActionResult] = Field(default_factory=list)  # same order as the request
+    advanced: bool  # try_auto_advance moved a table or round on
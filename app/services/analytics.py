@@ -0,0 +1,239 @@
+"""Aggregate stats across completed games: per-operator decision rates, per-agent survival
+and argument lengths.
+
+A completed game never changes again. Its event log is a complete snapshot of the game
+(see replay). Each one is summarized exactly once, in a worker process, and the
+summaries are folded into running totals here. A request re-reads nothing. It waits only
+for games completed since the last request, then builds its response from the totals.
+The sorted rows are cached until the next game completes. Each request only filters and
+slices them, so no request parameter adds a cache entry.
+
+Work goes to a small process pool so that summarizing a large backlog never holds the
+GIL the event loop needs. Snapshots are cut and submitted in waves of one chunk per
+worker, which bounds both the memory in flight and the time the event loop spends
+copying event lists.
+"""
+import asyncio
+import multiprocessing
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.models.domain import Decision, EventType, GameStatus
+from app.schemas.api import AgentStats, AgentStatsResponse, LengthBucket, OperatorStats, OperatorStatsResponse
+from app.storage.store import store
+
+ANALYTICS_WORKERS = int(os.environ.get("ANALYTICS_WORKERS", str(min(2, os.cpu_count() or 1))))
+CHUNK_GAMES = 200  # completed games per worker task
+ARGUMENT_LENGTH_BUCKETS = (50, 100, 200, 400, 800, 1600)  # characters; one overflow bucket above
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock: Optional[asyncio.Lock] = None
+
+
+class _Totals:
+    def __init__(self) -> None:
+        self.games: set[str] = set()
+        self.operators: dict[str, list[int]] = {}  # name -> [rounds, save_majority, save_minority, forced]
+        self.agents: dict[str, dict] = {}  # name -> counters, see _agent_row
+        self.lengths = [0] * (len(ARGUMENT_LENGTH_BUCKETS) + 1)
+        self.cache: dict[str, object] = {}  # sorted rows, unfiltered; cleared when games are folded in
+
+    def merge(self, summary: dict) -> None:
+        for name, row in summary["operators"].items():
+            cur = self.operators.setdefault(name, [0, 0, 0, 0])
+            for i, v in enumerate(row):
+                cur[i] += v
+        for name, row in summary["agents"].items():
+            cur = self.agents.get(name)
+            if cur is None:
+                self.agents[name] = dict(row)
+                continue
+            for k, v in row.items():
+                cur[k] = (cur[k] or v) if k == "filler" else cur[k] + v
+        for i, n in enumerate(summary["lengths"]):
+            self.lengths[i] += n
+
+
+_totals = _Totals()
+
+
+def _agent_row() -> dict:
+    return {
+        "games": 1,
+        "filler": False,
+        "rounds": 0,
+        "score": 0,
+        "operator_rounds": 0,
+        "majority_rounds": 0,
+        "majority_survived": 0,
+        "minority_rounds": 0,
+        "minority_survived": 0,
+        "arguments": 0,
+        "argument_chars": 0,
+    }
+
+
+def summarize_game(events: list[tuple[str, dict]]) -> dict:
+    """Per-game counters from one completed game's (event_type, payload) log. Agents are keyed
+    by display name so the same player is counted across games."""
+    names: dict[str, str] = {}
+    seats: dict[str, tuple[str, list[str], list[str]]] = {}
+    operators: dict[str, list[int]] = {}
+    agents: dict[str, dict] = {}
+    lengths = [0] * (len(ARGUMENT_LENGTH_BUCKETS) + 1)
+
+    def agent(aid: str) -> dict:
+        name = names.get(aid, aid)
+        row = agents.get(name)
+        if row is None:
+            row = agents[name] = _agent_row()
+        return row
+
+    for event_type, payload in events:
+        if event_type == EventType.agent_registered.value:
+            names[payload["agent_id"]] = payload["display_name"]
+        elif event_type == EventType.agents_registered.value:
+            for entry in payload["agents"]:
+                names[entry["agent_id"]] = entry["display_name"]
+        elif event_type == EventType.filler_marked.value:
+            agent(payload["agent_id"])["filler"] = True
+        elif event_type == EventType.round_started.value:
+            seats[payload["round_id"]] = (payload["operator_agent_id"], payload["majority_agent_ids"], payload["minority_agent_ids"])
+        elif event_type == EventType.argument_submitted.value:
+            n = len(payload.get("text", ""))
+            row = agent(payload["agent_id"])
+            row["arguments"] += 1
+            row["argument_chars"] += n
+            lengths[bisect_left(ARGUMENT_LENGTH_BUCKETS, n)] += 1
+        elif event_type == EventType.round_resolved.value:
+            operator_id, majority_ids, minority_ids = seats[payload["round_id"]]
+            dec = payload.get("decision") or Decision.save_majority.value
+            op = operators.setdefault(names.get(operator_id, operator_id), [0, 0, 0, 0])
+            op[0] += 1
+            if payload.get("forced"):
+                op[3] += 1
+            else:
+                op[1 if dec == Decision.save_majority.value else 2] += 1
+            survivors = set(payload["survivors"])
+            agent(operator_id)["operator_rounds"] += 1
+            for role, ids in (("majority", majority_ids), ("minority", minority_ids)):
+                for aid in ids:
+                    row = agent(aid)
+                    row[f"{role}_rounds"] += 1
+                    if aid in survivors:
+                        row[f"{role}_survived"] += 1
+                        row["score"] += 1
+            for aid in [operator_id] + majority_ids + minority_ids:
+                agent(aid)["rounds"] += 1
+    return {"operators": operators, "agents": agents, "lengths": lengths}
+
+
+def summarize_games(logs: list[list[tuple[str, dict]]]) -> dict:
+    """Worker task: one combined summary for a chunk of games."""
+    combined = _Totals()
+    for events in logs:
+        combined.merge(summarize_game(events))
+    return {"operators": combined.operators, "agents": combined.agents, "lengths": combined.lengths}
+
+
+def _snapshot(game_id: str) -> list[tuple[str, dict]]:
+    return [(e.event_type.value, e.payload_json) for e in store.events_by_game.get(game_id, [])]
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Spawned, not forked: the server process has live threads (request threadpool, profiler)
+        _pool = ProcessPoolExecutor(max_workers=ANALYTICS_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def refresh() -> int:
+    """Fold every game completed since the last call into the totals. Returns games counted."""
+    global _lock, _totals
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        seqs = store.seqs_by_status.get(GameStatus.game_completed, [])
+        if len(seqs) < len(_totals.games):
+            _totals = _Totals()  # the store was reset
+        if len(seqs) == len(_totals.games):
+            return len(_totals.games)
+        new = [gid for gid in (store.games_in_order[s] for s in seqs) if gid not in _totals.games]
+        loop = asyncio.get_running_loop()
+        pool = _get_pool()
+        wave = CHUNK_GAMES * ANALYTICS_WORKERS
+        for i in range(0, len(new), wave):
+            batch = new[i : i + wave]
+            chunks = [[_snapshot(gid) for gid in batch[j : j + CHUNK_GAMES]] for j in range(0, len(batch), CHUNK_GAMES)]
+            for summary in await asyncio.gather(*(loop.run_in_executor(pool, summarize_games, c) for c in chunks)):
+                _totals.merge(summary)
+            _totals.games.update(batch)
+        _totals.cache.clear()
+        return len(_totals.games)
+
+
+def _operator_rows() -> list[OperatorStats]:
+    """Every operator, most rounds first. Cached until the next game completes."""
+    rows = _totals.cache.get("operators")
+    if rows is None:
+        rows = []
+        for name, (rounds, save_majority, save_minority, forced) in _totals.operators.items():
+            decided = save_majority + save_minority
+            rows.append(OperatorStats(
+                name=name,
+                rounds=rounds,
+                save_majority=save_majority,
+                save_minority=save_minority,
+                forced=forced,
+                save_minority_rate=round(save_minority / decided, 4) if decided else 0.0,
+            ))
+        rows.sort(key=lambda r: (-r.rounds, r.name))
+        _totals.cache["operators"] = rows
+    return rows
+
+
+async def operator_stats(limit: int = 50, min_rounds: int = 1) -> OperatorStatsResponse:
+    """Operators with at least min_rounds rounds operated, most rounds first."""
+    games = await refresh()
+    rows = []
+    for r in _operator_rows():
+        if r.rounds < min_rounds or len(rows) == limit:
+            break
+        rows.append(r)
+    return OperatorStatsResponse(games_counted=games, operators=rows)
+
+
+def _agent_rows() -> tuple[list[AgentStats], list[LengthBucket]]:
+    """Every agent by score, plus the argument length buckets. Cached until the next game completes."""
+    cached = _totals.cache.get("agents")
+    if cached is None:
+        rows = [
+            AgentStats(
+                name=name,
+                mean_argument_length=round(row["argument_chars"] / row["arguments"], 1) if row["arguments"] else 0.0,
+                **{k: v for k, v in row.items() if k != "argument_chars"},
+            )
+            for name, row in _totals.agents.items()
+        ]
+        rows.sort(key=lambda r: (-r.score, -r.rounds, r.name))
+        bounds = list(ARGUMENT_LENGTH_BUCKETS) + [None]
+        buckets = [LengthBucket(le=b, count=n) for b, n in zip(bounds, _totals.lengths)]
+        cached = _totals.cache["agents"] = (rows, buckets)
+    return cached
+
+
+async def agent_stats(limit: int = 50) -> AgentStatsResponse:
+    """Agents by total score (rounds survived), plus the distribution of argument lengths."""
+    games = await refresh()
+    rows, buckets = _agent_rows()
+    return AgentStatsResponse(games_counted=games, agents=rows[:limit], argument_lengths=buckets)
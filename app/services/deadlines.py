@@ -0,0 +1,88 @@
+"""Deadline scheduler: one min-heap of timers for every game, fired on the event loop.
+
+Timers are never cancelled. Callbacks re-check the state they were armed for and do
+nothing if it has moved on (lazy invalidation), so re-arming on every phase change
+costs one heap push and no bookkeeping. The loop holds a single timer handle, for the
+earliest due time; it is only re-armed when a new timer becomes the earliest. Callbacks
+run on the loop like request handlers, so they never interleave with one.
+
+The server attaches the scheduler to its loop at startup. Until then (and in scripts
+that use game_service without a loop) timers wait in the heap, and run_due() fires them.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+
+class DeadlineScheduler:
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Callable[[], None]]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Fire timers on loop from now on. Call from the loop's thread."""
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._rearm()
+
+    def detach(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._loop = None
+        self._loop_thread = None
+
+    def schedule(self, delay: float, fn: Callable[[], None]) -> float:
+        """Run fn about delay seconds from now. Returns the monotonic due time."""
+        due = time.monotonic() + delay
+        with self._lock:
+            heapq.heappush(self._heap, (due, next(self._seq), fn))
+            earliest = self._heap[0][0] == due
+        loop = self._loop
+        if earliest and loop is not None:
+            if threading.get_ident() == self._loop_thread:
+                self._rearm()
+            else:
+                loop.call_soon_threadsafe(self._rearm)
+        return due
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Fire every timer due by now (monotonic). Returns how many fired."""
+        now = time.monotonic() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+        for fn in due:
+            try:
+                fn()
+            except Exception:
+                pass
+        return len(due)
+
+    def _rearm(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._loop is None or not self._heap:
+            return
+        self._handle = self._loop.call_later(max(0.0, self._heap[0][0] - time.monotonic()), self._fire)
+
+    def _fire(self) -> None:
+        self._handle = None
+        self.run_due()
+        self._rearm()
+
+
+# Singleton
+scheduler = DeadlineScheduler()
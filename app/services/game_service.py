@@ -1,7 +1,7 @@
 """Game logic: role assignment, phase advancement, scoring, end condition."""
-import random
-from datetime import datetime
-from typing import Optional
+import functools
+from datetime import datetime, timedelta
+from typing import Callable, Optional
 
 from app.models.domain import (
     Game,
@@ -16,14 +16,36 @@ from app.models.domain import (
     Decision,
     EventType,
 )
+from app.metrics import AUTO_ADVANCES
 from app.storage.store import store
+from app.tracing import traced
+from app.services.scheduler import rotation_order, assign_tables
+from app.services.deadlines import scheduler as deadline_scheduler
+from app.services.state_builder import freeze_round_summary
 
-# Fixed round layout: 1 operator + 5 majority + 1 minority = 7 agents per round
+# Default table layout: 1 operator + 5 majority + 1 minority = 7 seats per table.
+# Games can override the track sizes via config["majority_size"] / config["minority_size"].
 ROUND_OPERATOR = 1
 ROUND_MAJORITY = 5
 ROUND_MINORITY = 1
 ROUND_TOTAL = ROUND_OPERATOR + ROUND_MAJORITY + ROUND_MINORITY
 
+DEBATE_PHASES = (Phase.phase_1, Phase.phase_2, Phase.phase_3)
+_PHASE_ORDER = (Phase.phase_1, Phase.phase_2, Phase.phase_3, Phase.awaiting_decision, Phase.resolved)
+
+
+def _game_locked(fn: Callable) -> Callable:
+    """Run fn under its game's lock (the first argument is the game_id). The lock is
+    re-entrant, so locked functions can call each other and callers can hold it across
+    several calls (see the actions batch route)."""
+
+    @functools.wraps(fn)
+    def wrapper(game_id: str, *args, **kwargs):
+        with store.game_lock(game_id):
+            return fn(game_id, *args, **kwargs)
+
+    return wrapper
+
 
 def _participation_key(game_id: str, agent_id: str) -> str:
     return f"{game_id}:{agent_id}"
@@ -34,32 +56,133 @@ def _log(game_id: str, event_type: EventType, payload: dict, round_id: Optional[
     store.add_event(e)
 
 
-def create_game(min_players: int = 1) -> Game:
+@traced("game.create_game")
+def create_game(
+    min_players: int = 1,
+    rotation_seed: Optional[int] = None,
+    allow_late_join: bool = False,
+    multi_table: bool = False,
+    majority_size: int = ROUND_MAJORITY,
+    minority_size: int = ROUND_MINORITY,
+    phase_deadline_s: Optional[float] = None,
+    decision_deadline_s: Optional[float] = None,
+) -> Game:
+    if minority_size < 1 or majority_size <= minority_size:
+        raise ValueError("Track sizes must satisfy majority_size > minority_size >= 1")
     g = Game.new(min_players=min_players)
+    g.config = {
+        "rotation_seed": rotation_seed,
+        "allow_late_join": allow_late_join,
+        "multi_table": multi_table,
+        "majority_size": majority_size,
+        "minority_size": minority_size,
+        # Seconds each debate phase / the operator decision may take before the server moves on
+        "phase_deadline_s": phase_deadline_s,
+        "decision_deadline_s": decision_deadline_s,
+    }
     store.add_game(g)
-    _log(g.id, EventType.game_created, {"min_players": min_players})
+    _log(g.id, EventType.game_created, {"min_players": min_players, **g.config})
     return g
 
 
+def seats_per_table(g: Game) -> int:
+    """Agents needed to seat one table (and so to start the game)."""
+    return ROUND_OPERATOR + g.config.get("majority_size", ROUND_MAJORITY) + g.config.get("minority_size", ROUND_MINORITY)
+
+
+def _require_seats(g: Game, player_count: int) -> None:
+    if player_count < seats_per_table(g):
+        raise ValueError(
+            f"Need at least {seats_per_table(g)} agents (1 operator, "
+            f"{g.config.get('majority_size', ROUND_MAJORITY)} majority, "
+            f"{g.config.get('minority_size', ROUND_MINORITY)} minority)"
+        )
+
+
+def _accepts_agents(g: Game) -> bool:
+    if g.status in (GameStatus.waiting_for_agents, GameStatus.ready_to_start):
+        return True
+    return bool(g.config.get("allow_late_join")) and g.status != GameStatus.game_completed
+
+
+def _check_tokens(game_id: str, agents: list[Agent]) -> None:
+    """A token identifies one agent per game: it may not already be taken there, nor repeat within a batch."""
+    seen = set()
+    for a in agents:
+        if not a.token_hash:
+            continue
+        if a.token_hash in seen or store.agent_for_token(game_id, a.token_hash):
+            raise ValueError("Token already registered in this game")
+        seen.add(a.token_hash)
+
+
+@traced("game.register_agent")
+@_game_locked
 def register_agent(game_id: str, display_name: str, token: Optional[str] = None) -> tuple[Game, Agent, Participation]:
     g = store.get_game(game_id)
     if not g:
         raise ValueError("Game not found")
-    if g.status != GameStatus.waiting_for_agents and g.status != GameStatus.ready_to_start:
+    if not _accepts_agents(g):
         raise ValueError("Game already started")
     a = Agent.new(display_name=display_name, token=token)
+    _check_tokens(game_id, [a])
     store.add_agent(a)
+    store.index_tokens(game_id, [a])
     p = Participation.new(game_id=game_id, agent_id=a.id)
     store.add_participation(p)
     _log(g.id, EventType.agent_registered, {"agent_id": a.id, "display_name": display_name})
+    if game_id in store.rotations:
+        # Late joiner: seated from the next round, after everyone already in the rotation
+        store.rotations[game_id].append(a.id)
     # Update game status if we have enough players
-    parts = store.get_participations_for_game(game_id)
-    if len(parts) >= g.min_players:
+    elif store.count_participations(game_id) >= g.min_players:
         g.status = GameStatus.ready_to_start
         store.update_game(g)
     return g, a, p
 
 
+@traced("game.register_agents")
+@_game_locked
+def register_agents(
+    game_id: str,
+    entries: list[tuple[str, Optional[str]]],
+) -> tuple[Game, list[Agent]]:
+    """Register many (display_name, token) entries at once: all or nothing, one
+    agents_registered event, and a single min_players check at the end."""
+    g = store.get_game(game_id)
+    if not g:
+        raise ValueError("Game not found")
+    if not _accepts_agents(g):
+        raise ValueError("Game already started")
+    if not entries:
+        raise ValueError("No agents to register")
+    agents = [Agent.new(display_name=name, token=token) for name, token in entries]
+    _check_tokens(game_id, agents)
+    store.add_agents(agents)
+    store.index_tokens(game_id, agents)
+    store.add_participations([Participation.new(game_id=game_id, agent_id=a.id) for a in agents])
+    _log(
+        g.id,
+        EventType.agents_registered,
+        {"count": len(agents), "agents": [{"agent_id": a.id, "display_name": a.display_name} for a in agents]},
+    )
+    if game_id in store.rotations:
+        store.rotations[game_id].extend(a.id for a in agents)
+    elif store.count_participations(game_id) >= g.min_players:
+        g.status = GameStatus.ready_to_start
+        store.update_game(g)
+    return g, agents
+
+
+@_game_locked
+def mark_filler(game_id: str, agent_id: str) -> None:
+    """Hand a registered agent to the GPT filler."""
+    store.mark_filler(agent_id)
+    _log(game_id, EventType.filler_marked, {"agent_id": agent_id})
+
+
+@traced("game.start_game")
+@_game_locked
 def start_game(game_id: str) -> Game:
     g = store.get_game(game_id)
     if not g:
@@ -69,65 +192,121 @@ def start_game(game_id: str) -> Game:
     parts = store.get_participations_for_game(game_id)
     if len(parts) < g.min_players:
         raise ValueError("Not enough players")
+    _require_seats(g, len(parts))
     g.status = GameStatus.round_phase_1
     g.current_round_number = 1
     store.update_game(g)
-    _log(g.id, EventType.game_started, {"player_count": len(parts)})
-    # Create first round with role assignment
-    _start_new_round(game_id)
+    store.rotations[game_id] = rotation_order([p.agent_id for p in parts], g.config.get("rotation_seed"))
+    _log(g.id, EventType.game_started, {"player_count": len(parts), "rotation": list(store.rotations[game_id])})
+    # Create first round (one per table) with role assignment
+    _start_new_cycle(game_id)
     return store.get_game(game_id)
 
 
-def _start_new_round(game_id: str) -> Round:
+@traced("game.start_new_cycle")
+def _start_new_cycle(game_id: str) -> list[Round]:
+    """Seat every agent for round g.current_round_number: one Round per table.
+
+    Single-table games run one table with everyone not operator or minority on the majority
+    track. Multi-table games split the roster into as many full tables as it fills; each
+    table then moves through its own phases and resolves on its own.
+    """
     g = store.get_game(game_id)
-    parts = store.get_participations_for_game(game_id)
-    agent_ids = [p.agent_id for p in parts]
-    if len(agent_ids) < ROUND_TOTAL:
-        raise ValueError(f"Need at least {ROUND_TOTAL} agents (1 operator, 5 majority, 1 minority)")
-    # Pick operator: prefer someone who hasn't been operator
-    parts_with_roles = [store.get_participation(game_id, aid) for aid in agent_ids]
-    parts_with_roles = [p for p in parts_with_roles if p]
-    never_operator = [p for p in parts_with_roles if not p.has_been_operator]
-    if never_operator:
-        operator_id = random.choice(never_operator).agent_id
-    else:
-        operator_id = random.choice(parts_with_roles).agent_id
-    rest_pool = [aid for aid in agent_ids if aid != operator_id]
-    if len(rest_pool) < ROUND_MAJORITY + ROUND_MINORITY:
-        raise ValueError(f"Need at least {ROUND_TOTAL} agents (1 operator, 5 majority, 1 minority)")
-    # Assign so game can complete: prefer "never minority" for the 1 minority slot (operator already preferred "never operator")
-    parts_rest = [store.get_participation(game_id, aid) for aid in rest_pool]
-    parts_rest = [p for p in parts_rest if p]
-    never_minority = [p for p in parts_rest if not p.has_been_minority]
-    if never_minority:
-        minority_agent = random.choice(never_minority).agent_id
-    else:
-        minority_agent = random.choice(parts_rest).agent_id
-    majority_ids = [aid for aid in rest_pool if aid != minority_agent]
-    minority_ids = [minority_agent]
-    r = Round.new(
-        game_id=game_id,
-        round_number=g.current_round_number,
-        operator_agent_id=operator_id,
-        majority_agent_ids=majority_ids,
-        minority_agent_ids=minority_ids,
-    )
-    store.add_round(r)
+    order = store.rotations[game_id]
+    _require_seats(g, len(order))
+    minority_size = g.config.get("minority_size", ROUND_MINORITY)
+    tables = len(order) // seats_per_table(g) if g.config.get("multi_table") else 1
+    # Deterministic rotation: covers every role for every agent in the minimum number of rounds
+    parts = {aid: store.get_participation(game_id, aid) for aid in order}
+    rounds = []
+    for table, (operator_id, majority_ids, minority_ids) in enumerate(
+        assign_tables(order, parts, tables=tables, minority_size=minority_size)
+    ):
+        r = Round.new(
+            game_id=game_id,
+            round_number=g.current_round_number,
+            operator_agent_id=operator_id,
+            majority_agent_ids=majority_ids,
+            minority_agent_ids=minority_ids,
+            table=table,
+        )
+        _arm_deadline(g, r)
+        store.add_round(r)
+        rounds.append(r)
+        _log(
+            game_id,
+            EventType.round_started,
+            {
+                "round_id": r.id,
+                "round_number": r.round_number,
+                "table": table,
+                "operator_agent_id": operator_id,
+                "majority_agent_ids": majority_ids,
+                "minority_agent_ids": minority_ids,
+            },
+            round_id=r.id,
+        )
     g.current_phase = Phase.phase_1
     store.update_game(g)
-    _log(
-        game_id,
-        EventType.round_started,
-        {
-            "round_id": r.id,
-            "round_number": r.round_number,
-            "operator_agent_id": operator_id,
-            "majority_agent_ids": majority_ids,
-            "minority_agent_ids": minority_ids,
-        },
-        round_id=r.id,
-    )
-    return r
+    return rounds
+
+
+def _active_rounds(game_id: str) -> list[Round]:
+    """Unresolved tables of the current round."""
+    return [r for r in store.get_current_rounds(game_id) if r.status == RoundStatus.active]
+
+
+def _sync_game_phase(g: Game) -> None:
+    """Game phase/status follow the slowest unresolved table (the only table in single-table games)."""
+    active = _active_rounds(g.id)
+    if not active:
+        return
+    phase = min((r.phase for r in active), key=_PHASE_ORDER.index)
+    g.current_phase = phase
+    g.status = _game_status_from_phase(phase)
+    store.update_game(g)
+
+
+def _set_round_phase(g: Game, r: Round, phase: Phase, timed_out: bool = False) -> None:
+    r.phase = phase
+    _arm_deadline(g, r)
+    store.update_round(r)
+    _sync_game_phase(g)
+    payload = {"round_id": r.id, "phase": phase.value}
+    if timed_out:
+        payload["timed_out"] = True
+    _log(g.id, EventType.phase_advanced, payload, round_id=r.id)
+
+
+def _arm_deadline(g: Game, r: Round) -> None:
+    """Schedule the timeout for the round's current phase, if the game configures one."""
+    if r.phase in DEBATE_PHASES:
+        seconds = g.config.get("phase_deadline_s")
+    elif r.phase == Phase.awaiting_decision:
+        seconds = g.config.get("decision_deadline_s")
+    else:
+        seconds = None
+    if not seconds:
+        r.phase_deadline_at = None
+        return
+    r.phase_deadline_at = datetime.utcnow() + timedelta(seconds=seconds)
+    game_id, round_id, phase = g.id, r.id, r.phase
+    deadline_scheduler.schedule(seconds, lambda: _on_deadline(game_id, round_id, phase))
+
+
+@traced("game.on_deadline")
+@_game_locked
+def _on_deadline(game_id: str, round_id: str, phase: Phase) -> None:
+    """Timer callback: a debate phase times out into the next phase, a decision into resolve_round.
+    Stale timers (round already moved past phase) do nothing."""
+    g = store.get_game(game_id)
+    r = store.get_round(round_id)
+    if not g or not r or r.status != RoundStatus.active or r.phase != phase:
+        return
+    if phase in DEBATE_PHASES:
+        _set_round_phase(g, r, _NEXT_PHASE[phase], timed_out=True)
+    else:
+        _resolve_round(g, r, Decision.save_majority, forced=True, timed_out=True)
 
 
 def _game_status_from_phase(phase: Phase) -> GameStatus:
@@ -140,6 +319,8 @@ def _game_status_from_phase(phase: Phase) -> GameStatus:
     }[phase]
 
 
+@traced("game.submit_argument")
+@_game_locked
 def submit_argument(game_id: str, round_id: str, agent_id: str, text: str) -> Argument:
     g = store.get_game(game_id)
     r = store.get_round(round_id)
@@ -152,7 +333,7 @@ def submit_argument(game_id: str, round_id: str, agent_id: str, text: str) -> Ar
     if agent_id not in r.majority_agent_ids and agent_id not in r.minority_agent_ids:
         raise ValueError("Agent not in this round as majority/minority")
     current_phase = r.phase
-    if current_phase not in (Phase.phase_1, Phase.phase_2, Phase.phase_3):
+    if current_phase not in DEBATE_PHASES:
         raise ValueError("Not in a debate phase")
     existing = store.get_arguments_in_round_phase(round_id, current_phase)
     if any(a.agent_id == agent_id for a in existing):
@@ -162,12 +343,14 @@ def submit_argument(game_id: str, round_id: str, agent_id: str, text: str) -> Ar
     _log(
         game_id,
         EventType.argument_submitted,
-        {"round_id": round_id, "phase": current_phase.value, "agent_id": agent_id, "argument_id": arg.id},
+        {"round_id": round_id, "phase": current_phase.value, "agent_id": agent_id, "argument_id": arg.id, "text": arg.text},
         round_id=round_id,
     )
     return arg
 
 
+@traced("game.submit_decision")
+@_game_locked
 def submit_decision(game_id: str, round_id: str, agent_id: str, decision: str) -> None:
     g = store.get_game(game_id)
     r = store.get_round(round_id)
@@ -182,62 +365,124 @@ def submit_decision(game_id: str, round_id: str, agent_id: str, decision: str) -
     dec = Decision(decision) if decision in ("save_majority", "save_minority") else None
     if not dec:
         raise ValueError("Decision must be save_majority or save_minority")
+    _resolve_round(g, r, dec)
+
+
+def apply_round(
+    parts: dict[str, Optional[Participation]],
+    operator_id: str,
+    majority_ids: list[str],
+    minority_ids: list[str],
+    dec: Decision,
+) -> tuple[list[str], list[str]]:
+    """Scoring and role coverage for one resolved table: survivors score a point and every
+    seated agent is credited with the role it held. Mutates parts; returns (survivors, lost)."""
+    survivors = majority_ids if dec == Decision.save_majority else minority_ids
+    lost = minority_ids if dec == Decision.save_majority else majority_ids
+    p = parts.get(operator_id)
+    if p:
+        p.has_been_operator = True
+    for aid in majority_ids:
+        p = parts.get(aid)
+        if p:
+            p.has_been_majority = True
+    for aid in minority_ids:
+        p = parts.get(aid)
+        if p:
+            p.has_been_minority = True
+    for aid in survivors:
+        p = parts.get(aid)
+        if p:
+            p.score += 1
+    return survivors, lost
+
+
+def _record_leaderboard(r: Round, survivor_ids: set[str], forced: bool) -> None:
+    seats = [(r.operator_agent_id, "operator")]
+    seats += [(aid, "majority") for aid in r.majority_agent_ids]
+    seats += [(aid, "minority") for aid in r.minority_agent_ids]
+    entries = []
+    for aid, role in seats:
+        a = store.get_agent(aid)
+        if a:
+            entries.append((aid, a.display_name, a.token_hash, role))
+    store.leaderboard.record_round(entries, survivor_ids, forced)
+
+
+@traced("game.resolve_round")
+def _resolve_round(g: Game, r: Round, dec: Decision, forced: bool = False, timed_out: bool = False) -> None:
+    """Shared by submit_decision and advance(resolve_round): record the decision, score the
+    survivors and update role coverage in one pass over the round's agents, then check game end."""
     r.decision = dec
     r.phase = Phase.resolved
     r.status = RoundStatus.resolved
     r.resolved_at = datetime.utcnow()
+    r.phase_deadline_at = None
     store.update_round(r)
-    survivors = r.majority_agent_ids if dec == Decision.save_majority else r.minority_agent_ids
-    lost = r.minority_agent_ids if dec == Decision.save_majority else r.majority_agent_ids
-    for p in store.get_participations_for_game(game_id):
-        if p.agent_id in survivors:
-            p.score += 1
-            store.update_participation(p)
-        if p.agent_id == r.operator_agent_id:
-            p.has_been_operator = True
-            store.update_participation(p)
-        if p.agent_id in r.majority_agent_ids:
-            p.has_been_majority = True
-            store.update_participation(p)
-        if p.agent_id in r.minority_agent_ids:
-            p.has_been_minority = True
+    seated = [r.operator_agent_id] + r.majority_agent_ids + r.minority_agent_ids
+    parts = {aid: store.get_participation(g.id, aid) for aid in seated}
+    survivors, lost = apply_round(parts, r.operator_agent_id, r.majority_agent_ids, r.minority_agent_ids, dec)
+    for p in parts.values():
+        if p:
             store.update_participation(p)
+    _record_leaderboard(r, set(survivors), forced)
+    freeze_round_summary(r)
+    if forced:
+        payload = {"round_id": r.id, "decision": dec.value, "survivors": survivors, "lost": lost, "forced": True}
+        if timed_out:
+            payload["timed_out"] = True
+        _log(g.id, EventType.round_resolved, payload, round_id=r.id)
+    else:
+        _log(
+            g.id,
+            EventType.decision_submitted,
+            {"round_id": r.id, "decision": dec.value, "survivors": survivors, "lost": lost},
+            round_id=r.id,
+        )
+        _log(
+            g.id,
+            EventType.round_resolved,
+            {"round_id": r.id, "decision": dec.value, "survivors": survivors, "lost": lost},
+            round_id=r.id,
+        )
+    if _active_rounds(g.id):
+        # Other tables of this round are still playing
+        _sync_game_phase(g)
+        return
     g.status = GameStatus.round_resolved
     g.current_phase = Phase.resolved
     store.update_game(g)
-    _log(
-        game_id,
-        EventType.decision_submitted,
-        {"round_id": round_id, "decision": decision, "survivors": survivors, "lost": lost},
-        round_id=round_id,
-    )
-    _log(
-        game_id,
-        EventType.round_resolved,
-        {"round_id": round_id, "survivors": survivors, "lost": lost},
-        round_id=round_id,
-    )
     # Check game end: everyone has been operator, majority, minority
-    if _is_game_complete(game_id):
+    if _is_game_complete(g.id):
         g.status = GameStatus.game_completed
         store.update_game(g)
         _log(g.id, EventType.game_completed, {})
-    return
 
 
 def _is_game_complete(game_id: str) -> bool:
-    parts = store.get_participations_for_game(game_id)
-    return all(
-        p.has_been_operator and p.has_been_majority and p.has_been_minority for p in parts
-    )
+    """O(1): the store keeps a running set of participants with full role coverage."""
+    return store.count_complete(game_id) == store.count_participations(game_id)
+
+
+_NEXT_PHASE = {
+    Phase.phase_1: Phase.phase_2,
+    Phase.phase_2: Phase.phase_3,
+    Phase.phase_3: Phase.awaiting_decision,
+}
 
 
-def advance(game_id: str, action: str = "next_phase") -> Game:
-    """Admin/manual advance: next_phase, force_decision, resolve_round."""
+@traced("game.advance")
+@_game_locked
+def advance(game_id: str, action: str = "next_phase", round_id: Optional[str] = None) -> Game:
+    """Admin/manual advance: next_phase, force_decision, resolve_round.
+
+    Applies to every unresolved table of the current round, or only to round_id if given.
+    """
     g = store.get_game(game_id)
     if not g:
         raise ValueError("Game not found")
-    r = store.get_current_round(game_id)
+    if action not in ("next_phase", "force_decision", "resolve_round"):
+        raise ValueError("Unknown advance action")
     if action == "next_phase":
         if g.status in (GameStatus.waiting_for_agents, GameStatus.ready_to_start, GameStatus.game_completed):
             raise ValueError("Nothing to advance")
@@ -247,109 +492,79 @@ def advance(game_id: str, action: str = "next_phase") -> Game:
             g.status = GameStatus.round_phase_1
             g.current_phase = Phase.phase_1
             store.update_game(g)
-            _start_new_round(game_id)
+            _start_new_cycle(game_id)
             return store.get_game(game_id)
+    if round_id is not None:
+        r = store.get_round(round_id)
         if not r or r.game_id != game_id:
+            raise ValueError("Game or round not found")
+        rounds = [r]
+    else:
+        rounds = _active_rounds(game_id)
+    if action == "next_phase":
+        if not rounds:
             raise ValueError("No active round")
         # Advance phase: phase_1 -> phase_2 -> phase_3 -> awaiting_decision
-        next_phase = {
-            Phase.phase_1: Phase.phase_2,
-            Phase.phase_2: Phase.phase_3,
-            Phase.phase_3: Phase.awaiting_decision,
-        }.get(r.phase)
-        if not next_phase:
+        targets = [r for r in rounds if r.phase in _NEXT_PHASE]
+        if not targets:
             raise ValueError("Already at decision or resolved")
-        r.phase = next_phase
-        store.update_round(r)
-        g.current_phase = next_phase
-        g.status = _game_status_from_phase(next_phase)
-        store.update_game(g)
-        _log(game_id, EventType.phase_advanced, {"round_id": r.id, "phase": next_phase.value}, round_id=r.id)
+        for r in targets:
+            _set_round_phase(g, r, _NEXT_PHASE[r.phase])
         return store.get_game(game_id)
     if action == "force_decision":
-        if not r or r.phase not in (Phase.phase_1, Phase.phase_2, Phase.phase_3):
+        targets = [r for r in rounds if r.phase in DEBATE_PHASES]
+        if not targets:
             raise ValueError("Not in debate phase or no round")
-        r.phase = Phase.awaiting_decision
-        store.update_round(r)
-        g.current_phase = Phase.awaiting_decision
-        g.status = GameStatus.awaiting_operator_decision
-        store.update_game(g)
-        _log(game_id, EventType.phase_advanced, {"round_id": r.id, "phase": "awaiting_decision"}, round_id=r.id)
+        for r in targets:
+            _set_round_phase(g, r, Phase.awaiting_decision)
         return store.get_game(game_id)
-    if action == "resolve_round":
-        if not r or r.phase != Phase.awaiting_decision:
-            raise ValueError("Not awaiting decision")
+    targets = [r for r in rounds if r.phase == Phase.awaiting_decision]
+    if not targets:
+        raise ValueError("Not awaiting decision")
+    for r in targets:
         # Force save_majority as default to unblock demo
-        r.decision = Decision.save_majority
-        r.phase = Phase.resolved
-        r.status = RoundStatus.resolved
-        r.resolved_at = datetime.utcnow()
-        store.update_round(r)
-        survivors = r.majority_agent_ids
-        lost = r.minority_agent_ids
-        for p in store.get_participations_for_game(game_id):
-            if p.agent_id in survivors:
-                p.score += 1
-                store.update_participation(p)
-            if p.agent_id == r.operator_agent_id:
-                p.has_been_operator = True
-                store.update_participation(p)
-            if p.agent_id in r.majority_agent_ids:
-                p.has_been_majority = True
-                store.update_participation(p)
-            if p.agent_id in r.minority_agent_ids:
-                p.has_been_minority = True
-                store.update_participation(p)
-        g.status = GameStatus.round_resolved
-        g.current_phase = Phase.resolved
-        store.update_game(g)
-        _log(
-            game_id,
-            EventType.round_resolved,
-            {"round_id": r.id, "survivors": survivors, "lost": lost, "forced": True},
-            round_id=r.id,
-        )
-        if _is_game_complete(game_id):
-            g.status = GameStatus.game_completed
-            store.update_game(g)
-            _log(g.id, EventType.game_completed, {})
-        return store.get_game(game_id)
-    raise ValueError("Unknown advance action")
+        _resolve_round(g, r, Decision.save_majority, forced=True)
+    return store.get_game(game_id)
 
 
+@traced("game.try_auto_advance")
+@_game_locked
 def try_auto_advance(game_id: str) -> bool:
-    """If the round/phase is complete (everyone spoke or round resolved), advance once. Returns True if an advance was made. Never raises."""
+    """If a table's phase is complete (everyone spoke) or the round resolved, advance it. Returns True if an advance was made. Never raises."""
     try:
         g = store.get_game(game_id)
         if not g:
             return False
         if g.status == GameStatus.round_resolved:
             advance(game_id, "next_phase")
+            AUTO_ADVANCES.inc()
             return True
-        r = store.get_current_round(game_id)
-        if not r or r.game_id != game_id:
-            return False
-        # Operator does NOT argue; only the 6 track agents (majority + minority) must argue to advance
-        if r.phase in (Phase.phase_1, Phase.phase_2, Phase.phase_3):
-            argued = store.get_arguments_in_round_phase(r.id, r.phase)
-            argued_ids = {a.agent_id for a in argued}
-            required = set(r.majority_agent_ids) | set(r.minority_agent_ids)
-            if required and argued_ids >= required:
-                advance(game_id, "next_phase")
-                return True
+        advanced = False
+        for r in _active_rounds(game_id):
+            # Operator does NOT argue; only the track agents (majority + minority) must argue to advance
+            if r.phase in DEBATE_PHASES:
+                argued = store.get_arguments_in_round_phase(r.id, r.phase)
+                argued_ids = {a.agent_id for a in argued}
+                required = set(r.majority_agent_ids) | set(r.minority_agent_ids)
+                if required and argued_ids >= required:
+                    advance(game_id, "next_phase", round_id=r.id)
+                    AUTO_ADVANCES.inc()
+                    advanced = True
+        return advanced
     except Exception:
         return False
-    return False
 
 
 # Convenience export
 class GameService:
     create_game = staticmethod(create_game)
     register_agent = staticmethod(register_agent)
+    register_agents = staticmethod(register_agents)
     start_game = staticmethod(start_game)
     submit_argument = staticmethod(submit_argument)
     submit_decision = staticmethod(submit_decision)
     advance = staticmethod(advance)
+    try_auto_advance = staticmethod(try_auto_advance)
 
 
 game_service = GameService()
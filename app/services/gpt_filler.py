@@ -1,10 +1,13 @@
 """GPT-backed filler agents: generate arguments and decisions when agents are lacking."""
 import os
 import random
+import time
 from typing import Optional
 
+from app.metrics import FILLER_LLM_CALLS, FILLER_LLM_SECONDS
 from app.storage.store import store
-from app.services.state_builder import build_game_state
+from app.tracing import span, traced
+from app.services.state_builder import build_tables
 from app.services.game_service import submit_argument, submit_decision
 
 # ---------------------------------------------------------------------------
@@ -27,25 +30,40 @@ ARGUMENT_TEMPLATES_MINORITY = [
 DECISION_OPTIONS = ["save_majority", "save_minority"]
 
 
+_client = None  # (api key, AsyncOpenAI): one client and connection pool for every filler call
+_in_flight: set[str] = set()  # filler agent ids waiting on an LLM call
+
+
 def _get_openai_client():
-    try:
-        from openai import OpenAI
-        key = (OPENAI_API_KEY or os.environ.get("OPENAI_API_KEY") or "").strip()
-        if key:
-            return OpenAI(api_key=key)
-    except Exception:
-        pass
-    return None
+    global _client
+    key = (OPENAI_API_KEY or os.environ.get("OPENAI_API_KEY") or "").strip()
+    if not key:
+        return None
+    if _client is None or _client[0] != key:
+        try:
+            from openai import AsyncOpenAI
+            _client = (key, AsyncOpenAI(api_key=key))
+        except Exception:
+            return None
+    return _client[1]
+
 
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client[1], None
+        await client.close()
 
-def _generate_argument_gpt(role: str, phase: str, debate_so_far: str, opposing_arguments: list[str]) -> str:
+
+async def _generate_argument_gpt(role: str, phase: str, debate_so_far: str, opposing_arguments: list[str]) -> str:
     client = _get_openai_client()
     if not client:
         return _canned_argument(role)
     side = "majority" if role == "majority" else "minority"
     opposing_block = "\n".join(opposing_arguments[-6:]) if opposing_arguments else "(No arguments from the other side yet.)"
+    start = time.perf_counter()
     try:
-        r = client.chat.completions.create(
+        r = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -68,10 +86,14 @@ def _generate_argument_gpt(role: str, phase: str, debate_so_far: str, opposing_a
             ],
             max_tokens=120,
         )
+        FILLER_LLM_SECONDS.observe(time.perf_counter() - start, "argument")
         if r.choices and r.choices[0].message.content:
+            FILLER_LLM_CALLS.inc("argument", "ok")
             return r.choices[0].message.content.strip()[:500]
+        FILLER_LLM_CALLS.inc("argument", "empty")
     except Exception:
-        pass
+        FILLER_LLM_SECONDS.observe(time.perf_counter() - start, "argument")
+        FILLER_LLM_CALLS.inc("argument", "error")
     return _canned_argument(role)
 
 
@@ -81,13 +103,14 @@ def _canned_argument(role: str) -> str:
     return random.choice(ARGUMENT_TEMPLATES_MINORITY)
 
 
-def _generate_decision_gpt(majority_names: list[str], minority_names: list[str], recent_arguments: list[str]) -> str:
+async def _generate_decision_gpt(majority_names: list[str], minority_names: list[str], recent_arguments: list[str]) -> str:
     client = _get_openai_client()
     if not client:
         return random.choice(DECISION_OPTIONS)
     args_text = "\n".join(recent_arguments[-8:]) if recent_arguments else "No arguments."
+    start = time.perf_counter()
     try:
-        r = client.chat.completions.create(
+        r = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -109,68 +132,67 @@ def _generate_decision_gpt(majority_names: list[str], minority_names: list[str],
             ],
             max_tokens=20,
         )
+        FILLER_LLM_SECONDS.observe(time.perf_counter() - start, "decision")
         if r.choices and r.choices[0].message.content:
             raw = r.choices[0].message.content.strip().lower()
             if "save_majority" in raw or "majority" in raw:
+                FILLER_LLM_CALLS.inc("decision", "ok")
                 return "save_majority"
             if "save_minority" in raw or "minority" in raw:
+                FILLER_LLM_CALLS.inc("decision", "ok")
                 return "save_minority"
+        FILLER_LLM_CALLS.inc("decision", "empty")
     except Exception:
-        pass
+        FILLER_LLM_SECONDS.observe(time.perf_counter() - start, "decision")
+        FILLER_LLM_CALLS.inc("decision", "error")
     return random.choice(DECISION_OPTIONS)
 
 
+@traced("filler.get_pending_filler_action")
 def get_pending_filler_action(game_id: str) -> Optional[tuple[str, str, str, dict]]:
-    """Returns (agent_id, action_type, round_id, context) or None."""
+    """Returns (agent_id, action_type, round_id, context) or None. Checks every table in order.
+    Fillers already waiting on an LLM call are skipped, so concurrent ticks act for different fillers."""
     g = store.get_game(game_id)
     if not g or g.status.value == "game_completed":
         return None
-    state = build_game_state(game_id)
-    if not state or not state.current_round_id:
-        return None
-    round_id = state.current_round_id
-    phase = state.current_phase
-    operator_id = state.operator.id if state.operator else None
-    majority = state.majority_agents or []
-    minority = state.minority_agents or []
-    phase_activity = set(state.phase_activity or [])
-
-    # Decision: operator is filler and phase is awaiting_decision
-    if phase == "awaiting_decision" and operator_id and store.is_filler(operator_id):
-        return (
-            operator_id,
-            "decision",
-            round_id,
-            {
-                "majority_names": [a.display_name for a in majority],
-                "minority_names": [a.display_name for a in minority],
-                "recent_arguments": _recent_argument_texts(game_id, round_id),
-            },
-        )
+    for table in build_tables(game_id):
+        round_id = table.round_id
+        phase = table.phase
+        operator_id = table.operator.id if table.operator else None
+        majority = table.majority_agents or []
+        minority = table.minority_agents or []
 
-    # Argument: filler in majority/minority who hasn't argued this phase
-    if phase in ("phase_1", "phase_2", "phase_3"):
-        for a in majority + minority:
-            if a.id in phase_activity or not store.is_filler(a.id):
-                continue
-            debate_so_far, opposing_args = _debate_context_with_sides(round_id, a.role)
+        # Decision: operator is filler and phase is awaiting_decision
+        if phase == "awaiting_decision" and operator_id and store.is_filler(operator_id) and operator_id not in _in_flight:
             return (
-                a.id,
-                "argument",
+                operator_id,
+                "decision",
                 round_id,
-                {"role": a.role, "phase": phase, "debate_so_far": debate_so_far, "opposing_arguments": opposing_args},
+                {
+                    "majority_names": [a.display_name for a in majority],
+                    "minority_names": [a.display_name for a in minority],
+                    "recent_arguments": _recent_argument_texts(game_id, round_id),
+                },
             )
+
+        # Argument: filler in majority/minority who hasn't argued this phase
+        if phase in ("phase_1", "phase_2", "phase_3"):
+            for a in majority + minority:
+                if a.argued_this_phase or not store.is_filler(a.id) or a.id in _in_flight:
+                    continue
+                debate_so_far, opposing_args = _debate_context_with_sides(round_id, a.role)
+                return (
+                    a.id,
+                    "argument",
+                    round_id,
+                    {"role": a.role, "phase": phase, "debate_so_far": debate_so_far, "opposing_arguments": opposing_args},
+                )
     return None
 
 
 def _recent_argument_texts(game_id: str, round_id: str) -> list[str]:
-    args = store.get_arguments_for_round(round_id)
-    out = []
-    for a in args:
-        ag = store.get_agent(a.agent_id)
-        name = ag.display_name if ag else a.agent_id[:8]
-        out.append(f"{name}: {a.text}")
-    return out
+    roster = store.roster(game_id)
+    return [f"{roster.name(a.agent_id)}: {a.text}" for a in store.get_arguments_for_round(round_id)]
 
 
 def _debate_context_with_sides(round_id: str, my_role: str) -> tuple[str, list[str]]:
@@ -181,11 +203,11 @@ def _debate_context_with_sides(round_id: str, my_role: str) -> tuple[str, list[s
     majority_ids = set(r.majority_agent_ids or [])
     minority_ids = set(r.minority_agent_ids or [])
     args = store.get_arguments_for_round(round_id)
+    roster = store.roster(r.game_id)
     all_lines = []
     opposing = []
     for a in args:
-        ag = store.get_agent(a.agent_id)
-        name = ag.display_name if ag else a.agent_id[:8]
+        name = roster.name(a.agent_id)
         if a.agent_id in majority_ids:
             line = f"[Majority] {name}: {a.text}"
             if my_role != "majority":
@@ -199,44 +221,55 @@ def _debate_context_with_sides(round_id: str, my_role: str) -> tuple[str, list[s
     return full, opposing
 
 
-def execute_one_filler_action(game_id: str) -> Optional[str]:
-    """Execute one pending filler action. Returns description string or None."""
+@traced("filler.execute_one_filler_action")
+async def execute_one_filler_action(game_id: str) -> Optional[str]:
+    """Execute one pending filler action. Returns description string or None.
+
+    The LLM call is awaited, so the event loop serves other requests meanwhile. The game may
+    move on during the call; the submission is then rejected like any late one."""
     pending = get_pending_filler_action(game_id)
     if not pending:
         return None
     agent_id, action_type, round_id, context = pending
+    _in_flight.add(agent_id)
     try:
         if action_type == "argument":
-            text = _generate_argument_gpt(
-                context.get("role", "majority"),
-                context.get("phase", "phase_1"),
-                context.get("debate_so_far", "No prior arguments yet."),
-                context.get("opposing_arguments", []),
-            )
+            with span("filler.llm_argument", game_id, agent_id=agent_id):
+                text = await _generate_argument_gpt(
+                    context.get("role", "majority"),
+                    context.get("phase", "phase_1"),
+                    context.get("debate_so_far", "No prior arguments yet."),
+                    context.get("opposing_arguments", []),
+                )
             submit_argument(game_id, round_id, agent_id, text)
             return f"Filler argued: {text[:50]}..."
         if action_type == "decision":
-            dec = _generate_decision_gpt(
-                context.get("majority_names", []),
-                context.get("minority_names", []),
-                context.get("recent_arguments", []),
-            )
+            with span("filler.llm_decision", game_id, agent_id=agent_id):
+                dec = await _generate_decision_gpt(
+                    context.get("majority_names", []),
+                    context.get("minority_names", []),
+                    context.get("recent_arguments", []),
+                )
             submit_decision(game_id, round_id, agent_id, dec)
             return f"Filler decided: {dec}"
     except Exception as e:
         return f"Filler action failed: {e}"
+    finally:
+        _in_flight.discard(agent_id)
     return None
 
 
 def add_filler_agents(game_id: str, count: int) -> list[dict]:
     """Register `count` GPT filler agents. Returns list of {agent_id, display_name}."""
-    from app.services.game_service import register_agent
-    names = ["GPT-Max", "GPT-Luna", "GPT-Alex", "GPT-Sage", "GPT-River"][:count]
+    from app.services.game_service import mark_filler, register_agent
+    base = ["GPT-Max", "GPT-Luna", "GPT-Alex", "GPT-Sage", "GPT-River"]
+    # Tables larger than the name pool reuse names with a suffix (GPT-Max-2, ...)
+    names = [base[i % len(base)] + (f"-{i // len(base) + 1}" if i >= len(base) else "") for i in range(count)]
     added = []
     for name in names:
         try:
             _, a, _ = register_agent(game_id, name)
-            store.mark_filler(a.id)
+            mark_filler(game_id, a.id)
             added.append({"agent_id": a.id, "display_name": name})
         except ValueError:
             break
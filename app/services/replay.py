@@ -0,0 +1,264 @@
+"""Event-sourced replay: rebuild a game's store state from its event log alone.
+
+Every state transition in game_service logs an event that carries everything needed to
+redo it (argument text, seat assignments, the rotation order, the decision). apply_event
+projects one event onto a Store, repeating game_service's bookkeeping (status sync,
+scoring, role coverage) without its side effects: no validation, no deadlines, no new ids.
+Replaying a game's events into an empty Store gives the same games, agents, participations,
+rounds and arguments as the live store. Two things differ: timestamps are the events' own,
+and agent tokens are never logged.
+
+Replays start from the nearest snapshot: a copy of the projected store taken every
+SNAPSHOT_EVERY events. The log is append-only, so a snapshot never goes stale. Snapshots
+are kept for the most recently replayed games only.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.models.domain import (
+    Agent,
+    Argument,
+    Decision,
+    EventLog,
+    EventType,
+    Game,
+    GameStatus,
+    Participation,
+    Phase,
+    Round,
+    RoundStatus,
+)
+from app.schemas.api import GameStateResponse
+from app.storage.store import Store, store
+from app.services.game_service import _PHASE_ORDER, _game_status_from_phase, apply_round
+from app.services.scheduler import rotation_order
+from app.services.state_builder import build_game_state, freeze_round_summary
+
+SNAPSHOT_EVERY = 100
+SNAPSHOT_GAMES = 64  # games whose snapshots are kept (least recently replayed dropped first)
+
+_snapshots: "OrderedDict[str, dict[int, Store]]" = OrderedDict()  # game_id -> {events applied: projected store}
+_lock = threading.Lock()
+
+
+def _game_created(st: Store, e: EventLog) -> None:
+    payload = dict(e.payload_json)
+    min_players = payload.pop("min_players", 1)
+    g = Game(
+        id=e.game_id,
+        status=GameStatus.waiting_for_agents,
+        created_at=e.created_at,
+        current_round_number=0,
+        current_phase=None,
+        min_players=min_players,
+        config=payload,
+    )
+    st.add_game(g)
+
+
+def _agents_joined(st: Store, e: EventLog, entries: list[dict]) -> None:
+    g = st.get_game(e.game_id)
+    for entry in entries:
+        a = Agent(id=entry["agent_id"], display_name=entry["display_name"], created_at=e.created_at)
+        st.add_agent(a)
+        p = Participation.new(game_id=e.game_id, agent_id=a.id)
+        p.joined_at = e.created_at
+        st.add_participation(p)
+    if e.game_id in st.rotations:
+        st.rotations[e.game_id].extend(entry["agent_id"] for entry in entries)
+    elif st.count_participations(e.game_id) >= g.min_players:
+        g.status = GameStatus.ready_to_start
+        st.update_game(g)
+
+
+def _agent_registered(st: Store, e: EventLog) -> None:
+    _agents_joined(st, e, [e.payload_json])
+
+
+def _agents_registered(st: Store, e: EventLog) -> None:
+    _agents_joined(st, e, e.payload_json["agents"])
+
+
+def _filler_marked(st: Store, e: EventLog) -> None:
+    st.mark_filler(e.payload_json["agent_id"])
+
+
+def _game_started(st: Store, e: EventLog) -> None:
+    g = st.get_game(e.game_id)
+    g.status = GameStatus.round_phase_1
+    g.current_round_number = 1
+    st.update_game(g)
+    rotation = e.payload_json.get("rotation")
+    if rotation is None:
+        # Logs written before the rotation was recorded: recompute it from the seed
+        rotation = rotation_order([p.agent_id for p in st.get_participations_for_game(e.game_id)], g.config.get("rotation_seed"))
+    st.rotations[e.game_id] = list(rotation)
+
+
+def _round_started(st: Store, e: EventLog) -> None:
+    payload = e.payload_json
+    r = Round(
+        id=payload["round_id"],
+        game_id=e.game_id,
+        round_number=payload["round_number"],
+        status=RoundStatus.active,
+        phase=Phase.phase_1,
+        operator_agent_id=payload["operator_agent_id"],
+        majority_agent_ids=list(payload["majority_agent_ids"]),
+        minority_agent_ids=list(payload["minority_agent_ids"]),
+        table=payload.get("table", 0),
+    )
+    st.add_round(r)
+    g = st.get_game(e.game_id)
+    g.current_round_number = r.round_number
+    g.current_phase = Phase.phase_1
+    g.status = GameStatus.round_phase_1
+    st.update_game(g)
+
+
+def _argument_submitted(st: Store, e: EventLog) -> None:
+    payload = e.payload_json
+    st.add_argument(Argument(
+        id=payload["argument_id"],
+        game_id=e.game_id,
+        round_id=payload["round_id"],
+        phase=Phase(payload["phase"]),
+        agent_id=payload["agent_id"],
+        text=payload.get("text", ""),
+        created_at=e.created_at,
+    ))
+
+
+def _sync_game_phase(st: Store, g: Game) -> None:
+    """Same rule as game_service: the game follows its slowest unresolved table."""
+    active = [r for r in st.get_current_rounds(g.id) if r.status == RoundStatus.active]
+    if not active:
+        return
+    phase = min((r.phase for r in active), key=_PHASE_ORDER.index)
+    g.current_phase = phase
+    g.status = _game_status_from_phase(phase)
+    st.update_game(g)
+
+
+def _phase_advanced(st: Store, e: EventLog) -> None:
+    r = st.get_round(e.payload_json["round_id"])
+    r.phase = Phase(e.payload_json["phase"])
+    st.update_round(r)
+    _sync_game_phase(st, st.get_game(e.game_id))
+
+
+def _decision_submitted(st: Store, e: EventLog) -> None:
+    r = st.get_round(e.payload_json["round_id"])
+    r.decision = Decision(e.payload_json["decision"])
+    st.update_round(r)
+
+
+def _round_resolved(st: Store, e: EventLog) -> None:
+    payload = e.payload_json
+    r = st.get_round(payload["round_id"])
+    g = st.get_game(e.game_id)
+    if payload.get("decision"):
+        r.decision = Decision(payload["decision"])
+    elif r.decision is None:
+        # Older forced resolutions did not log the decision; they always saved the majority
+        r.decision = Decision.save_majority
+    r.phase = Phase.resolved
+    r.status = RoundStatus.resolved
+    r.resolved_at = e.created_at
+    st.update_round(r)
+    seated = [r.operator_agent_id] + r.majority_agent_ids + r.minority_agent_ids
+    parts = {aid: st.get_participation(g.id, aid) for aid in seated}
+    apply_round(parts, r.operator_agent_id, r.majority_agent_ids, r.minority_agent_ids, r.decision)
+    for p in parts.values():
+        if p:
+            st.update_participation(p)
+    freeze_round_summary(r, st)
+    if any(t.status == RoundStatus.active for t in st.get_current_rounds(g.id)):
+        _sync_game_phase(st, g)
+        return
+    g.status = GameStatus.round_resolved
+    g.current_phase = Phase.resolved
+    st.update_game(g)
+
+
+def _game_completed(st: Store, e: EventLog) -> None:
+    g = st.get_game(e.game_id)
+    g.status = GameStatus.game_completed
+    st.update_game(g)
+
+
+_HANDLERS: dict[EventType, Callable[[Store, EventLog], None]] = {
+    EventType.game_created: _game_created,
+    EventType.agent_registered: _agent_registered,
+    EventType.agents_registered: _agents_registered,
+    EventType.filler_marked: _filler_marked,
+    EventType.game_started: _game_started,
+    EventType.round_started: _round_started,
+    EventType.argument_submitted: _argument_submitted,
+    EventType.phase_advanced: _phase_advanced,
+    EventType.decision_submitted: _decision_submitted,
+    EventType.round_resolved: _round_resolved,
+    EventType.game_completed: _game_completed,
+}
+
+
+def apply_event(st: Store, e: EventLog) -> None:
+    """Project one event onto st and append it to st's event log."""
+    _HANDLERS[e.event_type](st, e)
+    st.add_event(e)
+
+
+def _snapshots_for(game_id: str) -> dict[int, Store]:
+    with _lock:
+        snaps = _snapshots.setdefault(game_id, {})
+        _snapshots.move_to_end(game_id)
+        while len(_snapshots) > SNAPSHOT_GAMES:
+            _snapshots.popitem(last=False)
+        return snaps
+
+
+def replay(game_id: str, upto: Optional[int] = None, source: Optional[Store] = None) -> Store:
+    """A new Store holding the game as it was after its first `upto` events (all of them by default)."""
+    events = (source or store).events_by_game.get(game_id)
+    if not events:
+        raise ValueError("Game not found")
+    n = len(events) if upto is None else max(1, min(upto, len(events)))
+    snaps = _snapshots_for(game_id)
+    base = max((k for k in snaps if k <= n), default=0)
+    st = copy.deepcopy(snaps[base]) if base else Store()
+    for i in range(base, n):
+        apply_event(st, events[i])
+        if (i + 1) % SNAPSHOT_EVERY == 0 and (i + 1) not in snaps:
+            snaps[i + 1] = copy.deepcopy(st)
+    return st
+
+
+def events_through_round(game_id: str, round_number: int, source: Optional[Store] = None) -> int:
+    """How many events the game had when round round_number ended: the count before the next
+    round's first round_started event, or every event if that round is still the latest."""
+    st = source or store
+    g = st.get_game(game_id)
+    if not g:
+        raise ValueError("Game not found")
+    if round_number < 1 or round_number > g.current_round_number:
+        raise ValueError(f"Round must be between 1 and {g.current_round_number}")
+    events = st.events_by_game.get(game_id, [])
+    for i, e in enumerate(events):
+        if e.event_type == EventType.round_started and e.payload_json.get("round_number") == round_number + 1:
+            return i
+    return len(events)
+
+
+def build_replay_state(
+    game_id: str,
+    round_number: Optional[int] = None,
+    event_count: Optional[int] = None,
+) -> GameStateResponse:
+    """/state as it was at the end of round round_number, or after event_count events (latest by default).
+    version is the number of events replayed."""
+    if round_number is not None:
+        event_count = events_through_round(game_id, round_number)
+    st = replay(game_id, upto=event_count)
+    return build_game_state(game_id, version=len(st.events), source=st)
@@ -0,0 +1,81 @@
+"""Role-rotation scheduler: who is operator and who is minority each round.
+
+A game ends once every agent has been operator, majority and minority. Each round has
+one operator and one minority, so N agents need at least N rounds. The rotation walks a
+fixed agent order: the next agent still owed the operator seat operates, and the next
+agent after it in cyclic order that is still owed the minority seat takes the minority.
+Fresh agents therefore pair up as (a1, a2), (a2, a3), ..., (aN, a1): exactly N rounds,
+everyone else on the majority track. Assignments are derived from current coverage, so
+agents appended to the order mid-game (late joiners) slot into the remaining cycle.
+
+Multi-table games seat several tables per cycle: the next T agents owed the operator seat
+operate, and each table's minority is found the same way, skipping this cycle's operators.
+Completion then takes about N / T cycles, which stays flat as the roster grows with T.
+"""
+import random
+from typing import Optional
+
+from app.models.domain import Participation
+
+
+def rotation_order(agent_ids: list[str], seed: Optional[int] = None) -> list[str]:
+    """Order in which agents take the operator seat. Join order, or a seeded shuffle of it."""
+    order = list(agent_ids)
+    if seed is not None:
+        random.Random(seed).shuffle(order)
+    return order
+
+
+def assign_tables(
+    order: list[str],
+    parts: dict[str, Participation],
+    tables: int = 1,
+    minority_size: int = 1,
+) -> list[tuple[str, list[str], list[str]]]:
+    """(operator_id, majority_ids, minority_ids) for each table of the next cycle.
+
+    Every agent in order is seated: operators and minorities as above, everyone else dealt
+    round-robin onto the majority tracks. With one table that is the whole remaining roster.
+    """
+    n = len(order)
+    taken: set[int] = set()
+    op_idxs: list[int] = []
+    for pred in (
+        lambda p: not p.has_been_operator,
+        # Everyone has operated: seat agents who no longer need a track role
+        lambda p: p.has_been_majority and p.has_been_minority,
+        lambda p: True,
+    ):
+        for k in range(n):
+            if len(op_idxs) == tables:
+                break
+            p = parts.get(order[k])
+            if k not in taken and p and pred(p):
+                op_idxs.append(k)
+                taken.add(k)
+    seats = []
+    for op_idx in op_idxs:
+        minority = []
+        for _ in range(minority_size):
+            cyclic = [(op_idx + k) % n for k in range(1, n) if (op_idx + k) % n not in taken]
+            i = _first(order, parts, lambda p: not p.has_been_minority, cyclic)
+            if i is None:
+                # Nobody needs the minority seat; keep agents still owed a majority seat on majority
+                i = _first(order, parts, lambda p: p.has_been_majority, cyclic)
+            if i is None:
+                i = cyclic[0]
+            minority.append(order[i])
+            taken.add(i)
+        seats.append((order[op_idx], [], minority))
+    rest = [aid for k, aid in enumerate(order) if k not in taken]
+    for k, aid in enumerate(rest):
+        seats[k % len(seats)][1].append(aid)
+    return seats
+
+
+def _first(order, parts, pred, indices) -> Optional[int]:
+    for i in indices:
+        p = parts.get(order[i])
+        if p and pred(p):
+            return i
+    return None
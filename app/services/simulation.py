@@ -0,0 +1,310 @@
+"""Headless simulation: whole games played in memory, for operator-policy experiments.
+
+No Store, no events, no deadlines, no HTTP. A simulated game keeps only its participations
+in a dict and runs the live rules directly: seating comes from scheduler.assign_tables over
+the seeded rotation_order, each table goes through the three debate phases, and scoring and
+role coverage go through game_service.apply_round. The game ends when every participation is
+complete, as in _resolve_round.
+
+Policies are plain functions, looked up by name so they can be sent to worker processes:
+
+  argument policy  (rng, role, phase) -> text, or None to stay silent that phase
+  decision policy  (rng, TableView) -> Decision
+
+Runs split the seeds into chunks played in a process pool. Each chunk folds its games into
+one SimStats; the stats are merged in the parent. A seed always plays the same game, so
+results do not depend on how many workers there are.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional, Union
+
+from app.models.domain import Decision, Participation
+from app.services.game_service import ROUND_MAJORITY, ROUND_MINORITY, ROUND_OPERATOR, apply_round
+from app.services.gpt_filler import ARGUMENT_TEMPLATES_MAJORITY, ARGUMENT_TEMPLATES_MINORITY
+from app.services.scheduler import assign_tables, rotation_order
+
+PHASES = (1, 2, 3)
+_JOINED = datetime(2000, 1, 1)
+
+
+class TableView(NamedTuple):
+    """What a decision policy sees of one table: the seats and the debate, in speaking order."""
+
+    operator_id: str
+    majority_ids: list[str]
+    minority_ids: list[str]
+    arguments: list[tuple[int, str, str]]  # (phase, role, text)
+
+
+ArgumentPolicy = Callable[[random.Random, str, int], Optional[str]]
+DecisionPolicy = Callable[[random.Random, TableView], Decision]
+
+
+# --- Argument policies -------------------------------------------------------------------
+
+
+def canned(rng: random.Random, role: str, phase: int) -> Optional[str]:
+    """What a filler without an API key says: a canned plea for its own side, every phase."""
+    return rng.choice(ARGUMENT_TEMPLATES_MAJORITY if role == "majority" else ARGUMENT_TEMPLATES_MINORITY)
+
+
+def sparse(rng: random.Random, role: str, phase: int) -> Optional[str]:
+    """Canned pleas, but each phase only half the time."""
+    return canned(rng, role, phase) if rng.random() < 0.5 else None
+
+
+def silent(rng: random.Random, role: str, phase: int) -> Optional[str]:
+    return None
+
+
+# --- Decision policies -------------------------------------------------------------------
+
+
+def utilitarian(rng: random.Random, table: TableView) -> Decision:
+    return Decision.save_majority
+
+
+def coin(rng: random.Random, table: TableView) -> Decision:
+    """A filler operator without an API key: a fair coin."""
+    return Decision.save_majority if rng.random() < 0.5 else Decision.save_minority
+
+
+def persuaded(rng: random.Random, table: TableView) -> Decision:
+    """Save the minority with probability equal to its share of the arguments made;
+    with no arguments at all, save the majority."""
+    if not table.arguments:
+        return Decision.save_majority
+    share = sum(1 for _, role, _ in table.arguments if role == "minority") / len(table.arguments)
+    return Decision.save_minority if rng.random() < share else Decision.save_majority
+
+
+def last_word(rng: random.Random, table: TableView) -> Decision:
+    """Side with whoever spoke last; with no arguments, save the majority."""
+    if table.arguments and table.arguments[-1][1] == "minority":
+        return Decision.save_minority
+    return Decision.save_majority
+
+
+ARGUMENT_POLICIES: dict[str, ArgumentPolicy] = {"canned": canned, "sparse": sparse, "silent": silent}
+DECISION_POLICIES: dict[str, DecisionPolicy] = {
+    "utilitarian": utilitarian,
+    "coin": coin,
+    "persuaded": persuaded,
+    "last_word": last_word,
+}
+
+
+def _policy(registry: dict, policy: Union[str, Callable]) -> Callable:
+    if callable(policy):
+        return policy
+    if policy not in registry:
+        raise ValueError(f"Unknown policy {policy!r}; choose from {', '.join(registry)}")
+    return registry[policy]
+
+
+# --- Engine ------------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """Game shape and policies. Policies are registry names, or module-level functions
+    (anything else cannot be sent to a worker process)."""
+
+    agents: int = 7
+    multi_table: bool = False
+    majority_size: int = ROUND_MAJORITY
+    minority_size: int = ROUND_MINORITY
+    majority_policy: Union[str, ArgumentPolicy] = "canned"
+    minority_policy: Union[str, ArgumentPolicy] = "canned"
+    decision_policy: Union[str, DecisionPolicy] = "coin"
+
+    def __post_init__(self) -> None:
+        if self.minority_size < 1 or self.majority_size <= self.minority_size:
+            raise ValueError("Track sizes must satisfy majority_size > minority_size >= 1")
+        if self.agents < self.seats_per_table:
+            raise ValueError(f"Need at least {self.seats_per_table} agents")
+        _policy(ARGUMENT_POLICIES, self.majority_policy)
+        _policy(ARGUMENT_POLICIES, self.minority_policy)
+        _policy(DECISION_POLICIES, self.decision_policy)
+
+    @property
+    def seats_per_table(self) -> int:
+        return ROUND_OPERATOR + self.majority_size + self.minority_size
+
+    @property
+    def tables(self) -> int:
+        return self.agents // self.seats_per_table if self.multi_table else 1
+
+
+@dataclass
+class SimStats:
+    games: int = 0
+    cycles: int = 0  # game rounds; each seats every table once
+    rounds: int = 0  # resolved tables
+    arguments: int = 0
+    minority_saves: int = 0
+    min_cycles: int = 0
+    max_cycles: int = 0
+    # (majority arguments, minority arguments) at a table -> [tables, minority saves]
+    by_mix: dict[tuple[int, int], list[int]] = field(default_factory=dict)
+    cpu_seconds: float = 0.0
+
+    def merge(self, other: "SimStats") -> None:
+        self.min_cycles = min(self.min_cycles, other.min_cycles) if self.games else other.min_cycles
+        self.max_cycles = max(self.max_cycles, other.max_cycles)
+        self.games += other.games
+        self.cycles += other.cycles
+        self.rounds += other.rounds
+        self.arguments += other.arguments
+        self.minority_saves += other.minority_saves
+        self.cpu_seconds += other.cpu_seconds
+        for mix, (n, saves) in other.by_mix.items():
+            cell = self.by_mix.setdefault(mix, [0, 0])
+            cell[0] += n
+            cell[1] += saves
+
+    def to_dict(self) -> dict:
+        return {
+            "games": self.games,
+            "cycles": self.cycles,
+            "rounds": self.rounds,
+            "arguments": self.arguments,
+            "save_minority_rate": round(self.minority_saves / self.rounds, 4) if self.rounds else None,
+            "cycles_per_game": {
+                "mean": round(self.cycles / self.games, 3) if self.games else None,
+                "min": self.min_cycles,
+                "max": self.max_cycles,
+            },
+            "by_mix": [
+                {
+                    "majority_arguments": mix[0],
+                    "minority_arguments": mix[1],
+                    "tables": n,
+                    "save_minority_rate": round(saves / n, 4),
+                }
+                for mix, (n, saves) in sorted(self.by_mix.items())
+            ],
+            "cpu_seconds": round(self.cpu_seconds, 3),
+        }
+
+
+def play_game(seed: int, config: SimConfig, stats: SimStats) -> None:
+    """Play one game to completion and fold it into stats. The seed drives both the
+    rotation order and the policies' randomness."""
+    rng = random.Random(seed)
+    ids = [f"a{k}" for k in range(config.agents)]
+    order = rotation_order(ids, seed)
+    parts = {aid: Participation("sim", aid, 0, False, False, False, _JOINED) for aid in ids}
+    argue_majority = _policy(ARGUMENT_POLICIES, config.majority_policy)
+    argue_minority = _policy(ARGUMENT_POLICIES, config.minority_policy)
+    decide = _policy(DECISION_POLICIES, config.decision_policy)
+    tables = config.tables
+    cycles = 0
+    while True:
+        cycles += 1
+        for operator_id, majority_ids, minority_ids in assign_tables(order, parts, tables, config.minority_size):
+            speakers = [(aid, "majority", argue_majority) for aid in majority_ids]
+            speakers += [(aid, "minority", argue_minority) for aid in minority_ids]
+            arguments = []
+            n_majority = 0
+            for phase in PHASES:
+                # Track agents argue in no fixed order within a phase
+                rng.shuffle(speakers)
+                for _, role, argue in speakers:
+                    text = argue(rng, role, phase)
+                    if text is not None:
+                        arguments.append((phase, role, text))
+                        n_majority += role == "majority"
+            dec = decide(rng, TableView(operator_id, majority_ids, minority_ids, arguments))
+            apply_round(parts, operator_id, majority_ids, minority_ids, dec)
+            saved_minority = dec == Decision.save_minority
+            mix = (n_majority, len(arguments) - n_majority)
+            cell = stats.by_mix.get(mix)
+            if cell is None:
+                cell = stats.by_mix[mix] = [0, 0]
+            cell[0] += 1
+            cell[1] += saved_minority
+            stats.rounds += 1
+            stats.arguments += len(arguments)
+            stats.minority_saves += saved_minority
+        if all(p.is_complete for p in parts.values()):
+            break
+        if cycles > 2 * config.agents:
+            raise RuntimeError(f"Seed {seed}: rotation did not complete in {cycles} rounds")
+    stats.min_cycles = min(stats.min_cycles, cycles) if stats.games else cycles
+    stats.max_cycles = max(stats.max_cycles, cycles)
+    stats.games += 1
+    stats.cycles += cycles
+
+
+def play_games(seeds: list[int], config: SimConfig) -> SimStats:
+    """One batch of games, in this process."""
+    stats = SimStats()
+    cpu0 = time.process_time()
+    for seed in seeds:
+        play_game(seed, config, stats)
+    stats.cpu_seconds = time.process_time() - cpu0
+    return stats
+
+
+def _play_chunk(args: tuple[list[int], SimConfig]) -> SimStats:
+    return play_games(*args)
+
+
+@dataclass
+class SimReport:
+    config: SimConfig
+    stats: SimStats
+    workers: int
+    seconds: float
+
+    def to_dict(self) -> dict:
+        c = self.config
+        return {
+            "config": {
+                "agents": c.agents,
+                "multi_table": c.multi_table,
+                "tables": c.tables,
+                "majority_size": c.majority_size,
+                "minority_size": c.minority_size,
+                "majority_policy": getattr(c.majority_policy, "__name__", c.majority_policy),
+                "minority_policy": getattr(c.minority_policy, "__name__", c.minority_policy),
+                "decision_policy": getattr(c.decision_policy, "__name__", c.decision_policy),
+            },
+            "workers": self.workers,
+            "seconds": round(self.seconds, 3),
+            "rounds_per_sec": round(self.stats.rounds / self.seconds, 1) if self.seconds else None,
+            "games_per_sec": round(self.stats.games / self.seconds, 1) if self.seconds else None,
+            **self.stats.to_dict(),
+        }
+
+
+def simulate(
+    games: int,
+    config: SimConfig = SimConfig(),
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> SimReport:
+    """Play seeds seed .. seed + games - 1. workers=1 plays in this process; otherwise the
+    seeds are split into chunks across a process pool (os.cpu_count() workers by default)."""
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(seed, seed + games))
+    start = time.perf_counter()
+    if workers == 1 or games < 2:
+        stats = play_games(seeds, config)
+        workers = 1
+    else:
+        # A few chunks per worker keeps the pool busy when chunks take uneven time
+        size = chunk_size or max(1, -(-games // (workers * 4)))
+        chunks = [(seeds[i : i + size], config) for i in range(0, games, size)]
+        stats = SimStats()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_play_chunk, chunks):
+                stats.merge(part)
+    return SimReport(config=config, stats=stats, workers=workers, seconds=time.perf_counter() - start)
@@ -1,137 +1,141 @@
 """Build GET /state response with full visual payload for UI and agents."""
-from datetime import datetime
+import json
 from typing import Optional
 
-from app.models.domain import Phase, RoundStatus
-from app.storage.store import store
+from app.models.domain import Phase, Round
+from app.storage.store import Store, store
+from app.tracing import traced
 from app.schemas.api import (
     GameStateResponse,
-    AgentSummary,
     BoardState,
-    CoverageProgress,
+    BatchStateResponse,
+    FeedItem,
+    ScoreboardResponse,
+    TableState,
 )
 
 
-def get_phase_activity(game_id: str, round_id: str, phase: Phase) -> list[str]:
-    args = store.get_arguments_in_round_phase(round_id, phase)
+def get_phase_activity(game_id: str, round_id: str, phase: Phase, source: Optional[Store] = None) -> list[str]:
+    args = (source or store).get_arguments_in_round_phase(round_id, phase)
     return [a.agent_id for a in args]
 
 
-def build_game_state(game_id: str, version: int = 0) -> Optional[GameStateResponse]:
-    g = store.get_game(game_id)
+@traced("state.build_game_state")
+def build_game_state(game_id: str, version: Optional[int] = None, source: Optional[Store] = None) -> Optional[GameStateResponse]:
+    """Full state for one game. version defaults to the store's current version for the game.
+    source builds from another store, such as one rebuilt by replay, instead of the live one."""
+    st = source or store
+    g = st.get_game(game_id)
     if not g:
         return None
-    parts = store.get_participations_for_game(game_id)
+    if version is None:
+        version = st.get_version(game_id)
+    parts = st.get_participations_for_game(game_id)
     scores = {p.agent_id: p.score for p in parts}
-    coverage = []
-    for p in parts:
-        agent = store.get_agent(p.agent_id)
-        name = agent.display_name if agent else p.agent_id[:8]
-        coverage.append(
-            CoverageProgress(
-                agent_id=p.agent_id,
-                display_name=name,
-                has_been_operator=p.has_been_operator,
-                has_been_majority=p.has_been_majority,
-                has_been_minority=p.has_been_minority,
-                complete=p.has_been_operator and p.has_been_majority and p.has_been_minority,
-            )
-        )
-    operator = None
-    majority_agents = []
-    minority_agents = []
-    current_round_id = None
-    round_outcome = None
-    phase_activity = []
-    board = BoardState(animation_version=0)
+    roster = st.roster(game_id)
+    coverage = [roster.coverage(p) for p in parts]
     last_event_at = None
-    events = store.get_events_for_game(game_id, limit=1)
+    events = st.get_events_for_game(game_id, limit=1)
     if events:
         last_event_at = events[0].created_at
 
-    r = store.get_current_round(game_id)
-    if r:
-        current_round_id = r.id
-        op_agent = store.get_agent(r.operator_agent_id)
-        operator = AgentSummary(
-            id=r.operator_agent_id,
-            display_name=op_agent.display_name if op_agent else r.operator_agent_id[:8],
-            role="operator",
-            argued_this_phase=False,
-        )
-        for aid in r.majority_agent_ids:
-            ag = store.get_agent(aid)
-            argued = aid in get_phase_activity(game_id, r.id, r.phase) if r.phase in (
-                Phase.phase_1, Phase.phase_2, Phase.phase_3
-            ) else False
-            majority_agents.append(
-                AgentSummary(
-                    id=aid,
-                    display_name=ag.display_name if ag else aid[:8],
-                    role="majority",
-                    argued_this_phase=argued,
-                )
-            )
-        for aid in r.minority_agent_ids:
-            ag = store.get_agent(aid)
-            argued = aid in get_phase_activity(game_id, r.id, r.phase) if r.phase in (
-                Phase.phase_1, Phase.phase_2, Phase.phase_3
-            ) else False
-            minority_agents.append(
-                AgentSummary(
-                    id=aid,
-                    display_name=ag.display_name if ag else aid[:8],
-                    role="minority",
-                    argued_this_phase=argued,
-                )
-            )
-        if r.phase == Phase.awaiting_decision or r.phase == Phase.resolved:
-            phase_activity = get_phase_activity(game_id, r.id, Phase.phase_3)
-        elif r.phase == Phase.phase_3:
-            phase_activity = get_phase_activity(game_id, r.id, Phase.phase_3)
-        elif r.phase == Phase.phase_2:
-            phase_activity = get_phase_activity(game_id, r.id, Phase.phase_2)
-        else:
-            phase_activity = get_phase_activity(game_id, r.id, Phase.phase_1)
-
-        if r.decision:
-            board.selected_branch = r.decision.value
-            survivors = r.majority_agent_ids if r.decision.value == "save_majority" else r.minority_agent_ids
-            lost = r.minority_agent_ids if r.decision.value == "save_majority" else r.majority_agent_ids
-            board.survivors = survivors
-            board.lost = lost
-            board.resolution_state = "resolved"
-            board.animation_version = 1
-            round_outcome = {"survivors": survivors, "lost": lost}
-
-    has_filler_agents = any(store.is_filler(p.agent_id) for p in parts)
+    tables = build_tables(game_id, source=st)
+    top = tables[0] if tables else None
+    has_filler_agents = any(st.is_filler(p.agent_id) for p in parts)
+    multi_table = bool(g.config.get("multi_table"))
 
     return GameStateResponse(
         game_id=g.id,
         status=g.status.value,
         current_round_number=g.current_round_number,
-        current_round_id=current_round_id,
+        current_round_id=top.round_id if top else None,
         current_phase=g.current_phase.value if g.current_phase else None,
+        operator=top.operator if top else None,
+        majority_agents=top.majority_agents if top else [],
+        minority_agents=top.minority_agents if top else [],
+        decision=top.decision if top else None,
+        round_outcome=top.round_outcome if top else None,
+        scores=scores,
+        coverage=coverage,
+        phase_activity=top.phase_activity if top else [],
+        phase_deadline_at=top.phase_deadline_at if top else None,
+        last_event_at=last_event_at,
+        board=top.board if top else BoardState(animation_version=0),
+        version=version,
+        has_filler_agents=has_filler_agents,
+        multi_table=multi_table,
+        tables=tables if multi_table else [],
+    )
+
+
+@traced("state.build_tables")
+def build_tables(game_id: str, source: Optional[Store] = None) -> list[TableState]:
+    """One TableState per table of the current round (a single entry unless multi-table)."""
+    st = source or store
+    return [_build_table(r, st) for r in st.get_current_rounds(game_id)]
+
+
+def _build_table(r: Round, st: Store) -> TableState:
+    roster = st.roster(r.game_id)
+    operator = roster.summary(r.operator_agent_id, "operator")
+    # One lookup per poll instead of one per track agent
+    argued_ids = set(get_phase_activity(r.game_id, r.id, r.phase, st)) if r.phase in (
+        Phase.phase_1, Phase.phase_2, Phase.phase_3
+    ) else set()
+    majority_agents = [roster.summary(aid, "majority", aid in argued_ids) for aid in r.majority_agent_ids]
+    minority_agents = [roster.summary(aid, "minority", aid in argued_ids) for aid in r.minority_agent_ids]
+    if r.phase == Phase.awaiting_decision or r.phase == Phase.resolved:
+        phase_activity = get_phase_activity(r.game_id, r.id, Phase.phase_3, st)
+    else:
+        phase_activity = get_phase_activity(r.game_id, r.id, r.phase, st)
+
+    board = BoardState(animation_version=0)
+    round_outcome = None
+    if r.decision:
+        board.selected_branch = r.decision.value
+        survivors = r.majority_agent_ids if r.decision.value == "save_majority" else r.minority_agent_ids
+        lost = r.minority_agent_ids if r.decision.value == "save_majority" else r.majority_agent_ids
+        board.survivors = survivors
+        board.lost = lost
+        board.resolution_state = "resolved"
+        board.animation_version = 1
+        round_outcome = {"survivors": survivors, "lost": lost}
+
+    return TableState(
+        round_id=r.id,
+        table=r.table,
+        phase=r.phase.value,
         operator=operator,
         majority_agents=majority_agents,
         minority_agents=minority_agents,
-        decision=r.decision.value if r and r.decision else None,
+        decision=r.decision.value if r.decision else None,
         round_outcome=round_outcome,
-        scores=scores,
-        coverage=coverage,
         phase_activity=phase_activity,
-        last_event_at=last_event_at,
         board=board,
-        version=version,
-        has_filler_agents=has_filler_agents,
+        phase_deadline_at=r.phase_deadline_at,
     )
 
 
-def build_feed(game_id: str, limit: int = 50) -> list:
+@traced("state.build_states_batch")
+def build_states_batch(game_ids: list[str], known_versions: dict[str, int]) -> BatchStateResponse:
+    """States for many games in one pass; games still at the caller's known version are skipped."""
+    out = BatchStateResponse()
+    for gid in dict.fromkeys(game_ids):
+        if not store.get_game(gid):
+            out.missing.append(gid)
+            continue
+        current = store.get_version(gid)
+        out.versions[gid] = current
+        if known_versions.get(gid) == current:
+            continue
+        out.states.append(build_game_state(gid, version=current))
+    return out
+
+
+@traced("state.build_feed")
+def build_feed(game_id: str, limit: int = 50) -> list[FeedItem]:
     """Build feed items from arguments + events for spectator."""
-    from app.schemas.api import FeedItem
     items = []
-    args_by_round = {}
     for rid in store.rounds_by_game.get(game_id, []):
         for a in store.get_arguments_for_round(rid):
             items.append((a.created_at, "argument", a))
@@ -140,11 +144,11 @@ def build_feed(game_id: str, limit: int = 50) -> list:
     items.sort(key=lambda x: x[0], reverse=True)
     out = []
     seen = set()
+    roster = store.roster(game_id)
     for ts, typ, obj in items[:limit]:
         if typ == "argument":
             a = obj
             r = store.get_round(a.round_id)
-            ag = store.get_agent(a.agent_id)
             key = ("arg", a.id)
             if key in seen:
                 continue
@@ -156,7 +160,7 @@ def build_feed(game_id: str, limit: int = 50) -> list:
                     round_number=r.round_number if r else None,
                     phase=a.phase.value,
                     agent_id=a.agent_id,
-                    display_name=ag.display_name if ag else a.agent_id[:8],
+                    display_name=roster.name(a.agent_id),
                     text=a.text,
                     created_at=a.created_at,
                 )
@@ -179,47 +183,43 @@ def build_feed(game_id: str, limit: int = 50) -> list:
     return out[:limit]
 
 
-def build_scoreboard(game_id: str) -> Optional[dict]:
+@traced("state.build_scoreboard")
+def build_scoreboard(game_id: str) -> Optional[ScoreboardResponse]:
     g = store.get_game(game_id)
     if not g:
         return None
     parts = store.get_participations_for_game(game_id)
-    scores = []
-    coverage = []
-    for p in parts:
-        agent = store.get_agent(p.agent_id)
-        name = agent.display_name if agent else p.agent_id[:8]
-        scores.append({"agent_id": p.agent_id, "display_name": name, "score": p.score})
-        coverage.append(
-            CoverageProgress(
-                agent_id=p.agent_id,
-                display_name=name,
-                has_been_operator=p.has_been_operator,
-                has_been_majority=p.has_been_majority,
-                has_been_minority=p.has_been_minority,
-                complete=p.has_been_operator and p.has_been_majority and p.has_been_minority,
-            )
-        )
-    return {"game_id": game_id, "scores": scores, "coverage": [c.model_dump() for c in coverage]}
+    roster = store.roster(game_id)
+    scores = [{"agent_id": p.agent_id, "display_name": roster.name(p.agent_id), "score": p.score} for p in parts]
+    coverage = [roster.coverage(p) for p in parts]
+    return ScoreboardResponse(game_id=game_id, scores=scores, coverage=coverage)
 
 
-def build_history(game_id: str) -> list:
-    rounds = store.get_rounds_for_game(game_id)
-    history = []
-    for r in rounds:
-        if r.status != RoundStatus.resolved or not r.decision:
-            continue
-        survivors = r.majority_agent_ids if r.decision.value == "save_majority" else r.minority_agent_ids
-        lost = r.minority_agent_ids if r.decision.value == "save_majority" else r.majority_agent_ids
-        op = store.get_agent(r.operator_agent_id)
-        history.append({
-            "round_id": r.id,
-            "round_number": r.round_number,
-            "operator_agent_id": r.operator_agent_id,
-            "operator_display_name": op.display_name if op else r.operator_agent_id[:8],
-            "decision": r.decision.value,
-            "survivors": survivors,
-            "lost": lost,
-            "resolved_at": r.resolved_at.isoformat() if r.resolved_at else None,
-        })
-    return history
+def freeze_round_summary(r: Round, st: Optional[Store] = None) -> None:
+    """Serialize a just-resolved round's history entry once and keep it in the store.
+    Called at resolution (game_service and replay); GET /history only concatenates these."""
+    st = st or store
+    survivors = r.majority_agent_ids if r.decision.value == "save_majority" else r.minority_agent_ids
+    lost = r.minority_agent_ids if r.decision.value == "save_majority" else r.majority_agent_ids
+    entry = {
+        "round_id": r.id,
+        "round_number": r.round_number,
+        "table": r.table,
+        "operator_agent_id": r.operator_agent_id,
+        "operator_display_name": st.roster(r.game_id).name(r.operator_agent_id),
+        "decision": r.decision.value,
+        "survivors": survivors,
+        "lost": lost,
+        "resolved_at": r.resolved_at.isoformat() if r.resolved_at else None,
+    }
+    # Same encoding as JSONResponse
+    st.add_round_summary(r, json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+@traced("state.build_history")
+def build_history(game_id: str, after_round: int = 0, limit: Optional[int] = None) -> tuple[bytes, Optional[int]]:
+    """GET /history body: the game's resolved rounds after after_round (up to limit round numbers),
+    by round number then table. Returns (JSON bytes, next_cursor)."""
+    fragments, next_cursor = store.get_round_summaries(game_id, after_round, limit)
+    body = b"".join((b'{"game_id":', json.dumps(game_id).encode(), b',"rounds":[', b",".join(fragments), b"]}"))
+    return body, next_cursor
@@ -0,0 +1,116 @@
+"""Tournaments: create, seed and start many games from one roster, and rank entrants across them."""
+from typing import Optional
+
+from app.models.domain import Tournament
+from app.storage.store import store
+from app.services.game_service import (
+    ROUND_MAJORITY,
+    ROUND_MINORITY,
+    ROUND_OPERATOR,
+    create_game,
+    register_agents,
+    start_game,
+)
+
+
+def create_tournament(
+    roster: list[tuple[str, Optional[str]]],
+    seats_per_game: int = 7,
+    name: str = "",
+    start: bool = True,
+    seed: Optional[int] = None,
+    multi_table: bool = False,
+    majority_size: int = ROUND_MAJORITY,
+    minority_size: int = ROUND_MINORITY,
+) -> tuple[Tournament, dict[str, list[tuple[str, str]]]]:
+    """Spread roster entries (display_name, token) over as many games of at least seats_per_game
+    agents as it fills, register everyone and optionally start every game.
+
+    Returns the tournament and, per game_id, the [(agent_id, display_name), ...] seated there.
+    Game k is seeded with seed + k, so a seeded tournament is reproducible.
+    """
+    seats_per_table = ROUND_OPERATOR + majority_size + minority_size
+    if seats_per_game < seats_per_table:
+        raise ValueError(f"seats_per_game must be at least {seats_per_table} (one full table)")
+    if len(roster) < seats_per_game:
+        raise ValueError(f"Need at least {seats_per_game} entrants")
+    if minority_size < 1 or majority_size <= minority_size:
+        raise ValueError("Track sizes must satisfy majority_size > minority_size >= 1")
+    n_games = len(roster) // seats_per_game
+    # Check every game's entrants before creating anything, so a bad roster leaves no games behind
+    for k in range(n_games):
+        tokens = [token for _, token in roster[k::n_games] if token]
+        if len(set(tokens)) != len(tokens):
+            raise ValueError("Token already registered in this game")
+    t = Tournament.new(
+        name=name,
+        seats_per_game=seats_per_game,
+        config={"seed": seed, "multi_table": multi_table, "majority_size": majority_size, "minority_size": minority_size},
+    )
+    seated: dict[str, list[tuple[str, str]]] = {}
+    for k in range(n_games):
+        g = create_game(
+            min_players=seats_per_game,
+            rotation_seed=None if seed is None else seed + k,
+            multi_table=multi_table,
+            majority_size=majority_size,
+            minority_size=minority_size,
+        )
+        g.config["tournament_id"] = t.id
+        t.game_ids.append(g.id)
+        # Deal entrants round-robin so game sizes differ by at most one
+        _, agents = register_agents(g.id, roster[k::n_games])
+        seated[g.id] = [(a.id, a.display_name) for a in agents]
+    store.add_tournament(t)
+    if start:
+        for gid in t.game_ids:
+            start_game(gid)
+    return t, seated
+
+
+def start_tournament(tournament_id: str) -> Tournament:
+    """Start every game of the tournament that has not started yet."""
+    t = store.get_tournament(tournament_id)
+    if not t:
+        raise ValueError("Tournament not found")
+    for gid in t.game_ids:
+        g = store.get_game(gid)
+        if g and g.status.value == "ready_to_start":
+            start_game(gid)
+    return t
+
+
+def build_standings(tournament_id: str) -> Optional[dict]:
+    """Every entrant ranked by score across all games, plus per-game progress. O(entrants)."""
+    t = store.get_tournament(tournament_id)
+    if not t:
+        return None
+    games = []
+    standings = []
+    for gid in t.game_ids:
+        g = store.get_game(gid)
+        games.append({
+            "game_id": gid,
+            "status": g.status.value,
+            "current_round_number": g.current_round_number,
+            "players": store.count_participations(gid),
+        })
+        roster = store.roster(gid)
+        for p in store.get_participations_for_game(gid):
+            standings.append({
+                "agent_id": p.agent_id,
+                "display_name": roster.name(p.agent_id),
+                "game_id": gid,
+                "score": p.score,
+                "complete": p.is_complete,
+            })
+    standings.sort(key=lambda row: row["score"], reverse=True)
+    completed = sum(1 for row in games if row["status"] == "game_completed")
+    return {
+        "tournament_id": t.id,
+        "name": t.name,
+        "seats_per_game": t.seats_per_game,
+        "games_completed": completed,
+        "games": games,
+        "standings": standings,
+    }
@@ -3,6 +3,7 @@
   let gameId = '';
   let pollTimer = null;
   const POLL_MS = 2500;
+  let replayRound = null; // round number being replayed, or null for the live game
 
   const el = (id) => document.getElementById(id);
   const gameIdInput = el('gameId');
@@ -165,7 +166,7 @@
       }
       return;
     }
-    gameStatusEl.textContent = 'Status: ' + state.status;
+    gameStatusEl.textContent = (replayRound ? 'Replay · ' : '') + 'Status: ' + state.status;
     roundPhaseEl.textContent = `Round ${state.current_round_number} · ${state.current_phase || '—'}`;
   }
 
@@ -289,7 +290,51 @@
     }
   }
 
+  async function fetchReplay(round) {
+    const id = getGameId();
+    if (!id) return null;
+    try {
+      const r = await fetch(API + '/games/' + encodeURIComponent(id) + '/replay?round=' + round);
+      if (!r.ok) return null;
+      return await r.json();
+    } catch (e) {
+      return null;
+    }
+  }
+
+  // Replay view: state rebuilt from the event log as it was when the round ended.
+  // Scoreboard and coverage come from that state; the live feed is left as is.
+  async function showReplay() {
+    const state = await fetchReplay(replayRound);
+    renderStatus(state);
+    renderRoleAssignments(state);
+    renderBoard(state);
+    const score = state ? {
+      scores: state.coverage.map((c) => ({ agent_id: c.agent_id, display_name: c.display_name, score: state.scores[c.agent_id] || 0 })),
+      coverage: state.coverage,
+    } : null;
+    renderScoreboard(score);
+    renderCoverage(score);
+  }
+
+  function enterReplay() {
+    const round = parseInt(el('replayRound').value, 10);
+    if (!getGameId() || !(round >= 1)) return;
+    replayRound = round;
+    if (pollTimer) clearInterval(pollTimer);
+    pollTimer = null;
+    el('btnLive').disabled = false;
+    showReplay();
+  }
+
+  function leaveReplay() {
+    replayRound = null;
+    el('btnLive').disabled = true;
+    startPolling();
+  }
+
   async function poll() {
+    if (replayRound) return;
     const state = await fetchState();
     renderStatus(state);
     renderRoleAssignments(state);
@@ -466,6 +511,8 @@
   el('btnAddFiller').addEventListener('click', addFiller);
   el('btnTickFiller').addEventListener('click', () => { tickFiller().then(startPolling); });
   el('autoTickFiller').addEventListener('change', updateAutoTick);
+  el('btnReplay').addEventListener('click', enterReplay);
+  el('btnLive').addEventListener('click', leaveReplay);
 
   // Minimal bar is default; "Host / create game" shows full controls
   const params = new URLSearchParams(window.location.search);
@@ -0,0 +1,163 @@
+"""Cross-game leaderboard, updated as rounds resolve.
+
+Players are keyed by token when they registered with one, so one player keeps a single
+entry across games and name changes. Players without a token are keyed by display name.
+Keys hold the token's SHA-256 digest (Agent.token_hash), never the token.
+
+Entries are ranked by (-score, name, key) in a bucketed sorted list: short sorted lists
+plus the largest key of each. A flat sorted list would copy the whole tail on every
+insert and delete, and with 100k players that copy dominates. Here an update bisects the
+bucket maxima, then touches one bucket of at most 2 * _BUCKET keys. A top-k read walks
+the first buckets.
+"""
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Optional
+
+
+_BUCKET = 256
+
+
+class _SortedList:
+    def __init__(self) -> None:
+        self._buckets: list[list] = []
+        self._maxes: list = []  # last (largest) key of each bucket
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, x) -> None:
+        if not self._buckets:
+            self._buckets.append([x])
+            self._maxes.append(x)
+        else:
+            i = min(bisect_left(self._maxes, x), len(self._buckets) - 1)
+            b = self._buckets[i]
+            insort(b, x)
+            self._maxes[i] = b[-1]
+            if len(b) > 2 * _BUCKET:
+                self._buckets[i : i + 1] = [b[:_BUCKET], b[_BUCKET:]]
+                self._maxes[i : i + 1] = [b[_BUCKET - 1], b[-1]]
+        self._len += 1
+
+    def remove(self, x) -> None:
+        i = bisect_left(self._maxes, x)
+        b = self._buckets[i]
+        del b[bisect_left(b, x)]
+        self._len -= 1
+        if b:
+            self._maxes[i] = b[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def head(self, k: int) -> list:
+        out: list = []
+        for b in self._buckets:
+            if len(out) >= k:
+                break
+            out.extend(b[: k - len(out)])
+        return out
+
+
+@dataclass
+class LeaderboardEntry:
+    key: str
+    display_name: str  # latest name seen for this player
+    score: int = 0  # rounds survived
+    games: int = 0
+    rounds: int = 0  # every seat, operator included
+    track_rounds: int = 0  # majority or minority seats: rounds with a life at stake
+    chosen: int = 0  # track rounds the operator chose this player's side
+    decided_rounds: int = 0  # track rounds resolved by an operator decision (not forced)
+
+    @property
+    def sort_key(self) -> tuple:
+        return (-self.score, self.display_name.lower(), self.key)
+
+    @property
+    def survival_rate(self) -> float:
+        return self.score / self.track_rounds if self.track_rounds else 0.0
+
+    @property
+    def chosen_rate(self) -> float:
+        return self.chosen / self.decided_rounds if self.decided_rounds else 0.0
+
+
+def player_key(display_name: str, token_hash: Optional[str]) -> str:
+    if token_hash:
+        return "t:" + token_hash[:32]
+    return "n:" + display_name
+
+
+class Leaderboard:
+    def __init__(self) -> None:
+        self.entries: dict[str, LeaderboardEntry] = {}
+        self.ranked = _SortedList()  # sort_key of every entry
+        self.agent_keys: dict[str, str] = {}  # agent_id -> player key
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getstate__(self) -> dict:
+        # Stores are deep-copied for replay snapshots; locks cannot be copied
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record_round(
+        self,
+        seats: list[tuple[str, str, Optional[str], str]],
+        survivor_ids: set[str],
+        forced: bool,
+    ) -> None:
+        """seats: (agent_id, display_name, token_hash, role) for everyone at one resolved table.
+
+        Entries are replaced, never mutated, so readers can hold on to one without a copy."""
+        with self._lock:
+            for agent_id, display_name, token_hash, role in seats:
+                key = self.agent_keys.get(agent_id)
+                first_round = key is None
+                if first_round:
+                    key = self.agent_keys[agent_id] = player_key(display_name, token_hash)
+                old = self.entries.get(key)
+                if old is None:
+                    old = LeaderboardEntry(key=key, display_name=display_name)
+                else:
+                    self.ranked.remove(old.sort_key)
+                on_track = role != "operator"
+                survived = on_track and agent_id in survivor_ids
+                chosen = on_track and not forced
+                e = LeaderboardEntry(
+                    key=key,
+                    display_name=display_name,
+                    score=old.score + survived,
+                    # Each agent_id belongs to exactly one game
+                    games=old.games + first_round,
+                    rounds=old.rounds + 1,
+                    track_rounds=old.track_rounds + on_track,
+                    chosen=old.chosen + (chosen and survived),
+                    decided_rounds=old.decided_rounds + chosen,
+                )
+                self.entries[key] = e
+                self.ranked.add(e.sort_key)
+
+    def top(self, k: int) -> list[tuple[int, LeaderboardEntry]]:
+        """(rank, entry) for the k best players. Ties on score share a rank."""
+        with self._lock:
+            keys = self.ranked.head(k)
+            out = []
+            rank = 0
+            prev = None
+            for i, sk in enumerate(keys):
+                if sk[0] != prev:
+                    rank, prev = i + 1, sk[0]
+                out.append((rank, self.entries[sk[2]]))
+            return out
@@ -0,0 +1,59 @@
+"""Per-game roster: display names and reusable response fragments for the state builders.
+
+Names never change after registration, so each game's roster is filled once, as agents
+join (Store.add_participation), and every builder reads names from it instead of looking
+up each agent. AgentSummary rows depend only on (agent, role, argued this phase): each
+combination is built once and shared by every later response. A CoverageProgress row is
+rebuilt only when the participation's role flags change. Both models are frozen, so a
+shared instance cannot be changed under another response.
+"""
+from app.models.domain import Participation
+from app.schemas.api import AgentSummary, CoverageProgress
+
+
+class Roster:
+    __slots__ = ("names", "_summaries", "_coverage")
+
+    def __init__(self) -> None:
+        self.names: dict[str, str] = {}  # agent_id -> display_name, join order
+        self._summaries: dict[tuple[str, str, bool], AgentSummary] = {}
+        self._coverage: dict[str, CoverageProgress] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, agent_id: str, display_name: str) -> None:
+        self.names[agent_id] = display_name
+
+    def name(self, agent_id: str) -> str:
+        return self.names.get(agent_id) or agent_id[:8]
+
+    def summary(self, agent_id: str, role: str, argued_this_phase: bool = False) -> AgentSummary:
+        key = (agent_id, role, argued_this_phase)
+        s = self._summaries.get(key)
+        if s is None:
+            s = self._summaries[key] = AgentSummary(
+                id=agent_id,
+                display_name=self.name(agent_id),
+                role=role,
+                argued_this_phase=argued_this_phase,
+            )
+        return s
+
+    def coverage(self, p: Participation) -> CoverageProgress:
+        c = self._coverage.get(p.agent_id)
+        if (
+            c is None
+            or c.has_been_operator != p.has_been_operator
+            or c.has_been_majority != p.has_been_majority
+            or c.has_been_minority != p.has_been_minority
+        ):
+            c = self._coverage[p.agent_id] = CoverageProgress(
+                agent_id=p.agent_id,
+                display_name=self.name(p.agent_id),
+                has_been_operator=p.has_been_operator,
+                has_been_majority=p.has_been_majority,
+                has_been_minority=p.has_been_minority,
+                complete=p.is_complete,
+            )
+        return c
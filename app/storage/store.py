@@ -1,60 +1,159 @@
 """In-memory store for games, agents, rounds, arguments, events."""
+import asyncio
+import threading
+from bisect import bisect_left, insort
 from typing import Optional
 from app.models.domain import (
     Game,
+    GameStatus,
     Agent,
     Participation,
     Round,
     Argument,
     EventLog,
     Phase,
+    Tournament,
 )
+from app.storage.leaderboard import Leaderboard
+from app.storage.roster import Roster
 
 
 class Store:
     def __init__(self) -> None:
         self.games: dict[str, Game] = {}
+        # Lobby indexes: creation sequence numbers, overall and per status (each list kept sorted)
+        self.games_in_order: list[str] = []  # seq -> game_id
+        self.game_seq: dict[str, int] = {}  # game_id -> seq
+        self.seqs_by_status: dict[GameStatus, list[int]] = {}
+        self.indexed_status: dict[str, GameStatus] = {}  # status each game is indexed under
         self.agents: dict[str, Agent] = {}
         self.participations: dict[str, Participation] = {}  # key: f"{game_id}:{agent_id}"
+        self.participations_by_game: dict[str, dict[str, Participation]] = {}  # game_id -> agent_id -> p (join order)
+        self.complete_by_game: dict[str, set[str]] = {}  # game_id -> agent_ids with full role coverage
         self.rounds: dict[str, Round] = {}
         self.rounds_by_game: dict[str, list[str]] = {}  # game_id -> [round_id, ...]
+        self.rounds_by_number: dict[tuple[str, int], list[str]] = {}  # (game_id, round_number) -> table round_ids
+        # game_id -> (round_number, table, history JSON) per resolved round, sorted; frozen at resolution
+        self.round_summaries: dict[str, list[tuple[int, int, bytes]]] = {}
         self.arguments: dict[str, Argument] = {}
         self.arguments_by_round: dict[str, list[str]] = {}  # round_id -> [arg_id, ...]
         self.events: list[EventLog] = []
+        self.events_by_game: dict[str, list[EventLog]] = {}  # game_id -> events in log order
+        # Bumped on every logged transition; lets pollers skip unchanged games
+        self.game_versions: dict[str, int] = {}
+        # game_id -> (loop, event) set at the game's next version bump; see version_changed
+        self.version_events: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Event]] = {}
+        self.agent_games: dict[str, str] = {}  # agent_id -> game_id
+        self.rosters: dict[str, Roster] = {}  # game_id -> names and cached summaries (see roster)
+        self.token_index: dict[tuple[str, str], str] = {}  # (token_hash, game_id) -> agent_id
+        self.rotations: dict[str, list[str]] = {}  # game_id -> operator rotation order (see scheduler)
+        self.tournaments: dict[str, Tournament] = {}
         # GPT filler: set of agent_id that are AI-controlled
         self.filler_agent_ids: set[str] = set()
+        # Cross-game standings, updated as each table resolves
+        self.leaderboard = Leaderboard()
+        # One re-entrant lock per game, held by every state transition (game_service._game_locked)
+        self.game_locks: dict[str, threading.RLock] = {}
+
+    def __getstate__(self) -> dict:
+        # Stores are deep-copied for replay snapshots; locks cannot be copied
+        state = self.__dict__.copy()
+        state["game_locks"] = {}
+        state["version_events"] = {}
+        return state
+
+    def game_lock(self, game_id: str) -> threading.RLock:
+        lock = self.game_locks.get(game_id)
+        if lock is None:
+            # setdefault is atomic: racing first callers get the same lock
+            lock = self.game_locks.setdefault(game_id, threading.RLock())
+        return lock
 
     def add_game(self, g: Game) -> None:
         self.games[g.id] = g
         self.rounds_by_game[g.id] = []
+        seq = len(self.games_in_order)
+        self.games_in_order.append(g.id)
+        self.game_seq[g.id] = seq
+        self.seqs_by_status.setdefault(g.status, []).append(seq)
+        self.indexed_status[g.id] = g.status
 
     def get_game(self, game_id: str) -> Optional[Game]:
         return self.games.get(game_id)
 
     def update_game(self, g: Game) -> None:
         self.games[g.id] = g
+        self._bump_version(g.id)
+        old = self.indexed_status.get(g.id)
+        if old is not None and old != g.status:
+            seq = self.game_seq[g.id]
+            seqs = self.seqs_by_status[old]
+            del seqs[bisect_left(seqs, seq)]
+            insort(self.seqs_by_status.setdefault(g.status, []), seq)
+            self.indexed_status[g.id] = g.status
 
     def add_agent(self, a: Agent) -> None:
         self.agents[a.id] = a
 
+    def add_agents(self, agents: list[Agent]) -> None:
+        self.agents.update((a.id, a) for a in agents)
+
+    def index_tokens(self, game_id: str, agents: list[Agent]) -> None:
+        for a in agents:
+            if a.token_hash:
+                self.token_index[(a.token_hash, game_id)] = a.id
+
+    def agent_for_token(self, game_id: str, token_hash: str) -> Optional[str]:
+        return self.token_index.get((token_hash, game_id))
+
     def get_agent(self, agent_id: str) -> Optional[Agent]:
         return self.agents.get(agent_id)
 
     def add_participation(self, p: Participation) -> None:
         self.participations[f"{p.game_id}:{p.agent_id}"] = p
+        self.participations_by_game.setdefault(p.game_id, {})[p.agent_id] = p
+        self.agent_games[p.agent_id] = p.game_id
+        self._track_complete(p)
+        a = self.agents.get(p.agent_id)
+        if a:
+            self.rosters.setdefault(p.game_id, Roster()).add(a.id, a.display_name)
+
+    def add_participations(self, parts: list[Participation]) -> None:
+        for p in parts:
+            self.add_participation(p)
+
+    def roster(self, game_id: str) -> Roster:
+        r = self.rosters.get(game_id)
+        return r if r is not None else Roster()
 
     def get_participation(self, game_id: str, agent_id: str) -> Optional[Participation]:
         return self.participations.get(f"{game_id}:{agent_id}")
 
     def get_participations_for_game(self, game_id: str) -> list[Participation]:
-        return [p for k, p in self.participations.items() if k.startswith(f"{game_id}:")]
+        return list(self.participations_by_game.get(game_id, {}).values())
+
+    def count_participations(self, game_id: str) -> int:
+        return len(self.participations_by_game.get(game_id, {}))
+
+    def count_complete(self, game_id: str) -> int:
+        return len(self.complete_by_game.get(game_id, ()))
 
     def update_participation(self, p: Participation) -> None:
         self.participations[f"{p.game_id}:{p.agent_id}"] = p
+        self.participations_by_game.setdefault(p.game_id, {})[p.agent_id] = p
+        self._track_complete(p)
+
+    def _track_complete(self, p: Participation) -> None:
+        done = self.complete_by_game.setdefault(p.game_id, set())
+        if p.is_complete:
+            done.add(p.agent_id)
+        else:
+            done.discard(p.agent_id)
 
     def add_round(self, r: Round) -> None:
         self.rounds[r.id] = r
         self.rounds_by_game.setdefault(r.game_id, []).append(r.id)
+        self.rounds_by_number.setdefault((r.game_id, r.round_number), []).append(r.id)
         self.arguments_by_round[r.id] = []
 
     def get_round(self, round_id: str) -> Optional[Round]:
@@ -66,6 +165,14 @@ class Store:
             return None
         return self.rounds.get(ids[-1])
 
+    def get_current_rounds(self, game_id: str) -> list[Round]:
+        """All tables of the game's current round number, in table order."""
+        g = self.games.get(game_id)
+        if not g:
+            return []
+        ids = self.rounds_by_number.get((game_id, g.current_round_number), [])
+        return [self.rounds[rid] for rid in ids]
+
     def get_rounds_for_game(self, game_id: str) -> list[Round]:
         ids = self.rounds_by_game.get(game_id, [])
         return [self.rounds[rid] for rid in ids if rid in self.rounds]
@@ -73,6 +180,24 @@ class Store:
     def update_round(self, r: Round) -> None:
         self.rounds[r.id] = r
 
+    def add_round_summary(self, r: Round, fragment: bytes) -> None:
+        """fragment: the resolved round's history entry, as JSON. Resolved rounds never change."""
+        insort(self.round_summaries.setdefault(r.game_id, []), (r.round_number, r.table, fragment))
+
+    def get_round_summaries(
+        self,
+        game_id: str,
+        after_round: int = 0,
+        limit: Optional[int] = None,
+    ) -> tuple[list[bytes], Optional[int]]:
+        """History fragments for round numbers after after_round, at most limit round numbers (every
+        table of each). Returns (fragments, next_cursor); next_cursor is None when nothing follows."""
+        entries = self.round_summaries.get(game_id, [])
+        start = bisect_left(entries, (after_round + 1,))
+        end = len(entries) if limit is None else bisect_left(entries, (after_round + limit + 1,), start)
+        next_cursor = after_round + limit if end < len(entries) else None
+        return [e[2] for e in entries[start:end]], next_cursor
+
     def add_argument(self, a: Argument) -> None:
         self.arguments[a.id] = a
         self.arguments_by_round.setdefault(a.round_id, []).append(a.id)
@@ -87,6 +212,8 @@ class Store:
 
     def add_event(self, e: EventLog) -> None:
         self.events.append(e)
+        self.events_by_game.setdefault(e.game_id, []).append(e)
+        self._bump_version(e.game_id)
 
     def get_events_for_game(
         self,
@@ -94,20 +221,80 @@ class Store:
         round_id: Optional[str] = None,
         limit: int = 100,
     ) -> list[EventLog]:
-        out = [e for e in self.events if e.game_id == game_id]
-        if round_id is not None:
-            out = [e for e in out if e.round_id == round_id]
-        out.sort(key=lambda x: x.created_at, reverse=True)
-        return out[:limit]
-
-    def list_games(self, status: Optional[str] = None) -> list[Game]:
-        games = list(self.games.values())
+        """Newest first. Events are appended in time order, so no sort is needed."""
+        out = []
+        for e in reversed(self.events_by_game.get(game_id, [])):
+            if round_id is not None and e.round_id != round_id:
+                continue
+            out.append(e)
+            if len(out) >= limit:
+                break
+        return out
+
+    def _bump_version(self, game_id: str) -> None:
+        self.game_versions[game_id] = self.game_versions.get(game_id, 0) + 1
+        waiting = self.version_events.pop(game_id, None)
+        if waiting is not None:
+            loop, event = waiting
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if on_loop:
+                event.set()
+            else:
+                loop.call_soon_threadsafe(event.set)
+
+    def version_changed(self, game_id: str) -> asyncio.Event:
+        """Event set by the game's next version bump. Call from the event loop, then re-check the
+        version before awaiting it: a bump from another thread may land in between."""
+        waiting = self.version_events.get(game_id)
+        if waiting is None:
+            waiting = self.version_events[game_id] = (asyncio.get_running_loop(), asyncio.Event())
+        return waiting[1]
+
+    def get_version(self, game_id: str) -> int:
+        return self.game_versions.get(game_id, 0)
+
+    def list_games(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = 100,
+        cursor: Optional[int] = None,
+    ) -> tuple[list[Game], Optional[int]]:
+        """Newest first, one page at a time. Returns (games, next_cursor); next_cursor is None on the last page.
+
+        cursor is the creation sequence number of the last game of the previous page. limit=None
+        returns every game from the cursor on.
+        """
         if status:
-            games = [g for g in games if g.status.value == status]
-        return sorted(games, key=lambda g: g.created_at, reverse=True)
+            try:
+                seqs = self.seqs_by_status.get(GameStatus(status), [])
+            except ValueError:
+                return [], None
+            end = len(seqs) if cursor is None else bisect_left(seqs, cursor)
+            start = 0 if limit is None else max(0, end - limit)
+            page = seqs[start:end]
+        else:
+            end = len(self.games_in_order) if cursor is None else max(0, min(cursor, len(self.games_in_order)))
+            start = 0 if limit is None else max(0, end - limit)
+            page = range(start, end)
+        games = [self.games[self.games_in_order[seq]] for seq in reversed(page)]
+        next_cursor = self.game_seq[games[-1].id] if games and start > 0 else None
+        return games, next_cursor
+
+    def add_tournament(self, t: Tournament) -> None:
+        self.tournaments[t.id] = t
+
+    def get_tournament(self, tournament_id: str) -> Optional[Tournament]:
+        return self.tournaments.get(tournament_id)
 
     def mark_filler(self, agent_id: str) -> None:
         self.filler_agent_ids.add(agent_id)
+        game_id = self.agent_games.get(agent_id)
+        if game_id:
+            # has_filler_agents is part of the game state
+            self._bump_version(game_id)
 
     def is_filler(self, agent_id: str) -> bool:
         return agent_id in self.filler_agent_ids
@@ -0,0 +1,136 @@
+"""Opt-in span tracing for game transitions, state builders and filler LLM calls.
+
+Off by default: a traced function then costs one flag check. Set ARENA_TRACE=path.json
+(or call enable()) to record spans. Each span keeps wall and CPU time, tagged with
+game_id, round number and phase. Spans are written as Chrome trace-event JSON, which
+chrome://tracing and https://ui.perfetto.dev open directly. That happens at exit, or
+whenever export() is called.
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+_enabled = False
+_path: Optional[str] = None
+_spans: deque = deque(maxlen=int(os.environ.get("ARENA_TRACE_MAX_SPANS", "200000")))
+_pid = os.getpid()
+
+
+def enable(path: Optional[str] = None) -> None:
+    """Start recording spans. With a path, they are also written there at exit."""
+    global _enabled, _path
+    _enabled = True
+    if path and not _path:
+        atexit.register(lambda: export(_path))
+    _path = path or _path
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear() -> None:
+    _spans.clear()
+
+
+def _game_tags(game_id: Optional[str]) -> dict:
+    if not game_id:
+        return {}
+    from app.storage.store import store
+
+    g = store.get_game(game_id)
+    if not g:
+        return {"game_id": game_id}
+    return {
+        "game_id": game_id,
+        "round": g.current_round_number,
+        "phase": g.current_phase.value if g.current_phase else None,
+    }
+
+
+@contextmanager
+def span(name: str, game_id: Optional[str] = None, **tags):
+    """Record one span around the with-block. Round and phase are read from the game on entry.
+
+    Around an await, cpu_us also counts whatever else the event loop ran meanwhile."""
+    if not _enabled:
+        yield
+        return
+    args = _game_tags(game_id)
+    args.update(tags)
+    wall0 = time.perf_counter_ns()
+    cpu0 = time.thread_time_ns()
+    try:
+        yield
+    finally:
+        cpu = time.thread_time_ns() - cpu0
+        wall = time.perf_counter_ns() - wall0
+        args["cpu_us"] = cpu / 1000
+        _spans.append({
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": wall0 / 1000,
+            "dur": wall / 1000,
+            "pid": _pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of span(). The game is the first argument: a game_id, or an object with .id.
+    Coroutine functions get a span around the whole await."""
+
+    def game_of(args: tuple, kwargs: dict) -> Optional[str]:
+        first = kwargs.get("game_id", args[0] if args else None)
+        return first if isinstance(first, str) else getattr(first, "id", None)
+
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+                with span(name, game_of(args, kwargs)):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(name, game_of(args, kwargs)):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def export(path: Optional[str] = None) -> int:
+    """Write recorded spans as Chrome trace-event JSON. Returns how many were written."""
+    path = path or _path
+    if not path:
+        raise ValueError("No trace file given")
+    events = list(_spans)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+if os.environ.get("ARENA_TRACE"):
+    enable(os.environ["ARENA_TRACE"])
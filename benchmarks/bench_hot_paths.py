@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+In-process benchmarks for the service and state-builder hot paths.
+
+Fills the in-memory store with synthetic games (7 filler agents each, started, seeded
+rotation) and times the functions every poll, tick and argument goes through, calling
+game_service / state_builder / gpt_filler directly: no HTTP, no network, no LLM.
+The probe game the reads run against has a few resolved rounds, so feed and scoreboard
+carry real content.
+
+  build_game_state            full /state payload for the probe game
+  build_feed                  newest 50 feed items
+  build_scoreboard            scoreboard for the probe game
+  submit_argument             one argument (fresh agent/phase per call; advances untimed)
+  try_auto_advance            tick on a game mid-phase (nothing to advance: the common case)
+  get_pending_filler_action   next filler move for the probe game
+
+Each store size is built from scratch with the same seed. Results hold the median and
+best per-call time in microseconds. Save them as a baseline, then compare a later run
+against it; a benchmark whose median grew by more than --threshold is flagged and the
+exit status is 1.
+
+Example:
+  python benchmarks/bench_hot_paths.py --save benchmarks/baseline.json
+  python benchmarks/bench_hot_paths.py --compare benchmarks/baseline.json
+  python benchmarks/bench_hot_paths.py --sizes 1 100 --seconds 0.2
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.domain import GameStatus  # noqa: E402
+from app.services.game_service import (  # noqa: E402
+    DEBATE_PHASES,
+    advance,
+    create_game,
+    register_agents,
+    start_game,
+    submit_argument,
+    try_auto_advance,
+)
+from app.services.gpt_filler import get_pending_filler_action  # noqa: E402
+from app.services.state_builder import build_feed, build_game_state, build_scoreboard  # noqa: E402
+from app.storage.store import store  # noqa: E402
+
+DEFAULT_SIZES = [1, 100, 10_000, 100_000]
+AGENTS_PER_GAME = 7
+PROBE_ROUNDS = 3
+ARGUMENT_TEXT = "Five lives outweigh one; pull the lever and save the majority."
+
+
+def make_game(seed: int) -> str:
+    g = create_game(min_players=AGENTS_PER_GAME, rotation_seed=seed)
+    _, agents = register_agents(g.id, [(f"Bench-{seed}-{k}", None) for k in range(AGENTS_PER_GAME)])
+    for a in agents:
+        store.mark_filler(a.id)
+    start_game(g.id)
+    return g.id
+
+
+def argue_phase(game_id: str, skip: int = 0) -> None:
+    """Every track agent of the current round argues, except the last `skip` of them."""
+    r = store.get_current_round(game_id)
+    track = r.majority_agent_ids + r.minority_agent_ids
+    for aid in track[: len(track) - skip]:
+        submit_argument(game_id, r.id, aid, ARGUMENT_TEXT)
+
+
+def play_rounds(game_id: str, rounds: int) -> None:
+    for _ in range(rounds):
+        for _ in DEBATE_PHASES:
+            argue_phase(game_id)
+            advance(game_id, "next_phase")
+        advance(game_id, "resolve_round")
+        if store.get_game(game_id).status == GameStatus.round_resolved:
+            advance(game_id, "next_phase")
+
+
+def populate(n_games: int, seed: int) -> list[str]:
+    """Reset the store and fill it with n_games started games. Returns their ids in creation order."""
+    store.__init__()
+    random.seed(seed)
+    return [make_game(seed + k) for k in range(n_games)]
+
+
+def time_calls(fn: Callable[[], object], seconds: float, min_calls: int = 20) -> list[float]:
+    """Per-call wall times (seconds) of fn, for about `seconds` and at least min_calls calls."""
+    samples = []
+    end = time.perf_counter() + seconds
+    while len(samples) < min_calls or time.perf_counter() < end:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def time_submit_argument(game_ids: list[str], seconds: float, seed: int) -> list[float]:
+    """Times submit_argument only; advancing phases and rounds between calls, and replacing
+    completed games with fresh ones, is not counted."""
+    samples = []
+    end = time.perf_counter() + seconds
+    k = 0
+    while len(samples) < 20 or time.perf_counter() < end:
+        slot = k % len(game_ids)
+        k += 1
+        game_id = game_ids[slot]
+        if store.get_game(game_id).status == GameStatus.game_completed:
+            game_ids[slot] = make_game(seed + k)
+            continue
+        r = store.get_current_round(game_id)
+        if r.phase not in DEBATE_PHASES:
+            advance(game_id, "resolve_round")
+            if store.get_game(game_id).status == GameStatus.round_resolved:
+                advance(game_id, "next_phase")
+            continue
+        for aid in r.majority_agent_ids + r.minority_agent_ids:
+            t0 = time.perf_counter()
+            submit_argument(game_id, r.id, aid, ARGUMENT_TEXT)
+            samples.append(time.perf_counter() - t0)
+        advance(game_id, "next_phase")
+    return samples
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "calls": len(samples),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "best_us": round(min(samples) * 1e6, 3),
+    }
+
+
+def run_size(n_games: int, seed: int, seconds: float) -> dict:
+    t0 = time.perf_counter()
+    game_ids = populate(n_games, seed)
+    build_s = time.perf_counter() - t0
+    rng = random.Random(seed)
+    probe = game_ids[rng.randrange(n_games)]
+    play_rounds(probe, PROBE_ROUNDS)
+    # Tick target: mid-phase, one track agent still to argue
+    tick = make_game(seed + n_games)
+    argue_phase(tick, skip=1)
+    # Argument targets: a handful of extra games, played round after round
+    writers = [make_game(seed + n_games + 1 + k) for k in range(8)]
+    writer_seed = seed + n_games + 9
+
+    results = {
+        "build_game_state": summarize(time_calls(lambda: build_game_state(probe), seconds)),
+        "build_feed": summarize(time_calls(lambda: build_feed(probe, limit=50), seconds)),
+        "build_scoreboard": summarize(time_calls(lambda: build_scoreboard(probe), seconds)),
+        "submit_argument": summarize(time_submit_argument(writers, seconds, writer_seed)),
+        "try_auto_advance": summarize(time_calls(lambda: try_auto_advance(tick), seconds)),
+        "get_pending_filler_action": summarize(time_calls(lambda: get_pending_filler_action(probe), seconds)),
+    }
+    return {"store_build_s": round(build_s, 3), "benchmarks": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Lines describing every benchmark whose median regressed by more than threshold (0.25 = 25%)."""
+    regressions = []
+    for size, cur in current["results"].items():
+        base = baseline.get("results", {}).get(size)
+        if not base:
+            continue
+        for name, stats in cur["benchmarks"].items():
+            old = base["benchmarks"].get(name)
+            if not old or not old["median_us"]:
+                continue
+            ratio = stats["median_us"] / old["median_us"]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{name} @ {size} games: {old['median_us']:.1f}us -> {stats['median_us']:.1f}us ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def print_table(report: dict, baseline: dict | None) -> None:
+    print(f"{'games':>7} {'benchmark':<27} {'median us':>10} {'best us':>9} {'calls':>8}" + (f" {'vs base':>8}" if baseline else ""))
+    for size, res in report["results"].items():
+        for name, s in res["benchmarks"].items():
+            line = f"{size:>7} {name:<27} {s['median_us']:>10.1f} {s['best_us']:>9.1f} {s['calls']:>8}"
+            if baseline:
+                old = baseline.get("results", {}).get(size, {}).get("benchmarks", {}).get(name)
+                line += f" {s['median_us'] / old['median_us']:>7.2f}x" if old and old["median_us"] else f" {'-':>8}"
+            print(line)
+        print(f"{size:>7} {'(store build, s)':<27} {res['store_build_s']:>10.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark service and state-builder hot paths in-process")
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Games in the synthetic store")
+    ap.add_argument("--seconds", type=float, default=1.0, help="Time budget per benchmark per size")
+    ap.add_argument("--seed", type=int, default=1234, help="Seed for rotations and probe selection")
+    ap.add_argument("--save", default=None, help="Write results as a baseline JSON file")
+    ap.add_argument("--compare", default=None, help="Baseline JSON file to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Flag medians slower than baseline by more than this fraction")
+    args = ap.parse_args()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "seconds": args.seconds,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for n in args.sizes:
+        report["results"][str(n)] = run_size(n, args.seed, args.seconds)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(report, baseline)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save}")
+    if baseline:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions (median more than {args.threshold:.0%} slower than baseline):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rounds needed to complete a game for N agents.
+
+Plays games through game_service in-process (arguments skipped with force_decision,
+rounds closed with resolve_round) and counts rounds until game_completed. For
+comparison it also simulates the previous policy: random operator among agents that
+had not operated yet, random minority among the rest that had not been minority.
+N agents can never finish in fewer than N rounds (one operator per round).
+
+Example:
+  python scripts/bench_rotation.py
+  python scripts/bench_rotation.py --sizes 7 10 50 --trials 50
+"""
+import argparse
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.domain import GameStatus  # noqa: E402
+from app.services import game_service  # noqa: E402
+from app.storage.store import store  # noqa: E402
+
+
+def rounds_with_scheduler(n: int, seed: int | None) -> int:
+    g = game_service.create_game(min_players=1, rotation_seed=seed)
+    for i in range(n):
+        game_service.register_agent(g.id, f"Agent-{i}")
+    game_service.start_game(g.id)
+    while g.status != GameStatus.game_completed:
+        game_service.advance(g.id, "force_decision")
+        g = game_service.advance(g.id, "resolve_round")
+        if g.status == GameStatus.round_resolved:
+            g = game_service.advance(g.id, "next_phase")
+    return store.get_game(g.id).current_round_number
+
+
+def rounds_with_random_policy(n: int, rng: random.Random) -> int:
+    operated, majority, minority = set(), set(), set()
+    agents = list(range(n))
+    rounds = 0
+    while not (len(operated) == len(majority) == len(minority) == n):
+        rounds += 1
+        never_op = [a for a in agents if a not in operated]
+        op = rng.choice(never_op or agents)
+        rest = [a for a in agents if a != op]
+        never_min = [a for a in rest if a not in minority]
+        mino = rng.choice(never_min or rest)
+        operated.add(op)
+        minority.add(mino)
+        majority.update(a for a in rest if a != mino)
+    return rounds
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark rounds-to-completion of the role rotation")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[7, 10, 20, 50, 100, 200], help="Agents per game")
+    ap.add_argument("--trials", type=int, default=20, help="Games per size (seeded)")
+    args = ap.parse_args()
+
+    print(f"{'N':>5} {'scheduler':>10} {'random mean':>12} {'random max':>11}")
+    for n in args.sizes:
+        ours = [rounds_with_scheduler(n, seed) for seed in range(args.trials)]
+        rng = random.Random(0)
+        theirs = [rounds_with_random_policy(n, rng) for _ in range(args.trials)]
+        print(f"{n:>5} {max(ours):>10} {statistics.mean(theirs):>12.2f} {max(theirs):>11}")
+
+
+if __name__ == "__main__":
+    main()
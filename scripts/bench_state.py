@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: requests per second for GET /api/games/{id}/state.
+
+Drives the FastAPI app in-process over ASGI (no sockets, no HTTP client
+dependency), so the number covers routing, state building and JSON encoding.
+Each game is started so the state carries a full round assignment.
+
+Example:
+  python scripts/bench_state.py
+  python scripts/bench_state.py --sizes 7 50 500 --seconds 3
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.main import app  # noqa: E402
+from app.services import game_service  # noqa: E402
+
+
+def make_game(participants: int) -> str:
+    g = game_service.create_game(min_players=1)
+    for i in range(participants):
+        game_service.register_agent(g.id, f"Agent-{i}")
+    game_service.start_game(g.id)
+    return g.id
+
+
+async def asgi_get(path: str) -> tuple[int, bytes]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    status = 0
+    chunks: list[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def bench(path: str, seconds: float) -> tuple[float, int]:
+    status, body = await asgi_get(path)
+    if status != 200:
+        raise RuntimeError(f"GET {path} -> {status}: {body[:200]!r}")
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        await asgi_get(path)
+        n += 1
+    return n / (time.perf_counter() - start), len(body)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark GET /state requests per second")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[7, 50, 500], help="Participants per game")
+    ap.add_argument("--seconds", type=float, default=2.0, help="Measurement time per size")
+    args = ap.parse_args()
+
+    print(f"{'participants':>12} {'req/s':>10} {'bytes':>8}")
+    for size in args.sizes:
+        game_id = make_game(size)
+        rps, nbytes = asyncio.run(bench(f"/api/games/{game_id}/state", args.seconds))
+        print(f"{size:>12} {rps:>10.0f} {nbytes:>8}")
+
+
+if __name__ == "__main__":
+    main()
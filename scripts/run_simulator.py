@@ -1,150 +1,448 @@
 #!/usr/bin/env python3
 """
-Multi-agent simulator for Trolley Problem Arena.
-Registers 3-5 agents, starts the game, and runs a loop: each agent
-submits arguments in debate phases; operator submits decision; advance to next round.
-Use when classmates' agents are unavailable. Run with API base URL.
+Multi-agent simulator and load generator for Trolley Problem Arena.
+
+Simulates M concurrent games with K agents each over asyncio. Every agent is its
+own client: it watches the game state, waits a think time, then submits its
+argument in each debate phase (or its decision when operator), authenticated with
+the token it registered with. A runner per game
+advances phases once every track agent has argued and starts the next round.
+With --batch, one client per game instead sends all of its agents' pending actions in
+one POST /actions:batch, and the server's auto-advance moves the game on.
+Requests share a pool of persistent HTTP/1.1 keep-alive connections.
+
+Client modes for watching state:
+  poll      GET /state every --poll-interval seconds (with ?version=, 304 if unchanged)
+  longpoll  GET /state/wait?version=... (server holds the request until the game changes)
+  stream    GET /stream (server-sent events, one connection per agent)
+
+At the end it reports throughput, p50/p95/p99 latency and error rate per
+endpoint, and game completion times, as a table and optionally as JSON.
 
 Example:
-  python scripts/run_simulator.py
-  python scripts/run_simulator.py --base http://localhost:8000
+  python scripts/run_simulator.py                      # one 7-agent game, verbose
   python scripts/run_simulator.py --base http://localhost:8000 --game-id <existing-game-id>
+  python scripts/run_simulator.py --games 50 --agents 7 --think 0.2 --mode longpoll --json report.json
+  python scripts/run_simulator.py --games 50 --think 0.2 --mode longpoll --batch
 """
 import argparse
+import asyncio
+import json
 import random
+import re
+import secrets
+import statistics
 import time
-import urllib.request
-import urllib.error
-import json
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urlsplit
 
+_ID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+DEBATE = ("phase_1", "phase_2", "phase_3")
 
-def req(base: str, path: str, method: str = "GET", body: dict | None = None) -> dict:
-    url = base.rstrip("/") + path
-    data = None
-    if body is not None:
-        data = json.dumps(body).encode("utf-8")
-    req_obj = urllib.request.Request(url, data=data, method=method)
-    req_obj.add_header("Content-Type", "application/json")
-    try:
-        with urllib.request.urlopen(req_obj, timeout=10) as resp:
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
+
+class HTTPError(RuntimeError):
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"HTTP {status}: {detail}")
+        self.status = status
+
+
+class Connection:
+    """One persistent HTTP/1.1 connection (Content-Length and chunked bodies)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "Connection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def close(self) -> None:
+        self.reusable = False
+        self.writer.close()
+
+    async def send(self, host: str, method: str, path: str, body: Optional[bytes], extra: str = "") -> None:
+        head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n{extra}"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        self.writer.write(head.encode() + b"\r\n" + (body or b""))
+        await self.writer.drain()
+
+    async def read_head(self) -> tuple[int, dict[str, str]]:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        status = int(line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if headers.get("connection", "").lower() == "close":
+            self.reusable = False
+        return status, headers
+
+    async def read_chunk(self) -> bytes:
+        size = int((await self.reader.readline()).split(b";")[0], 16)
+        data = await self.reader.readexactly(size) if size else b""
+        await self.reader.readline()
+        return data
+
+    async def read_body(self, status: int, headers: dict[str, str]) -> bytes:
+        if status in (204, 304) or 100 <= status < 200:
+            return b""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                chunk = await self.read_chunk()
+                if not chunk:
+                    return b"".join(parts)
+                parts.append(chunk)
+        return await self.reader.readexactly(int(headers.get("content-length", "0")))
+
+
+class Client:
+    """Pooled keep-alive client that records latency per endpoint template."""
+
+    def __init__(self, base: str, pool_size: int):
+        u = urlsplit(base)
+        self.host = u.hostname or "localhost"
+        self.port = u.port or 80
+        self.host_header = u.netloc
+        self.prefix = u.path.rstrip("/")
+        self._sem = asyncio.Semaphore(pool_size)
+        self._idle: list[Connection] = []
+        self.latency: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.rate_limited: dict[str, int] = defaultdict(int)
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None, token: Optional[str] = None) -> tuple[int, Optional[dict]]:
+        """Send one request; on 429, wait Retry-After seconds (off the pool) and send it again."""
+        key = f"{method} {_ID.sub('{id}', path.split('?')[0])}"
+        data = json.dumps(body).encode() if body is not None else None
+        extra = f"Authorization: Bearer {token}\r\n" if token else ""
+        while True:
+            status, headers, raw = await self._send(key, method, path, data, extra)
+            if status != 429:
+                break
+            self.rate_limited[key] += 1
+            await asyncio.sleep(float(headers.get("retry-after") or 1))
+        if status >= 400:
+            self.errors[key] += 1
+            try:
+                detail = json.loads(raw).get("detail", raw.decode())
+            except ValueError:
+                detail = raw.decode(errors="replace")
+            raise HTTPError(status, str(detail))
+        return status, (json.loads(raw) if raw else None)
+
+    async def _send(self, key: str, method: str, path: str, data: Optional[bytes], extra: str) -> tuple[int, dict[str, str], bytes]:
+        async with self._sem:
+            for attempt in (0, 1):
+                conn = self._idle.pop() if self._idle and not attempt else await Connection.open(self.host, self.port)
+                start = time.perf_counter()
+                try:
+                    await conn.send(self.host_header, method, self.prefix + path, data, extra)
+                    status, headers = await conn.read_head()
+                    raw = await conn.read_body(status, headers)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                    conn.close()
+                    if attempt:
+                        self.errors[key] += 1
+                        raise
+                    continue  # stale keep-alive connection: retry once on a fresh one
+                self.latency[key].append(time.perf_counter() - start)
+                if conn.reusable:
+                    self._idle.append(conn)
+                else:
+                    conn.close()
+                return status, headers, raw
+
+    async def stream(self, path: str):
+        """Yield parsed `data:` payloads of a server-sent event stream (dedicated connection)."""
+        conn = await Connection.open(self.host, self.port)
         try:
-            err = e.read().decode()
-            errj = json.loads(err)
-            raise RuntimeError(errj.get("detail", err))
-        except (ValueError, json.JSONDecodeError):
-            raise RuntimeError(f"HTTP {e.code}: {e.reason}")
+            await conn.send(self.host_header, "GET", self.prefix + path, None, "Accept: text/event-stream\r\n")
+            status, headers = await conn.read_head()
+            if status != 200:
+                raise HTTPError(status, (await conn.read_body(status, headers)).decode(errors="replace"))
+            buf = b""
+            while True:
+                chunk = await conn.read_chunk()
+                if not chunk:
+                    return
+                buf += chunk
+                while b"\n\n" in buf:
+                    event, buf = buf.split(b"\n\n", 1)
+                    for line in event.split(b"\n"):
+                        if line.startswith(b"data: "):
+                            yield json.loads(line[6:])
+        finally:
+            conn.close()
 
+    async def close(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
 
-def main():
-    ap = argparse.ArgumentParser(description="Run multi-agent simulator")
-    ap.add_argument("--base", default="http://localhost:8000", help="API base URL")
-    ap.add_argument("--game-id", default=None, help="Use existing game (otherwise create demo)")
-    ap.add_argument("--delay", type=float, default=0.8, help="Delay between actions (seconds)")
-    args = ap.parse_args()
-    base = args.base
 
-    if args.game_id:
-        game_id = args.game_id
-        print(f"Using existing game: {game_id}")
-        state = req(base, f"/api/games/{game_id}/state")
-        if state.get("status") == "ready_to_start":
-            req(base, f"/api/games/{game_id}/start", method="POST")
-            print("Game started.")
-            time.sleep(args.delay)
-        score = req(base, f"/api/games/{game_id}/scoreboard")
-        agent_ids = [s["agent_id"] for s in score["scores"]]
-        names = {s["agent_id"]: s["display_name"] for s in score["scores"]}
-    else:
-        # Create demo game (3 agents)
-        demo = req(base, "/api/demo/create", method="POST")
-        game_id = demo["game_id"]
-        agents = demo["agents"]
-        agent_ids = [a["agent_id"] for a in agents]
-        names = {a["agent_id"]: a["display_name"] for a in agents}
-        print(f"Created game {game_id} with agents: {list(names.values())}")
-        # Start game
-        req(base, f"/api/games/{game_id}/start", method="POST")
-        print("Game started.")
-        time.sleep(args.delay)
-
-    round_count = 0
-    while True:
-        state = req(base, f"/api/games/{game_id}/state")
-        status = state["status"]
-        if status == "game_completed":
-            print("Game completed.")
-            break
-
-        if status == "round_resolved":
-            print("Round resolved. Advancing to next round...")
-            req(base, f"/api/games/{game_id}/advance", method="POST", body={"action": "next_phase"})
-            time.sleep(args.delay)
-            continue
+class StateWatcher:
+    """Delivers successive game states using the selected client mode."""
 
-        phase = state.get("current_phase") or ""
-        round_id = state.get("current_round_id")
-        if not round_id:
-            req(base, f"/api/games/{game_id}/advance", method="POST", body={"action": "next_phase"})
-            time.sleep(args.delay)
-            continue
+    def __init__(self, client: Client, game_id: str, mode: str, poll_interval: float):
+        self.client = client
+        self.game_id = game_id
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.state: Optional[dict] = None
+        self._events = None
+
+    async def next(self) -> dict:
+        path = f"/api/games/{self.game_id}"
+        version = self.state["version"] if self.state else 0
+        if self.mode == "stream":
+            if self._events is None:
+                self._events = self.client.stream(f"{path}/stream")
+            self.state = await self._events.__anext__()
+            return self.state
+        while True:
+            if self.mode == "longpoll" and self.state:
+                status, body = await self.client.request("GET", f"{path}/state/wait?version={version}&timeout=20")
+            else:
+                if self.state:
+                    await asyncio.sleep(self.poll_interval)
+                status, body = await self.client.request("GET", f"{path}/state?version={version}")
+            if status == 200:
+                self.state = body
+                return body
+
+
+def log(verbose: bool, msg: str) -> None:
+    if verbose:
+        print(msg, flush=True)
 
-        operator_id = state.get("operator", {}).get("id") if state.get("operator") else None
-        majority_ids = [a["id"] for a in state.get("majority_agents", [])]
-        minority_ids = [a["id"] for a in state.get("minority_agents", [])]
-        phase_activity = set(state.get("phase_activity", []))
-
-        if phase in ("phase_1", "phase_2", "phase_3"):
-            # Non-operator agents can submit one argument per phase
-            for aid in majority_ids + minority_ids:
-                if aid in phase_activity:
-                    continue
-                name = names.get(aid, aid[:8])
+
+async def run_agent(client: Client, game_id: str, agent_id: str, name: str, token: Optional[str], args) -> None:
+    watcher = StateWatcher(client, game_id, args.mode, args.poll_interval)
+    acted = set()
+    while True:
+        try:
+            state = await watcher.next()
+        except StopAsyncIteration:
+            return
+        if state["status"] == "game_completed":
+            return
+        tables = state.get("tables") or [state | {"round_id": state.get("current_round_id"), "phase": state.get("current_phase")}]
+        for t in tables:
+            round_id, phase = t.get("round_id"), t.get("phase")
+            if not round_id:
+                continue
+            seat = next((a for a in t.get("majority_agents", []) + t.get("minority_agents", []) if a["id"] == agent_id), None)
+            if phase in DEBATE and seat and not seat["argued_this_phase"] and (round_id, phase) not in acted:
+                acted.add((round_id, phase))
+                await asyncio.sleep(args.think * random.uniform(0.5, 1.5))
                 text = f"[{name}] Please save our side. We deserve to live."
                 try:
-                    req(
-                        base,
-                        f"/api/games/{game_id}/rounds/{round_id}/arguments",
-                        method="POST",
-                        body={"agent_id": aid, "text": text},
-                    )
-                    print(f"  Argument from {name} (phase {phase})")
-                except RuntimeError as e:
-                    print(f"  Skip argument {name}: {e}")
-                time.sleep(args.delay)
-            # Advance to next phase
-            req(base, f"/api/games/{game_id}/advance", method="POST", body={"action": "next_phase"})
-            print(f"Advanced to next phase (was {phase}).")
-            time.sleep(args.delay)
-
-        elif phase == "awaiting_operator_decision":
-            if operator_id:
-                # Simple policy: alternate save_majority / save_minority for variety
+                    await client.request("POST", f"/api/games/{game_id}/rounds/{round_id}/arguments", {"agent_id": agent_id, "text": text}, token)
+                    log(args.verbose, f"  Argument from {name} (phase {phase})")
+                except HTTPError as e:
+                    log(args.verbose, f"  Skip argument {name}: {e}")
+            op = t.get("operator") or {}
+            if phase == "awaiting_decision" and op.get("id") == agent_id and (round_id, phase) not in acted:
+                acted.add((round_id, phase))
+                await asyncio.sleep(args.think * random.uniform(0.5, 1.5))
                 decision = random.choice(["save_majority", "save_minority"])
                 try:
-                    req(
-                        base,
-                        f"/api/games/{game_id}/rounds/{round_id}/decision",
-                        method="POST",
-                        body={"agent_id": operator_id, "decision": decision},
-                    )
-                    print(f"  Operator decided: {decision}")
-                except RuntimeError as e:
-                    print(f"  Decision failed: {e}")
-            else:
-                req(base, f"/api/games/{game_id}/advance", method="POST", body={"action": "resolve_round"})
-                print("  No operator; forced resolve.")
-            time.sleep(args.delay)
-
-        else:
-            req(base, f"/api/games/{game_id}/advance", method="POST", body={"action": "next_phase"})
-            time.sleep(args.delay)
-        round_count += 1
-        if round_count > 50:
-            print("Max rounds reached.")
-            break
+                    await client.request("POST", f"/api/games/{game_id}/rounds/{round_id}/decision", {"agent_id": agent_id, "decision": decision}, token)
+                    log(args.verbose, f"  Operator {name} decided: {decision}")
+                except HTTPError as e:
+                    log(args.verbose, f"  Decision failed: {e}")
+
+
+async def run_batch_agents(client: Client, game_id: str, agents: list[tuple[str, str, Optional[str]]], args) -> None:
+    """--batch: one client plays every agent of the game. Each state change sends all pending
+    arguments and decisions as one actions:batch request; the server auto-advances after it."""
+    names = {aid: name for aid, name, _ in agents}
+    tokens = {aid: token for aid, _, token in agents}
+    watcher = StateWatcher(client, game_id, args.mode, args.poll_interval)
+    sent = set()
+    while True:
+        try:
+            state = await watcher.next()
+        except StopAsyncIteration:
+            return
+        if state["status"] == "game_completed":
+            return
+        tables = state.get("tables") or [state | {"round_id": state.get("current_round_id"), "phase": state.get("current_phase")}]
+        actions, keys = [], []  # keys[i] identifies actions[i]
+        for t in tables:
+            round_id, phase = t.get("round_id"), t.get("phase")
+            if not round_id:
+                continue
+            if phase in DEBATE:
+                for seat in t.get("majority_agents", []) + t.get("minority_agents", []):
+                    aid = seat["id"]
+                    if aid in names and not seat["argued_this_phase"] and (round_id, phase, aid) not in sent:
+                        keys.append((round_id, phase, aid))
+                        text = f"[{names[aid]}] Please save our side. We deserve to live."
+                        actions.append({"type": "argument", "round_id": round_id, "agent_id": aid, "text": text, "token": tokens[aid]})
+            op = (t.get("operator") or {}).get("id")
+            if phase == "awaiting_decision" and op in names and (round_id, phase, op) not in sent:
+                keys.append((round_id, phase, op))
+                decision = random.choice(["save_majority", "save_minority"])
+                actions.append({"type": "decision", "round_id": round_id, "agent_id": op, "decision": decision, "token": tokens[op]})
+        if not actions:
+            continue
+        await asyncio.sleep(args.think * random.uniform(0.5, 1.5))
+        try:
+            _, res = await client.request("POST", f"/api/games/{game_id}/actions:batch", {"actions": actions})
+            # Only actions the server took are done; failed ones go again on the next state
+            sent.update(keys[r["index"]] for r in res["results"] if r["ok"])
+            failed = [r for r in res["results"] if not r["ok"]]
+            log(args.verbose, f"  Batch of {len(actions)} actions, {len(failed)} failed, advanced={res['advanced']}")
+        except HTTPError as e:
+            log(args.verbose, f"  Batch failed: {e}")
+
+
+async def run_runner(client: Client, game_id: str, args) -> None:
+    """Advances a phase once every track agent at a table argued, and starts each next round."""
+    watcher = StateWatcher(client, game_id, "longpoll" if args.mode == "stream" else args.mode, args.poll_interval)
+    while True:
+        state = await watcher.next()
+        if state["status"] == "game_completed":
+            return
+        try:
+            if state["status"] == "round_resolved":
+                await asyncio.sleep(args.think)
+                await client.request("POST", f"/api/games/{game_id}/advance", {"action": "next_phase"})
+                log(args.verbose, "Round resolved. Advancing to next round...")
+                continue
+            tables = state.get("tables") or [state | {"round_id": state.get("current_round_id"), "phase": state.get("current_phase")}]
+            for t in tables:
+                track = t.get("majority_agents", []) + t.get("minority_agents", [])
+                if t.get("phase") in DEBATE and track and all(a["argued_this_phase"] for a in track):
+                    await client.request("POST", f"/api/games/{game_id}/advance", {"action": "next_phase", "round_id": t["round_id"]})
+                    log(args.verbose, f"Advanced to next phase (was {t['phase']}).")
+        except HTTPError as e:
+            log(args.verbose, f"  Advance skipped: {e}")
+
+
+async def run_game(client: Client, index: int, args, results: list) -> None:
+    if args.game_id:
+        game_id = args.game_id
+        _, state = await client.request("GET", f"/api/games/{game_id}/state")
+        if state["status"] == "ready_to_start":
+            await client.request("POST", f"/api/games/{game_id}/start")
+        _, score = await client.request("GET", f"/api/games/{game_id}/scoreboard")
+        agents = [(s["agent_id"], s["display_name"], None) for s in score["scores"]]
+    else:
+        _, created = await client.request("POST", "/api/games", {"min_players": 1, "multi_table": args.multi_table})
+        game_id = created["game_id"]
+        entries = [{"display_name": f"Sim-{index}-{k}", "token": secrets.token_urlsafe(16)} for k in range(args.agents)]
+        _, reg = await client.request("POST", f"/api/games/{game_id}/agents/register:batch", {"agents": entries})
+        agents = [(a["agent_id"], a["display_name"], e["token"]) for a, e in zip(reg["agents"], entries)]
+        await client.request("POST", f"/api/games/{game_id}/start")
+    log(args.verbose, f"Game {game_id} started with agents: {[n for _, n, _ in agents]}")
+    start = time.perf_counter()
+    if args.batch:
+        tasks = [run_batch_agents(client, game_id, agents, args)]
+    else:
+        tasks = [run_runner(client, game_id, args)] + [run_agent(client, game_id, aid, name, token, args) for aid, name, token in agents]
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=args.duration)
+        results.append({"game_id": game_id, "completed": True, "seconds": time.perf_counter() - start})
+        log(args.verbose, "Game completed.")
+    except asyncio.TimeoutError:
+        results.append({"game_id": game_id, "completed": False, "seconds": time.perf_counter() - start})
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build_report(client: Client, games: list[dict], elapsed: float, args) -> dict:
+    endpoints = {}
+    for key in sorted(set(client.latency) | set(client.errors)):
+        lat = client.latency.get(key, [])
+        endpoints[key] = {
+            "requests": len(lat),
+            "errors": client.errors.get(key, 0),
+            "error_rate": client.errors.get(key, 0) / max(1, len(lat)),
+            "rate_limited": client.rate_limited.get(key, 0),
+            "rps": len(lat) / elapsed,
+            "p50_ms": 1000 * percentile(lat, 0.50) if lat else None,
+            "p95_ms": 1000 * percentile(lat, 0.95) if lat else None,
+            "p99_ms": 1000 * percentile(lat, 0.99) if lat else None,
+        }
+    done = [g["seconds"] for g in games if g["completed"]]
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "elapsed_s": elapsed,
+        "requests": total,
+        "throughput_rps": total / elapsed,
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "rate_limited": sum(e["rate_limited"] for e in endpoints.values()),
+        "endpoints": endpoints,
+        "games": {
+            "started": len(games),
+            "completed": len(done),
+            "completion_s_p50": statistics.median(done) if done else None,
+            "completion_s_max": max(done) if done else None,
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{'endpoint':<52} {'reqs':>7} {'rps':>8} {'p50ms':>7} {'p95ms':>7} {'p99ms':>7} {'err%':>6}")
+    for key, e in report["endpoints"].items():
+        fmt = lambda v: f"{v:7.1f}" if v is not None else f"{'-':>7}"  # noqa: E731
+        print(f"{key:<52} {e['requests']:>7} {e['rps']:>8.1f} {fmt(e['p50_ms'])} {fmt(e['p95_ms'])} {fmt(e['p99_ms'])} {100 * e['error_rate']:>5.1f}%")
+    g = report["games"]
+    print(f"\n{report['requests']} requests in {report['elapsed_s']:.1f}s = {report['throughput_rps']:.1f} req/s, {report['errors']} errors, {report['rate_limited']} rate-limited and retried")
+    print(f"games completed {g['completed']}/{g['started']}, completion p50 {g['completion_s_p50']}, max {g['completion_s_max']}")
+
+
+async def main_async(args) -> dict:
+    client = Client(args.base, args.connections)
+    games: list[dict] = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(run_game(client, i, args, games) for i in range(1 if args.game_id else args.games)))
+    finally:
+        await client.close()
+    return build_report(client, games, time.perf_counter() - start, args)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run multi-agent simulator / load generator")
+    ap.add_argument("--base", default="http://localhost:8000", help="API base URL")
+    ap.add_argument("--game-id", default=None, help="Drive an existing game (otherwise create --games new ones)")
+    ap.add_argument("--games", type=int, default=1, help="Concurrent games (M)")
+    ap.add_argument("--agents", type=int, default=7, help="Agents per game (K, at least 7)")
+    ap.add_argument("--multi-table", action="store_true", help="Create multi-table games")
+    ap.add_argument("--think", "--delay", type=float, default=0.8, dest="think", help="Mean think time before each action (seconds)")
+    ap.add_argument("--mode", choices=("poll", "longpoll", "stream"), default="poll", help="How clients watch state")
+    ap.add_argument("--batch", action="store_true", help="One client per game sends every agent's actions via actions:batch")
+    ap.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between polls in poll mode")
+    ap.add_argument("--connections", type=int, default=100, help="Keep-alive connection pool size")
+    ap.add_argument("--duration", type=float, default=600, help="Give up on a game after this many seconds")
+    ap.add_argument("--json", default=None, help="Write the report as JSON to this file")
+    ap.add_argument("--quiet", action="store_true", help="No per-action output (default for more than one game)")
+    args = ap.parse_args()
+    args.verbose = not args.quiet and (args.game_id is not None or args.games == 1)
 
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
     print("Simulator done.")
 
 
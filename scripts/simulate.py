@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Headless policy experiments: play many games in memory and report outcome statistics.
+
+Uses app.services.simulation, which runs the live seating, scoring and completion rules
+without the server, the store or any LLM. Argument policies are set per side, so
+argument mixes can be compared directly.
+
+  argument policies: canned (every phase), sparse (half the phases), silent
+  decision policies: utilitarian (always majority), coin, persuaded (minority saved with
+                     probability equal to its share of the arguments), last_word
+
+Example:
+  python scripts/simulate.py --games 100000 --decision-policy persuaded
+  python scripts/simulate.py --games 20000 --minority-policy silent --decision-policy last_word --json out.json
+  python scripts/simulate.py --games 5000 --agents 70 --multi-table --workers 1
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.simulation import ARGUMENT_POLICIES, DECISION_POLICIES, SimConfig, simulate  # noqa: E402
+
+
+def print_report(report: dict, mixes: int) -> None:
+    c = report["config"]
+    print(
+        f"{report['games']} games, {c['agents']} agents, {c['tables']} table(s); "
+        f"majority={c['majority_policy']} minority={c['minority_policy']} decision={c['decision_policy']}"
+    )
+    print(
+        f"{report['rounds']} tables resolved in {report['seconds']:.2f}s on {report['workers']} worker(s): "
+        f"{report['rounds_per_sec']:.0f} rounds/s, {report['games_per_sec']:.0f} games/s"
+    )
+    cyc = report["cycles_per_game"]
+    print(f"rounds per game: mean {cyc['mean']} (min {cyc['min']}, max {cyc['max']})")
+    print(f"save_minority rate: {report['save_minority_rate']:.2%}")
+    rows = sorted(report["by_mix"], key=lambda m: -m["tables"])[:mixes]
+    if rows:
+        print(f"\n{'maj args':>9} {'min args':>9} {'tables':>10} {'save_minority':>14}")
+        for m in sorted(rows, key=lambda m: (m["majority_arguments"], m["minority_arguments"])):
+            print(f"{m['majority_arguments']:>9} {m['minority_arguments']:>9} {m['tables']:>10} {m['save_minority_rate']:>14.2%}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Simulate games headlessly to study operator policies")
+    ap.add_argument("--games", type=int, default=10_000)
+    ap.add_argument("--seed", type=int, default=0, help="First seed; games use seed .. seed + games - 1")
+    ap.add_argument("--agents", type=int, default=7)
+    ap.add_argument("--multi-table", action="store_true", help="Seat as many full tables as the roster fills")
+    ap.add_argument("--majority-size", type=int, default=SimConfig.majority_size)
+    ap.add_argument("--minority-size", type=int, default=SimConfig.minority_size)
+    ap.add_argument("--majority-policy", choices=list(ARGUMENT_POLICIES), default="canned")
+    ap.add_argument("--minority-policy", choices=list(ARGUMENT_POLICIES), default="canned")
+    ap.add_argument("--decision-policy", choices=list(DECISION_POLICIES), default="coin")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = in-process)")
+    ap.add_argument("--mixes", type=int, default=15, help="Argument mixes to list, most frequent first")
+    ap.add_argument("--json", default=None, help="Also write the full report to this file")
+    args = ap.parse_args()
+
+    try:
+        config = SimConfig(
+            agents=args.agents,
+            multi_table=args.multi_table,
+            majority_size=args.majority_size,
+            minority_size=args.minority_size,
+            majority_policy=args.majority_policy,
+            minority_policy=args.minority_policy,
+            decision_policy=args.decision_policy,
+        )
+    except ValueError as e:
+        ap.error(str(e))
+    report = simulate(args.games, config, seed=args.seed, workers=args.workers).to_dict()
+    print_report(report, args.mixes)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()